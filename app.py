@@ -4,17 +4,18 @@ Una aplicación divertida que encuentra tu auto ideal basándose en tu personali
 """
 
 import streamlit as st
-import json
-import numpy as np
 from pathlib import Path
 import sys
 
 # Agregar src al path para imports
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from matcher import AutoMatcher
-from personality import PersonalityProcessor
-from utils import load_json_data, display_car_result, create_car_card, generate_share_text
+from answer_table import recommend_from_answers
+from charts import RADAR_DIMENSIONS, get_radar_cache
+from fragments import APP_STYLE, card_fragments
+from metrics import is_enabled, render_prometheus, snapshot, timed, timer
+from resources import get_app_resources
+from utils import display_car_result, create_car_card, generate_share_text
 
 # Configuración de la página
 st.set_page_config(
@@ -24,51 +25,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# CSS personalizado
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        color: white;
-    }
-    .question-card {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .result-card {
-        background: #fff;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        text-align: center;
-    }
-    .alternative-card {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #dee2e6;
-        margin: 0.5rem 0;
-    }
-    .share-button {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border: none;
-        border-radius: 5px;
-        margin: 0.25rem;
-        text-decoration: none;
-        display: inline-block;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS personalizado (compactado una sola vez por proceso; se emite en cada rerun
+# porque Streamlit quita de la página lo que un rerun no vuelve a enviar)
+st.markdown(APP_STYLE, unsafe_allow_html=True)
 
 def main():
     """Función principal de la aplicación"""
@@ -89,12 +48,11 @@ def main():
     if 'show_result' not in st.session_state:
         st.session_state.show_result = False
     
-    # Cargar datos
+    # Cargar datos (compartidos por todas las sesiones; se recargan si cambian los archivos)
     try:
-        questions_data = load_json_data("data/questions.json")
-        cars_data = load_json_data("data/cars.json")
+        resources = get_app_resources()
         
-        if not questions_data or not cars_data:
+        if not resources:
             st.error("No se pudieron cargar los datos. Por favor, verifica que los archivos JSON existan.")
             return
             
@@ -102,13 +60,39 @@ def main():
         st.error(f"Error al cargar los datos: {str(e)}")
         return
     
-    # Mostrar resultado si ya se completó el cuestionario
+    # Mostrar resultado si ya se completó el cuestionario; si no, el cuestionario
     if st.session_state.show_result:
-        show_results(st.session_state.answers, cars_data, questions_data)
-        return
+        show_results(st.session_state.answers, resources)
+    else:
+        show_questionnaire(resources.questions_data)
     
-    # Mostrar cuestionario
-    show_questionnaire(questions_data)
+    # Panel de métricas (solo con AUTO_PERSONALITY_METRICS=1)
+    if is_enabled():
+        show_metrics_panel()
+
+def show_metrics_panel():
+    """Muestra en la barra lateral los tiempos por etapa y contadores del proceso"""
+    
+    metrics = snapshot()
+    
+    with st.sidebar.expander("⏱️ Métricas (debug)", expanded=True):
+        st.caption("Acumuladas en este proceso, para todas las sesiones")
+        
+        if metrics["stages"]:
+            st.dataframe(
+                [
+                    {"etapa": stage, "llamadas": values["count"], "media (ms)": round(values["mean_ms"], 3),
+                     "p95 ≤ (ms)": round(values["p95_ms"], 3), "máx (ms)": round(values["max_ms"], 3),
+                     "total (ms)": round(values["total_ms"], 1)}
+                    for stage, values in sorted(metrics["stages"].items(),
+                                                key=lambda item: item[1]["total_ms"], reverse=True)
+                ]
+            )
+        
+        if metrics["counters"]:
+            st.json(metrics["counters"])
+        
+        st.code(render_prometheus(), language="text")
 
 def show_questionnaire(questions_data):
     """Muestra el cuestionario interactivo"""
@@ -158,43 +142,45 @@ def show_questionnaire(questions_data):
     with col3:
         if selected:
             if st.button("Siguiente ➡️"):
-                # Guardar respuesta
+                # Guardar respuesta como índice de la opción elegida
                 selected_index = option_texts.index(selected)
-                selected_option = options[selected_index]
                 
                 if len(st.session_state.answers) <= current_q:
-                    st.session_state.answers.append(selected_option)
+                    st.session_state.answers.append(selected_index)
                 else:
-                    st.session_state.answers[current_q] = selected_option
+                    st.session_state.answers[current_q] = selected_index
                 
                 st.session_state.current_question += 1
                 st.rerun()
 
-def show_results(answers, cars_data, questions_data):
+@timed("show_results")
+def show_results(answers, resources):
     """Muestra los resultados de la recomendación"""
     
-    # Procesar personalidad
-    processor = PersonalityProcessor()
-    personality_vector = processor.calculate_personality_vector(answers)
-    
-    # Encontrar coincidencias
-    matcher = AutoMatcher(cars_data)
-    recommendations = matcher.find_best_matches(personality_vector, top_n=3)
+    # Procesar personalidad y encontrar coincidencias (tabla precalculada o en vivo)
+    processor = resources.processor
+    matcher = resources.matcher
+    personality_vector, recommendations = recommend_from_answers(
+        processor, matcher, answers, top_n=3, table=resources.answer_table
+    )
     
     if not recommendations:
         st.error("No se pudieron generar recomendaciones.")
         return
     
+    # Tarjetas HTML en caché para la versión vigente del catálogo
+    fragments = card_fragments(matcher)
+    
     # Mostrar auto principal
     best_match = recommendations[0]
     
     st.markdown("## 🎉 ¡Tu Auto Ideal!")
     
     # Usar la nueva función para mostrar la tarjeta del auto
-    create_car_card(best_match['car'], best_match['match_percentage'])
+    create_car_card(best_match.car, best_match.match_percentage, fragments=fragments)
     
-    # Insights de personalidad
-    insights = processor.generate_personality_insights(personality_vector)
+    # Insights de personalidad (perfil en caché entre reruns y sesiones)
+    insights = processor.export_personality_profile(personality_vector)['insights']
     st.markdown(f"""
     ### 🧠 Insights de tu personalidad:
     {insights}
@@ -202,36 +188,25 @@ def show_results(answers, cars_data, questions_data):
     
     # Mostrar vector de personalidad
     with st.expander("📊 Ver tu perfil de personalidad"):
-        dimensions = ["Sostenibilidad", "Prestaciones", "Lujo y Confort", "Versatilidad", "Tech-savvy"]
-        
         col1, col2 = st.columns(2)
         with col1:
-            for i, (dim, score) in enumerate(zip(dimensions, personality_vector)):
+            for i, (dim, score) in enumerate(zip(RADAR_DIMENSIONS, personality_vector)):
                 progress = score / 5.0
                 st.metric(dim, f"{score:.1f}/5.0")
                 st.progress(progress)
         
         with col2:
-            # Gráfico de radar (simplificado)
-            import plotly.graph_objects as go
+            # Gráfico de radar (figura en caché por vector redondeado)
+            compare = st.checkbox("Comparar con tu auto ideal", key="radar_compare")
             
-            fig = go.Figure()
-            fig.add_trace(go.Scatterpolar(
-                r=personality_vector,
-                theta=dimensions,
-                fill='toself',
-                name='Tu personalidad'
-            ))
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 5]
-                    )),
-                showlegend=False,
-                height=300
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            with timer("radar_chart"):
+                overlay_vector = best_match.car.get('vector') if compare else None
+                fig = get_radar_cache().figure(
+                    personality_vector,
+                    overlay_vector=overlay_vector,
+                    overlay_name=f"{best_match.car.get('brand', '')} {best_match.car.get('model', '')}".strip()
+                )
+                st.plotly_chart(fig, use_container_width=True)
     
     # Alternativas
     if len(recommendations) > 1:
@@ -242,19 +217,13 @@ def show_results(answers, cars_data, questions_data):
         
         for idx, rec in enumerate(recommendations[1:]):
             with cols[idx % len(cols)]:
-                st.markdown(f"""
-                <div class="alternative-card">
-                    <h4>{rec['car']['emoji']} {rec['car']['brand']} {rec['car']['model']}</h4>
-                    <p><strong>Match: {rec['match_percentage']:.1f}%</strong></p>
-                    <p>{rec['car']['type']}</p>
-                    <p style="font-size: 0.9em;">{rec['car']['description'][:100]}...</p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(fragments.render("alternative", rec.car, rec.match_percentage),
+                            unsafe_allow_html=True)
     
     # Botones para compartir
     st.markdown("## 📱 ¡Comparte tu resultado!")
     
-    share_text = generate_share_text(best_match['car'], best_match['match_percentage'])
+    share_text = generate_share_text(best_match.car, best_match.match_percentage)
     
     col1, col2, col3 = st.columns(3)
     
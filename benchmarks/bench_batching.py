@@ -0,0 +1,87 @@
+"""
+Benchmark: consultas individuales vs agrupadas con MicroBatcher según la concurrencia
+
+Cada sesión concurrente es una corrutina que pide recomendaciones una tras
+otra, como las peticiones que atiende ``src/service.py`` en su event loop.
+
+Uso:
+    python benchmarks/bench_batching.py [--size 20000] [--requests 4000] [--concurrency 1 8 32 128 512]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent))
+
+from batching import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY, MicroBatcher
+from matcher import AutoMatcher
+from synthetic import make_catalog, make_user_vectors
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_sessions(find_best_matches, user_vectors, concurrency: int, top_n: int):
+    """Throughput (consultas/s) y latencias en ms con ``concurrency`` sesiones"""
+    latencies = []
+    
+    async def session(vectors):
+        for vector in vectors:
+            start = time.perf_counter()
+            await find_best_matches(vector, top_n)
+            latencies.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(session(user_vectors[i::concurrency]) for i in range(concurrency)))
+    return len(user_vectors) / (time.perf_counter() - start), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=4_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128, 512])
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_MAX_DELAY * 1000)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args()
+    
+    matcher = AutoMatcher(make_catalog(args.size))
+    user_vectors = make_user_vectors(args.requests)
+    
+    async def direct(vector, top_n):
+        result = matcher.find_best_matches(vector, top_n=top_n)
+        # Ceder el event loop entre consultas, como entre peticiones HTTP
+        await asyncio.sleep(0)
+        return result
+    
+    print(f"Autos: {args.size}, consultas: {args.requests}, ventana: {args.window_ms} ms, "
+          f"lote máximo: {args.max_batch}")
+    print(f"{'sesiones':>9} {'modo':>9} {'q/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'lote medio':>11}")
+    
+    for concurrency in args.concurrency:
+        modes = [("directo", direct, None)]
+        
+        # Con la ventana configurada y sin espera (solo lo recibido en la misma vuelta del loop)
+        for label, window in ((f"{args.window_ms:g} ms", args.window_ms), ("0 ms", 0)):
+            batcher = MicroBatcher(matcher, max_delay=window / 1000, max_batch=args.max_batch)
+            modes.append((label, batcher.find_best_matches, batcher))
+        
+        for label, find_best_matches, batcher in modes:
+            throughput, latencies = asyncio.run(
+                run_sessions(find_best_matches, user_vectors, concurrency, args.top_n)
+            )
+            batch_size = f"{batcher.stats()['mean_batch_size']:.1f}" if batcher else "-"
+            print(f"{concurrency:>9} {label:>9} {throughput:>9.0f} {percentile(latencies, 0.5):>9.2f} "
+                  f"{percentile(latencies, 0.99):>9.2f} {batch_size:>11}")
+
+
+if __name__ == "__main__":
+    main()
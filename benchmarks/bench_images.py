@@ -0,0 +1,50 @@
+"""
+Benchmark: tiempos de imágenes en frío (generación), desde disco y desde memoria
+
+Uso:
+    python benchmarks/bench_images.py [--variant card]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from images import DEFAULT_IMAGES_DIR, ImagePipeline, VARIANTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="card")
+    args = parser.parse_args()
+    
+    cars = json.loads((DEFAULT_IMAGES_DIR.parent / "cars.json").read_text(encoding="utf-8"))["cars"]
+    filenames = [car["image"] for car in cars if car.get("image")]
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pipeline = ImagePipeline(cache_dir=cache_dir)
+        
+        print(f"{'imagen':<22} {'frío (ms)':>10} {'disco (ms)':>11} {'memoria (ms)':>13} {'bytes':>8}")
+        
+        for filename in filenames:
+            timings = []
+            for step in ("cold", "disk", "memory"):
+                if step == "disk":
+                    pipeline.clear_memory()
+                start = time.perf_counter()
+                data = pipeline.get_variant(filename, args.variant)
+                timings.append((time.perf_counter() - start) * 1000)
+            
+            print(f"{filename:<22} {timings[0]:>10.2f} {timings[1]:>11.3f} {timings[2]:>13.3f} {len(data):>8}")
+        
+        print()
+        print(json.dumps(pipeline.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
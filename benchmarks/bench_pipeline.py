@@ -0,0 +1,252 @@
+"""
+Benchmark: todas las etapas de una recomendación, con salida JSON y comparación contra una línea base
+
+Mide por separado cada etapa (vector de personalidad, top-N, autos similares,
+estadísticas, imágenes) sobre catálogos sintéticos de distintos tamaños:
+latencias p50/p95 con ``time.perf_counter`` y pico de memoria con
+``tracemalloc`` en una pasada aparte, para que el rastreo no afecte los
+tiempos.
+
+Con ``--output`` guarda los resultados en JSON; con ``--baseline`` compara la
+mediana de cada etapa contra un JSON anterior y termina con código 1 si alguna
+empeoró más que ``--threshold``.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--sizes 10 1000 100000] [--output resultados.json]
+    python benchmarks/bench_pipeline.py --baseline base.json [--threshold 0.25]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent))
+
+from images import DEFAULT_IMAGES_DIR, ImagePipeline
+from matcher import AutoMatcher
+from personality import PersonalityProcessor
+from synthetic import answers_with_weights, make_answer_sets, make_catalog, make_user_vectors
+from utils import load_car_image
+
+QUESTIONS_PATH = DEFAULT_IMAGES_DIR.parent / "questions.json"
+
+# Diferencias menores a esto (ms) son ruido del reloj, no regresiones
+MIN_REGRESSION_MS = 0.01
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_stage(call: Callable[[int], Any], iterations: int, max_seconds: float) -> List[float]:
+    """
+    Latencias en ms de ``call(i)`` para i = 0, 1, ...
+    
+    Se detiene al llegar a ``iterations`` o al agotar ``max_seconds`` (con al
+    menos 3 muestras), así las etapas lentas de catálogos grandes no alargan la corrida.
+    """
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    
+    for i in range(iterations):
+        start = time.perf_counter()
+        call(i)
+        samples.append((time.perf_counter() - start) * 1000)
+        
+        if len(samples) >= 3 and time.perf_counter() > deadline:
+            break
+    
+    return samples
+
+
+def peak_memory_kb(call: Callable[[int], Any], iterations: int = 3) -> float:
+    """Pico de memoria asignada (KB) durante unas llamadas a ``call``"""
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            call(i)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(stage: str, size: Optional[int], call: Callable[[int], Any],
+            iterations: int, max_seconds: float) -> Dict[str, Any]:
+    """Tiempos y memoria de una etapa, en el formato de la salida JSON"""
+    # Calentar cachés (imágenes, perfiles) fuera de las muestras
+    call(0)
+    samples = time_stage(call, iterations, max_seconds)
+    
+    return {
+        "stage": stage,
+        "size": size,
+        "iterations": len(samples),
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": percentile(samples, 0.5),
+        "p95_ms": percentile(samples, 0.95),
+        "peak_kb": peak_memory_kb(call),
+    }
+
+
+def catalog_stages(size: int, processor: PersonalityProcessor, answer_sets: List[List[int]],
+                   answers: List[List[Dict[str, Any]]], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Etapas que dependen del tamaño del catálogo"""
+    cars_data = make_catalog(size)
+    user_vectors = make_user_vectors(len(answer_sets))
+    results = [measure("build_matcher", size, lambda i: AutoMatcher(cars_data),
+                       min(args.iterations, 5), args.max_seconds)]
+    
+    matcher = AutoMatcher(cars_data)
+    car_ids = matcher.car_ids
+    
+    stages = {
+        "calculate_personality_vector": lambda i: processor.calculate_personality_vector(
+            answers[i % len(answers)]),
+        "calculate_personality_vector_from_indices": lambda i: processor.calculate_personality_vector_from_indices(
+            answer_sets[i % len(answer_sets)]),
+        "find_best_matches": lambda i: matcher.find_best_matches(
+            user_vectors[i % len(user_vectors)], top_n=args.top_n),
+        "find_best_matches_batch": lambda i: matcher.find_best_matches_batch(
+            np.asarray(user_vectors[:args.batch]), args.top_n),
+        "recommend_similar_cars": lambda i: matcher.recommend_similar_cars(
+            car_ids[(i * 7919) % len(car_ids)], top_n=args.top_n),
+        "get_statistics": lambda i: matcher.get_statistics(),
+    }
+    
+    for stage, call in stages.items():
+        results.append(measure(stage, size, call, args.iterations, args.max_seconds))
+    
+    return results
+
+
+def image_stages(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Etapas de imágenes sobre las imágenes reales del catálogo"""
+    cars = json.loads((DEFAULT_IMAGES_DIR.parent / "cars.json").read_text(encoding="utf-8"))["cars"]
+    filenames = [car["image"] for car in cars if car.get("image")]
+    
+    if not filenames:
+        return []
+    
+    results = [measure("load_car_image", None, lambda i: load_car_image(filenames[i % len(filenames)]),
+                       args.iterations, args.max_seconds)]
+    
+    # En frío: cada muestra genera una variante en un directorio de caché vacío
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def render_cold(i: int) -> bytes:
+            pipeline = ImagePipeline(cache_dir=Path(cache_dir) / str(time.perf_counter_ns()))
+            return pipeline.get_variant(filenames[i % len(filenames)], "card")
+        
+        results.append(measure("image_variant_cold", None, render_cold, len(filenames), args.max_seconds))
+    
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compara la mediana de cada etapa con la línea base
+    
+    Returns:
+        List[str]: Etapas que empeoraron más que ``threshold``
+    """
+    previous = {(entry["stage"], entry["size"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    
+    print(f"\n{'etapa':<42} {'autos':>8} {'base p50':>10} {'p50':>10} {'cambio':>8}")
+    
+    for entry in results:
+        key = (entry["stage"], entry["size"])
+        if key not in previous:
+            continue
+        
+        base_ms, current_ms = previous[key]["p50_ms"], entry["p50_ms"]
+        change = current_ms / base_ms - 1 if base_ms > 0 else 0.0
+        regressed = change > threshold and current_ms - base_ms > MIN_REGRESSION_MS
+        
+        marker = " ❌" if regressed else ""
+        print(f"{entry['stage']:<42} {str(entry['size'] or '-'):>8} {base_ms:>10.3f} "
+              f"{current_ms:>10.3f} {change:>+7.0%}{marker}")
+        
+        if regressed:
+            regressions.append(f"{entry['stage']} ({entry['size'] or '-'} autos): {change:+.0%}")
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000],
+                        help="Tamaños de catálogo (hasta 1000000)")
+    parser.add_argument("--iterations", type=int, default=200, help="Muestras máximas por etapa")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Tiempo máximo por etapa")
+    parser.add_argument("--answers", type=int, default=500, help="Conjuntos de respuestas sintéticos")
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--skip-images", action="store_true")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Empeoramiento relativo de la mediana que cuenta como regresión")
+    args = parser.parse_args()
+    
+    questions_data = json.loads(QUESTIONS_PATH.read_text(encoding="utf-8"))
+    processor = PersonalityProcessor(questions_data)
+    answer_sets = make_answer_sets(questions_data, args.answers)
+    answers = [answers_with_weights(questions_data, indices) for indices in answer_sets]
+    
+    results = []
+    for size in args.sizes:
+        print(f"🚗 Catálogo de {size} autos...", file=sys.stderr)
+        results.extend(catalog_stages(size, processor, answer_sets, answers, args))
+    
+    if not args.skip_images:
+        results.extend(image_stages(args))
+    
+    print(f"{'etapa':<42} {'autos':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'pico (KB)':>10} {'n':>5}")
+    for entry in results:
+        print(f"{entry['stage']:<42} {str(entry['size'] or '-'):>8} {entry['p50_ms']:>10.3f} "
+              f"{entry['p95_ms']:>10.3f} {entry['peak_kb']:>10.1f} {entry['iterations']:>5}")
+    
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "sizes": args.sizes,
+        },
+        "results": results,
+    }
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n💾 Resultados guardados en {args.output}")
+    
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        
+        if regressions:
+            print(f"\n❌ Regresiones mayores a {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        
+        print(f"\n✅ Sin regresiones mayores a {args.threshold:.0%}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Benchmark: tiempo de rerun y HTML enviado por la página de resultados
+
+Recorre el cuestionario con ``streamlit.testing`` y repite reruns de la página
+de resultados, midiendo el tiempo de cada uno y los bytes de markdown/HTML que
+emite. También compara armar las tarjetas en vivo contra ``CardFragments`` y
+el gráfico de radar en vivo contra ``RadarFigureCache``.
+
+Uso:
+    python benchmarks/bench_render.py [--reruns 30] [--cards 10000] [--figures 200]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent))
+
+from charts import RadarFigureCache, build_radar_figure
+from fragments import APP_CSS, APP_STYLE, CardFragments, render_card
+from synthetic import make_catalog
+
+APP_PATH = Path(__file__).parent.parent / "app.py"
+
+
+def results_page_reruns(reruns: int):
+    """Tiempos de rerun (ms) y bytes de markdown de la página de resultados"""
+    from streamlit.testing.v1 import AppTest
+    
+    app = AppTest.from_file(str(APP_PATH), default_timeout=60).run()
+    
+    # Responder el cuestionario hasta llegar a los resultados
+    while not any("Tu Auto Ideal" in element.value for element in app.markdown):
+        next_button = [button for button in app.button if "Siguiente" in button.label][0]
+        next_button.click().run()
+    
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    payload = sum(len(element.value.encode("utf-8")) for element in app.markdown)
+    return timings, payload
+
+
+def card_render_times(num_cards: int):
+    """Microsegundos por tarjeta: en vivo y con caché (tras la primera vuelta)"""
+    cars = make_catalog(50)["cars"]
+    requests = [(cars[i % len(cars)], 60 + (i % 400) / 10) for i in range(num_cards)]
+    
+    start = time.perf_counter()
+    for car, match_percentage in requests:
+        render_card("details", car, match_percentage)
+    live_us = (time.perf_counter() - start) * 1e6 / num_cards
+    
+    fragments = CardFragments()
+    for car, match_percentage in requests:
+        fragments.render("details", car, match_percentage)
+    
+    start = time.perf_counter()
+    for car, match_percentage in requests:
+        fragments.render("details", car, match_percentage)
+    cached_us = (time.perf_counter() - start) * 1e6 / num_cards
+    
+    return live_us, cached_us, fragments.stats()
+
+
+def radar_figure_times(num_figures: int):
+    """Milisegundos por figura de radar: en vivo y con caché (mismo perfil repetido)"""
+    vector = [3.2, 4.1, 2.7, 3.9, 4.4]
+    overlay = [3.0, 4.5, 2.5, 4.0, 4.0]
+    
+    start = time.perf_counter()
+    for _ in range(num_figures):
+        build_radar_figure(vector)
+    live_ms = (time.perf_counter() - start) * 1000 / num_figures
+    
+    cache = RadarFigureCache()
+    cache.figure(vector)
+    cache.figure(vector, overlay_vector=overlay, overlay_name="Auto")
+    
+    start = time.perf_counter()
+    for i in range(num_figures):
+        if i % 2:
+            cache.figure(vector, overlay_vector=overlay, overlay_name="Auto")
+        else:
+            cache.figure(vector)
+    cached_ms = (time.perf_counter() - start) * 1000 / num_figures
+    
+    return live_ms, cached_ms, cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--cards", type=int, default=10_000)
+    parser.add_argument("--figures", type=int, default=200)
+    parser.add_argument("--skip-app", action="store_true", help="Solo medir el armado de tarjetas")
+    args = parser.parse_args()
+    
+    live_us, cached_us, stats = card_render_times(args.cards)
+    print(f"Tarjeta en vivo:      {live_us:.2f} µs")
+    print(f"Tarjeta en caché:     {cached_us:.2f} µs ({stats['cards']} tarjetas, {stats['static_parts']} autos)")
+    print(f"CSS: {len(APP_CSS.encode('utf-8'))} bytes legible, {len(APP_STYLE.encode('utf-8'))} bytes emitidos")
+    
+    live_ms, cached_ms, stats = radar_figure_times(args.figures)
+    print(f"Radar en vivo:        {live_ms:.3f} ms")
+    print(f"Radar en caché:       {cached_ms:.4f} ms ({stats['figures']} figuras)")
+    
+    if not args.skip_app:
+        timings, payload = results_page_reruns(args.reruns)
+        print(f"Rerun de resultados:  p50 {statistics.median(timings):.1f} ms, "
+              f"mín {min(timings):.1f} ms ({len(timings)} reruns)")
+        print(f"Markdown/HTML por rerun: {payload} bytes")
+
+
+if __name__ == "__main__":
+    main()
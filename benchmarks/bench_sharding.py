@@ -0,0 +1,92 @@
+"""
+Benchmark: matcher en un proceso vs matcher por shards según el número de workers
+
+Mide la latencia de consultas individuales (p50/p99) y el throughput de
+consultas en lotes, y verifica que los resultados coincidan con ``AutoMatcher``.
+
+Uso:
+    python benchmarks/bench_sharding.py [--size 1000000] [--workers 1 2 4] [--queries 200] [--batch 64]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent))
+
+from matcher import AutoMatcher
+from sharding import ShardedMatcher
+from synthetic import make_catalog, make_user_vectors
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(find_best_matches, find_batch, user_vectors, top_n: int, batch_size: int):
+    """Latencias individuales en ms y throughput en lotes (consultas/s)"""
+    latencies = []
+    for vector in user_vectors:
+        start = time.perf_counter()
+        find_best_matches(vector, top_n=top_n)
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    matrix = np.asarray(user_vectors, dtype=np.float64)
+    start = time.perf_counter()
+    for offset in range(0, len(matrix), batch_size):
+        find_batch(matrix[offset:offset + batch_size], top_n)
+    throughput = len(matrix) / (time.perf_counter() - start)
+    
+    return percentile(latencies, 0.5), percentile(latencies, 0.99), throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"🚗 Generando {args.size} autos ({os.cpu_count()} núcleos disponibles)...")
+    matcher = AutoMatcher(make_catalog(args.size))
+    user_vectors = make_user_vectors(args.queries)
+    
+    print(f"{'modo':>12} {'p50 (ms)':>10} {'p99 (ms)':>10} {'lote (q/s)':>11} {'arranque (s)':>13}")
+    
+    p50, p99, throughput = measure(matcher.find_best_matches, matcher.find_best_matches_batch,
+                                   user_vectors, args.top_n, args.batch)
+    print(f"{'1 proceso':>12} {p50:>10.3f} {p99:>10.3f} {throughput:>11.0f} {'-':>13}")
+    
+    expected = matcher.find_best_matches_batch(np.asarray(user_vectors[:20]), args.top_n)
+    
+    for num_workers in args.workers:
+        start = time.perf_counter()
+        with ShardedMatcher(matcher, num_workers=num_workers) as sharded:
+            startup = time.perf_counter() - start
+            
+            indices, scores = sharded.find_best_matches_batch(np.asarray(user_vectors[:20]), args.top_n)
+            if not (np.array_equal(indices, expected[0]) and np.array_equal(scores, expected[1])):
+                print(f"❌ Resultados distintos con {num_workers} workers")
+                return 1
+            
+            p50, p99, throughput = measure(sharded.find_best_matches, sharded.find_best_matches_batch,
+                                           user_vectors, args.top_n, args.batch)
+        
+        label = f"{num_workers} worker{'s' if num_workers > 1 else ''}"
+        print(f"{label:>12} {p50:>10.3f} {p99:>10.3f} {throughput:>11.0f} {startup:>13.2f}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
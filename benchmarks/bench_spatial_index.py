@@ -0,0 +1,66 @@
+"""
+Benchmark: búsqueda top-N lineal vs KD-tree según el tamaño del catálogo
+
+Uso:
+    python benchmarks/bench_spatial_index.py [--sizes 1000 10000 100000] [--queries 200]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent))
+
+from matcher import AutoMatcher
+from synthetic import make_catalog, make_user_vectors
+
+
+def time_queries(matcher: AutoMatcher, user_vectors, top_n: int) -> float:
+    """Tiempo medio por consulta en milisegundos"""
+    start = time.perf_counter()
+    for vector in user_vectors:
+        matcher.find_best_matches(vector, top_n=top_n)
+    return (time.perf_counter() - start) * 1000 / len(user_vectors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args()
+    
+    user_vectors = make_user_vectors(args.queries)
+    crossover = None
+    
+    print(f"{'autos':>10} {'lineal (ms)':>12} {'kd-tree (ms)':>13} {'build (s)':>10} {'speedup':>8}")
+    
+    for size in args.sizes:
+        matcher = AutoMatcher(make_catalog(size))
+        
+        start = time.perf_counter()
+        indexed = AutoMatcher(matcher.cars_data)
+        indexed.build_spatial_index()
+        build_time = time.perf_counter() - start
+        
+        linear_ms = time_queries(matcher, user_vectors, args.top_n)
+        indexed_ms = time_queries(indexed, user_vectors, args.top_n)
+        speedup = linear_ms / indexed_ms
+        
+        if crossover is None and speedup > 1:
+            crossover = size
+        
+        print(f"{size:>10} {linear_ms:>12.3f} {indexed_ms:>13.3f} {build_time:>10.2f} {speedup:>7.1f}x")
+    
+    if crossover is None:
+        print("\nEl KD-tree no superó a la búsqueda lineal en los tamaños probados")
+    else:
+        print(f"\nPunto de cruce: el KD-tree es más rápido desde ~{crossover} autos")
+
+
+if __name__ == "__main__":
+    main()
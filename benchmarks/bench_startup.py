@@ -0,0 +1,105 @@
+"""
+Benchmark: costo de importación de cada módulo y dependencias pesadas que arrastra
+
+Cada módulo se importa en un intérprete nuevo con ``python -X importtime``:
+el tiempo acumulado sale del propio intérprete y no incluye su arranque. La
+columna de dependencias indica cuáles de las pesadas (numpy, PIL, plotly,
+pandas, streamlit) quedan cargadas solo por importar el módulo.
+
+Uso:
+    python benchmarks/bench_startup.py [--modules resources service] [--repeat 5] [--output startup.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+DEFAULT_MODULES = ["metrics", "records", "personality", "matcher", "images", "answer_table",
+                   "resources", "utils", "batching", "service"]
+
+HEAVY_DEPENDENCIES = ["numpy", "PIL", "plotly", "pandas", "streamlit"]
+
+# Script del intérprete hijo: importa el módulo y reporta qué dependencias pesadas cargó
+CHILD_SCRIPT = """
+import sys
+sys.path.insert(0, {src!r})
+import {module}
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def import_cost(module: str) -> Dict[str, Any]:
+    """
+    Importa un módulo en un intérprete nuevo y mide su costo
+    
+    Args:
+        module (str): Nombre del módulo dentro de src/
+    
+    Returns:
+        Dict[str, Any]: Tiempo acumulado (ms), dependencias pesadas cargadas y
+        las importaciones de primer nivel más caras
+    """
+    script = CHILD_SCRIPT.format(src=str(SRC_DIR), module=module, heavy=HEAVY_DEPENDENCIES)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            capture_output=True, text=True, check=True)
+    
+    # Formato: "import time: self [us] | cumulative | nombre", con dos espacios de
+    # sangría por nivel; los hijos se listan antes que el módulo que los importa
+    own = 0.0
+    children: List[Tuple[str, float]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                own = int(cumulative) / 1000
+                break
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+    
+    heaviest = sorted(children, key=lambda entry: -entry[1])
+    
+    return {
+        "module": module,
+        "import_ms": own,
+        "dependencies": [name for name in result.stdout.strip().split(",") if name],
+        "heaviest": heaviest[:3],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="Importaciones por módulo (se reporta la mediana)")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+    
+    results: List[Dict[str, Any]] = []
+    
+    print(f"{'módulo':<14} {'importar (ms)':>14}  {'dependencias pesadas':<28} más caras")
+    
+    for module in args.modules:
+        runs = [import_cost(module) for _ in range(args.repeat)]
+        entry = runs[-1]
+        entry["import_ms"] = statistics.median(run["import_ms"] for run in runs)
+        results.append(entry)
+        
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in entry["heaviest"])
+        print(f"{module:<14} {entry['import_ms']:>14.1f}  {','.join(entry['dependencies']) or '-':<28} {heaviest}")
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": results}, indent=2), encoding="utf-8")
+        print(f"\n💾 Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Prueba de carga del servicio HTTP de recomendaciones
+
+Levanta ``src/service.py`` en un puerto libre, lanza peticiones concurrentes con
+conexiones keep-alive y compara el throughput con llamadas directas en proceso.
+
+Uso:
+    python benchmarks/load_test_service.py [--requests 5000] [--concurrency 32] [--workers 1]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Agregar src al path para imports
+sys.path.append(str(ROOT / "src"))
+
+from resources import get_app_resources
+
+
+def random_answers(rng: random.Random, num_questions: int):
+    return [rng.randrange(5) for _ in range(num_questions)]
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def in_process_baseline(num_requests: int, num_questions: int) -> float:
+    """Peticiones por segundo llamando directamente al procesador y al matcher"""
+    resources = get_app_resources()
+    rng = random.Random(1)
+    payloads = [random_answers(rng, num_questions) for _ in range(num_requests)]
+    
+    start = time.perf_counter()
+    for answers in payloads:
+        vector = resources.processor.calculate_personality_vector_from_indices(answers)
+        resources.matcher.find_best_matches(vector, top_n=3)
+    return num_requests / (time.perf_counter() - start)
+
+
+async def client(port: int, bodies, latencies) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write(
+                b"POST /recommend HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            response = await reader.readexactly(length)
+            if not head.startswith(b"HTTP/1.1 200"):
+                raise RuntimeError(response.decode())
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(port: int, num_requests: int, concurrency: int, num_questions: int):
+    rng = random.Random(2)
+    bodies = [json.dumps({"answers": random_answers(rng, num_questions)}).encode()
+              for _ in range(num_requests)]
+    latencies = []
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, bodies[i::concurrency], latencies) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return num_requests / elapsed, latencies
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("El servicio no arrancó a tiempo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    
+    num_questions = len(get_app_resources().questions_data["questions"])
+    
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    
+    service = subprocess.Popen(
+        [sys.executable, str(ROOT / "src" / "service.py"), "--port", str(port), "--workers", str(args.workers)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        throughput, latencies = asyncio.run(run_load(port, args.requests, args.concurrency, num_questions))
+    finally:
+        service.terminate()
+        service.wait()
+    
+    baseline = in_process_baseline(args.requests, num_questions)
+    
+    print(f"Peticiones: {args.requests}, concurrencia: {args.concurrency}, workers: {args.workers}")
+    print(f"HTTP:        {throughput:>10.0f} req/s  p50 {percentile(latencies, 0.5) * 1000:.2f} ms"
+          f"  p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"En proceso:  {baseline:>10.0f} req/s")
+    print(f"Relación HTTP / en proceso: {throughput / baseline:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Generadores de datos sintéticos para los benchmarks de Auto Personality App
+"""
+
+import random
+from typing import Any, Dict, List
+
+CAR_TYPES = ["Sedán", "SUV Compacto", "Pickup", "Hatchback", "Roadster Deportivo", "Híbrido Compacto"]
+BRANDS = ["Tesla", "Toyota", "Ford", "Mazda", "Honda", "Mini", "BMW", "Jeep", "Audi", "Subaru"]
+PRICE_RANGES = ["$", "$$", "$$$", "$$$$"]
+
+
+def make_catalog(num_cars: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Genera un catálogo sintético con el mismo formato que ``data/cars.json``
+    
+    Args:
+        num_cars (int): Número de autos a generar
+        seed (int): Semilla para resultados reproducibles
+    
+    Returns:
+        Dict[str, Any]: Datos de autos con la clave ``cars``
+    """
+    rng = random.Random(seed)
+    cars = []
+    
+    for i in range(num_cars):
+        brand = rng.choice(BRANDS)
+        cars.append({
+            "id": f"car_{i}",
+            "brand": brand,
+            "model": f"Modelo {i}",
+            "type": rng.choice(CAR_TYPES),
+            "year": rng.randint(2015, 2025),
+            # Las versiones reales se reparten en décimas dentro de [1, 5]
+            "vector": [round(rng.uniform(1, 5), 1) for _ in range(5)],
+            "description": f"{brand} sintético número {i}.",
+            "emoji": "🚗",
+            "image": "",
+            "features": ["Característica A", "Característica B"],
+            "price_range": rng.choice(PRICE_RANGES),
+        })
+    
+    return {"cars": cars}
+
+
+def make_user_vectors(count: int, seed: int = 7) -> List[List[float]]:
+    """
+    Genera vectores de personalidad como los que produce el cuestionario
+    
+    Args:
+        count (int): Número de vectores
+        seed (int): Semilla para resultados reproducibles
+    
+    Returns:
+        List[List[float]]: Vectores de 5 dimensiones en [1, 5]
+    """
+    rng = random.Random(seed)
+    # Con 7 preguntas los valores son múltiplos de 1/7
+    return [[rng.randint(7, 35) / 7 for _ in range(5)] for _ in range(count)]
+
+
+def make_answer_sets(questions_data: Dict[str, Any], count: int, seed: int = 11) -> List[List[int]]:
+    """
+    Genera respuestas completas al cuestionario como índices de opción
+    
+    Args:
+        questions_data (Dict[str, Any]): Preguntas con el formato de ``data/questions.json``
+        count (int): Número de conjuntos de respuestas
+        seed (int): Semilla para resultados reproducibles
+    
+    Returns:
+        List[List[int]]: Índice de la opción elegida en cada pregunta, en orden
+    """
+    rng = random.Random(seed)
+    option_counts = [len(question["options"]) for question in questions_data["questions"]]
+    return [[rng.randrange(num_options) for num_options in option_counts] for _ in range(count)]
+
+
+def answers_with_weights(questions_data: Dict[str, Any], answer_indices: List[int]) -> List[Dict[str, Any]]:
+    """
+    Convierte índices de opción en las respuestas que recibe ``calculate_personality_vector``
+    
+    Args:
+        questions_data (Dict[str, Any]): Preguntas con el formato de ``data/questions.json``
+        answer_indices (List[int]): Índice de la opción elegida en cada pregunta
+    
+    Returns:
+        List[Dict[str, Any]]: Opciones elegidas (texto y pesos)
+    """
+    return [
+        question["options"][index]
+        for question, index in zip(questions_data["questions"], answer_indices)
+    ]
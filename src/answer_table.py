@@ -0,0 +1,392 @@
+"""
+Tabla precalculada de recomendaciones para todo el espacio de respuestas
+
+Con pocas preguntas y opciones, el número de combinaciones posibles es pequeño
+(5^7 = 78.125 para ``data/questions.json``). La tabla guarda, para cada
+combinación completa, el vector de personalidad y los top-N autos, en archivos
+``.npy`` que se abren con ``mmap`` sin leerlos completos.
+
+La fila de una combinación es su índice en base mixta: la primera pregunta es
+el dígito más significativo y cada pregunta tiene tantos valores como opciones.
+
+Uso:
+    python src/answer_table.py [--top-n 10] [--output data/cache/answers]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+from matcher import AutoMatcher
+from metrics import increment
+from personality import PersonalityProcessor
+from records import Recommendation
+from similarity import catalog_fingerprint
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_TABLE_DIR = PROJECT_ROOT / "data" / "cache" / "answers"
+
+META_NAME = "meta.json"
+ARRAY_NAMES = ("vectors", "indices", "scores")
+
+# Combinaciones procesadas por bloque al construir la tabla
+BUILD_CHUNK_SIZE = 8192
+
+
+def questions_fingerprint(processor: PersonalityProcessor) -> str:
+    """
+    Calcula una huella de las preguntas compiladas en el procesador
+    
+    Cambia si cambian las opciones, sus pesos o los pesos por dimensión.
+    
+    Args:
+        processor (PersonalityProcessor): Procesador con preguntas compiladas
+    
+    Returns:
+        str: Huella hexadecimal SHA-256
+    """
+    if processor.weight_tensor is None:
+        raise ValueError("No hay preguntas compiladas: llama a compile_questions primero")
+    
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(processor.option_counts, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(processor.weight_tensor, dtype=np.float64).tobytes())
+    digest.update(np.asarray(processor.dimension_weights, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _matcher_fingerprint(matcher: AutoMatcher) -> str:
+    """Huella del catálogo del matcher (ver ``catalog_fingerprint``)"""
+    snapshot = matcher.snapshot
+    return catalog_fingerprint(snapshot.car_ids, snapshot.reference_vectors)
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    """
+    Guarda un arreglo ``.npy`` de forma atómica
+    
+    Args:
+        path (Path): Ruta final
+        array (np.ndarray): Arreglo a guardar
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        np.save(file, array)
+    os.replace(tmp_path, path)
+
+
+class AnswerTable:
+    """
+    Vector de personalidad y top-N autos para cada combinación de respuestas
+    
+    Solo cubre cuestionarios completos; las respuestas parciales se calculan en vivo.
+    """
+    
+    def __init__(self,
+                 option_counts: Sequence[int],
+                 vectors: np.ndarray,
+                 indices: np.ndarray,
+                 scores: np.ndarray,
+                 questions_fingerprint: str,
+                 catalog_fingerprint: str):
+        """
+        Inicializa la tabla
+        
+        Args:
+            option_counts (Sequence[int]): Número de opciones de cada pregunta
+            vectors (np.ndarray): Vectores de personalidad (C, 5)
+            indices (np.ndarray): Índices de autos recomendados (C, N)
+            scores (np.ndarray): Porcentajes de match (C, N)
+            questions_fingerprint (str): Huella de las preguntas con las que se construyó
+            catalog_fingerprint (str): Huella del catálogo con el que se construyó
+        """
+        self.option_counts = tuple(int(count) for count in option_counts)
+        self.vectors = vectors
+        self.indices = indices
+        self.scores = scores
+        self.questions_fingerprint = questions_fingerprint
+        self.catalog_fingerprint = catalog_fingerprint
+        
+        # Versión del matcher con la que se validó la huella; los índices de
+        # autos dejan de servir cuando el catálogo se actualiza en memoria
+        self.catalog_version: Optional[int] = None
+    
+    @property
+    def top_n(self) -> int:
+        """Número de recomendaciones guardadas por combinación"""
+        return self.indices.shape[1]
+    
+    @property
+    def num_combinations(self) -> int:
+        """Número de combinaciones de respuestas cubiertas"""
+        return len(self.vectors)
+    
+    @classmethod
+    def build(cls, processor: PersonalityProcessor, matcher: AutoMatcher, top_n: int = 10,
+              chunk_size: int = BUILD_CHUNK_SIZE) -> "AnswerTable":
+        """
+        Enumera todas las combinaciones de respuestas y calcula sus recomendaciones
+        
+        Args:
+            processor (PersonalityProcessor): Procesador con preguntas compiladas
+            matcher (AutoMatcher): Matcher del catálogo
+            top_n (int): Recomendaciones a guardar por combinación
+            chunk_size (int): Combinaciones por bloque
+        
+        Returns:
+            AnswerTable: Tabla con las huellas de las preguntas y el catálogo actuales
+        """
+        fingerprint = questions_fingerprint(processor)
+        catalog_version = matcher.catalog_version
+        catalog = _matcher_fingerprint(matcher)
+        option_counts = tuple(int(count) for count in processor.option_counts)
+        num_combinations = int(np.prod(option_counts, dtype=np.int64))
+        top_n = max(0, min(top_n, len(matcher.cars)))
+        
+        vectors = np.empty((num_combinations, len(processor.dimensions)), dtype=np.float64)
+        indices = np.empty((num_combinations, top_n), dtype=np.int32)
+        scores = np.empty((num_combinations, top_n), dtype=np.float64)
+        
+        for start in range(0, num_combinations, chunk_size):
+            stop = min(start + chunk_size, num_combinations)
+            answers = np.stack(np.unravel_index(np.arange(start, stop), option_counts), axis=1)
+            
+            chunk_vectors = processor.calculate_personality_vectors(answers)
+            chunk_indices, chunk_scores = matcher.find_best_matches_batch(chunk_vectors, top_n)
+            
+            vectors[start:stop] = chunk_vectors
+            indices[start:stop] = chunk_indices
+            scores[start:stop] = chunk_scores
+        
+        table = cls(option_counts, vectors, indices, scores, fingerprint, catalog)
+        table.catalog_version = catalog_version
+        return table
+    
+    def save(self, directory: Union[str, Path]) -> None:
+        """
+        Guarda la tabla en un directorio
+        
+        Los metadatos se borran antes de escribir los arreglos y se escriben al
+        final, así una tabla a medio guardar no se puede cargar.
+        
+        Args:
+            directory (Union[str, Path]): Directorio de destino
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / META_NAME).unlink(missing_ok=True)
+        
+        for name in ARRAY_NAMES:
+            _save_array(directory / f"{name}.npy", getattr(self, name))
+        
+        meta = {
+            "option_counts": list(self.option_counts),
+            "top_n": self.top_n,
+            "questions_fingerprint": self.questions_fingerprint,
+            "catalog_fingerprint": self.catalog_fingerprint,
+        }
+        tmp_path = directory / f"{META_NAME}.tmp"
+        tmp_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp_path, directory / META_NAME)
+    
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> Optional["AnswerTable"]:
+        """
+        Carga una tabla guardada con ``save``
+        
+        Args:
+            directory (Union[str, Path]): Directorio de la tabla
+            mmap (bool): Abrir los arreglos con ``mmap`` en lugar de leerlos
+        
+        Returns:
+            Optional[AnswerTable]: La tabla, o None si no existe o está dañada
+        """
+        directory = Path(directory)
+        
+        try:
+            meta = json.loads((directory / META_NAME).read_text(encoding="utf-8"))
+            arrays = {
+                name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None,
+                              allow_pickle=False)
+                for name in ARRAY_NAMES
+            }
+            table = cls(
+                option_counts=meta["option_counts"],
+                questions_fingerprint=meta["questions_fingerprint"],
+                catalog_fingerprint=meta["catalog_fingerprint"],
+                **arrays
+            )
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+        
+        num_combinations = int(np.prod(table.option_counts, dtype=np.int64))
+        shapes_ok = (
+            table.vectors.shape[0] == num_combinations
+            and table.indices.shape == (num_combinations, meta["top_n"])
+            and table.scores.shape == table.indices.shape
+        )
+        return table if shapes_ok else None
+    
+    def is_valid_for(self, processor: PersonalityProcessor, matcher: AutoMatcher) -> bool:
+        """
+        Indica si la tabla corresponde a las preguntas y el catálogo actuales
+        
+        Args:
+            processor (PersonalityProcessor): Procesador con preguntas compiladas
+            matcher (AutoMatcher): Matcher del catálogo
+        
+        Returns:
+            bool: True si ambas huellas coinciden
+        """
+        return (self.questions_fingerprint == questions_fingerprint(processor)
+                and self.catalog_fingerprint == _matcher_fingerprint(matcher))
+    
+    def lookup(self, answers: Sequence[int],
+               top_n: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Obtiene el resultado precalculado de una combinación de respuestas
+        
+        Args:
+            answers (Sequence[int]): Índice de la opción elegida en cada pregunta
+            top_n (int): Recomendaciones pedidas (como máximo ``top_n`` de la tabla)
+        
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]: Vector, índices de
+            autos y porcentajes, o None si la combinación no está en la tabla
+        """
+        if len(answers) != len(self.option_counts) or not 0 <= top_n <= self.top_n:
+            return None
+        
+        try:
+            row = int(np.ravel_multi_index(tuple(answers), self.option_counts))
+        except (TypeError, ValueError):
+            return None
+        
+        return self.vectors[row], self.indices[row, :top_n], self.scores[row, :top_n]
+
+
+def load_answer_table(processor: PersonalityProcessor, matcher: AutoMatcher,
+                      directory: Union[str, Path] = DEFAULT_TABLE_DIR) -> Optional[AnswerTable]:
+    """
+    Carga la tabla de respuestas si corresponde a las preguntas y el catálogo actuales
+    
+    Args:
+        processor (PersonalityProcessor): Procesador con preguntas compiladas
+        matcher (AutoMatcher): Matcher del catálogo
+        directory (Union[str, Path]): Directorio de la tabla
+    
+    Returns:
+        Optional[AnswerTable]: La tabla, o None si falta o quedó desactualizada
+    """
+    catalog_version = matcher.catalog_version
+    table = AnswerTable.load(directory)
+    
+    if table is None or not table.is_valid_for(processor, matcher):
+        return None
+    
+    table.catalog_version = catalog_version
+    return table
+
+
+def precomputed_recommendations(matcher: AutoMatcher,
+                                answers: Sequence[int],
+                                top_n: int = 3,
+                                table: Optional[AnswerTable] = None) -> Optional[Tuple[List[float], List[Recommendation]]]:
+    """
+    Obtiene de la tabla el vector de personalidad y las recomendaciones de unas respuestas
+    
+    Args:
+        matcher (AutoMatcher): Matcher del catálogo
+        answers (Sequence[int]): Índice de la opción elegida en cada pregunta
+        top_n (int): Número de recomendaciones
+        table (Optional[AnswerTable]): Tabla validada con ``load_answer_table``
+    
+    Returns:
+        Optional[Tuple[List[float], List[Recommendation]]]: Vector y recomendaciones,
+        o None si la tabla no cubre la consulta y hay que calcularla en vivo
+    """
+    if table is None:
+        return None
+    
+    snapshot = matcher.snapshot
+    
+    # Tras una actualización del catálogo en memoria la tabla ya no corresponde
+    if table.catalog_version != snapshot.version:
+        return None
+    
+    result = table.lookup(answers, min(top_n, len(snapshot.cars)))
+    
+    if result is None:
+        increment("answer_table_miss")
+        return None
+    
+    increment("answer_table_hit")
+    vector, indices, scores = result
+    recommendations = [
+        Recommendation(snapshot.cars[index], match_score)
+        for index, match_score in zip(indices.tolist(), scores.tolist())
+    ]
+    
+    return vector.tolist(), recommendations
+
+
+def recommend_from_answers(processor: PersonalityProcessor,
+                           matcher: AutoMatcher,
+                           answers: Sequence[int],
+                           top_n: int = 3,
+                           table: Optional[AnswerTable] = None) -> Tuple[List[float], List[Recommendation]]:
+    """
+    Calcula el vector de personalidad y las recomendaciones de unas respuestas
+    
+    Usa la tabla precalculada cuando cubre la combinación; si no, calcula en
+    vivo con el procesador y el matcher. Ambos caminos dan el mismo resultado.
+    
+    Args:
+        processor (PersonalityProcessor): Procesador con preguntas compiladas
+        matcher (AutoMatcher): Matcher del catálogo
+        answers (Sequence[int]): Índice de la opción elegida en cada pregunta
+        top_n (int): Número de recomendaciones
+        table (Optional[AnswerTable]): Tabla validada con ``load_answer_table``
+    
+    Returns:
+        Tuple[List[float], List[Recommendation]]: Vector de personalidad y
+        recomendaciones en el formato de ``find_best_matches``
+    """
+    result = precomputed_recommendations(matcher, answers, top_n, table)
+    
+    if result is None:
+        personality_vector = processor.calculate_personality_vector_from_indices(answers)
+        return personality_vector, matcher.find_best_matches(personality_vector, top_n=top_n)
+    
+    return result
+
+
+def main() -> None:
+    from resources import get_app_resources
+    
+    parser = argparse.ArgumentParser(description="Precalcula las recomendaciones de todas las respuestas")
+    parser.add_argument("--top-n", type=int, default=10, help="Recomendaciones por combinación")
+    parser.add_argument("--output", default=str(DEFAULT_TABLE_DIR))
+    args = parser.parse_args()
+    
+    resources = get_app_resources()
+    if resources is None:
+        raise SystemExit("No se pudieron cargar los datos")
+    
+    start = time.perf_counter()
+    table = AnswerTable.build(resources.processor, resources.matcher, top_n=args.top_n)
+    table.save(args.output)
+    elapsed = time.perf_counter() - start
+    
+    size = sum((Path(args.output) / f"{name}.npy").stat().st_size for name in ARRAY_NAMES)
+    print(f"✅ {table.num_combinations} combinaciones x {table.top_n} autos en {elapsed:.2f}s")
+    print(f"📄 Tabla: {args.output} ({size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Agrupación de consultas concurrentes para Auto Personality App
+
+Bajo carga, muchas sesiones piden recomendaciones a la vez y cada una hace su
+propia llamada a ``find_best_matches`` con un solo vector. ``MicroBatcher``
+junta los vectores que llegan dentro de una ventana corta (por defecto 2 ms o
+256 consultas), los puntúa como una sola matriz y resuelve el future de cada
+llamador. Los resultados son los mismos que los de ``find_best_matches``.
+
+Con una ventana de 0 no se espera: el lote junta las consultas que llegaron
+en la misma vuelta del event loop, sin agregar latencia.
+
+Ver ``benchmarks/bench_batching.py`` para latencias y throughput según la concurrencia.
+"""
+
+import asyncio
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from matcher import AutoMatcher, top_matches_batch
+from metrics import timer
+from records import Recommendation
+
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_BATCH = 256
+
+
+class MicroBatcher:
+    """
+    Cola de consultas top-N que se resuelven por lotes en el event loop
+    
+    Cada lote usa un único snapshot del catálogo, así todas sus consultas ven
+    la misma versión aunque haya actualizaciones en curso.
+    """
+    
+    def __init__(self, matcher: AutoMatcher, max_delay: float = DEFAULT_MAX_DELAY,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Inicializa la cola vacía
+        
+        Args:
+            matcher (AutoMatcher): Matcher del catálogo
+            max_delay (float): Segundos que espera la primera consulta de un lote
+                (0: cerrar el lote al terminar la vuelta actual del event loop)
+            max_batch (int): Consultas que disparan el lote sin esperar la ventana
+        """
+        self.matcher = matcher
+        self.max_delay = max_delay
+        self.max_batch = max(1, max_batch)
+        
+        self._pending: List[Tuple[np.ndarray, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        
+        self.batches = 0
+        self.requests = 0
+    
+    async def find_best_matches(self, user_vector: List[float], top_n: int = 3) -> List[Recommendation]:
+        """
+        Encola una consulta y espera su resultado
+        
+        Args:
+            user_vector (List[float]): Vector de personalidad del usuario
+            top_n (int): Número de recomendaciones a retornar
+        
+        Returns:
+            List[Recommendation]: Lo mismo que ``AutoMatcher.find_best_matches``
+        """
+        # Validar aquí: un vector inválido no debe hacer fallar al resto del lote
+        vector = np.asarray(user_vector, dtype=np.float64)
+        num_dimensions = self.matcher.reference_vectors.shape[1]
+        if vector.shape != (num_dimensions,):
+            raise ValueError(f"Se esperaba un vector de {num_dimensions} valores")
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((vector, top_n, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            if self.max_delay > 0:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+            else:
+                self._timer = loop.call_soon(self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Puntúa todas las consultas pendientes como una matriz y resuelve sus futures"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        pending, self._pending = self._pending, []
+        
+        # Los llamadores cancelados (por ejemplo, por timeout) ya no esperan resultado
+        pending = [item for item in pending if not item[2].done()]
+        if not pending:
+            return
+        
+        snapshot = self.matcher.snapshot
+        top_n = max(max(request_top_n for _, request_top_n, _ in pending), 0)
+        
+        try:
+            user_matrix = np.stack([item[0] for item in pending])
+            with timer("micro_batch"):
+                indices, scores = top_matches_batch(snapshot.reference_vectors, user_matrix, top_n)
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        
+        self.batches += 1
+        self.requests += len(pending)
+        
+        # El top-N de cada consulta es un prefijo del top del lote (mismo orden y desempate)
+        for row, (_, request_top_n, future) in enumerate(pending):
+            future.set_result([
+                Recommendation(snapshot.cars[index], match_score)
+                for index, match_score in zip(indices[row, :max(request_top_n, 0)].tolist(),
+                                              scores[row, :max(request_top_n, 0)].tolist())
+            ])
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Estadísticas de agrupación desde el inicio
+        
+        Returns:
+            Dict[str, Any]: Lotes, consultas y tamaño medio de lote
+        """
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
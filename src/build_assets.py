@@ -0,0 +1,168 @@
+"""
+Compilación offline de las imágenes del catálogo para Auto Personality App
+
+Valida que cada campo ``image`` de ``data/cars.json`` apunte a un archivo real,
+genera en paralelo todas las variantes que usa la interfaz y escribe un
+manifiesto con hashes y dimensiones, y la versión (mtime y tamaño) de cada
+original. Con el manifiesto, la app sirve las variantes sin abrir los
+originales mientras no cambien.
+
+Uso:
+    python src/build_assets.py [--workers 4] [--catalog data/cars.json]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from PIL import Image
+
+from images import (DEFAULT_CACHE_DIR, DEFAULT_IMAGES_DIR, MANIFEST_NAME, OUTPUT_EXTENSION,
+                    OUTPUT_FORMAT, OUTPUT_QUALITY, PROJECT_ROOT, VARIANTS, file_digest,
+                    render_variants, variant_key, write_atomic)
+
+
+def build_image(source_path: str, cache_dir: str,
+                variants: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+    """
+    Genera todas las variantes de una imagen (se ejecuta en un proceso del pool)
+    
+    Las variantes que ya existen en la caché no se vuelven a generar.
+    
+    Args:
+        source_path (str): Imagen original
+        cache_dir (str): Carpeta de variantes generadas
+        variants (Dict[str, Tuple[int, int]]): Variantes a generar por nombre
+    
+    Returns:
+        Dict[str, Any]: Entrada del manifiesto para la imagen
+    """
+    # El stat se toma antes del hash: si el archivo cambia mientras tanto, la
+    # app no reconoce la versión y lo verifica por contenido
+    source_stat = Path(source_path).stat()
+    source_digest = file_digest(source_path)
+    cache_dir = Path(cache_dir)
+    
+    paths = {
+        name: cache_dir / f"{variant_key(source_digest, size)}.{OUTPUT_EXTENSION}"
+        for name, size in variants.items()
+    }
+    
+    missing = [name for name, path in paths.items() if not path.exists()]
+    if missing:
+        rendered = render_variants(source_path, [variants[name] for name in missing])
+        for name, data in zip(missing, rendered):
+            write_atomic(paths[name], data)
+    
+    entry = {
+        "source_sha256": source_digest,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "source_bytes": source_stat.st_size,
+        "variants": {},
+    }
+    
+    for name, path in paths.items():
+        data = path.read_bytes()
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = image.size
+        
+        entry["variants"][name] = {
+            "file": path.name,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "width": width,
+            "height": height,
+            "max_width": variants[name][0],
+            "max_height": variants[name][1],
+            "bytes": len(data),
+        }
+    
+    return entry
+
+
+def validate_image_references(cars: List[Dict[str, Any]], images_dir: Path) -> Tuple[List[str], List[str]]:
+    """
+    Verifica que las imágenes referenciadas por los autos existan
+    
+    Args:
+        cars (List[Dict[str, Any]]): Autos del catálogo
+        images_dir (Path): Carpeta de imágenes originales
+    
+    Returns:
+        Tuple[List[str], List[str]]: Imágenes válidas (sin repetir) y errores encontrados
+    """
+    valid = []
+    errors = []
+    
+    for car in cars:
+        car_id = car.get('id', '?')
+        image_filename = car.get('image')
+        
+        if not image_filename:
+            errors.append(f"{car_id}: sin campo 'image'")
+        elif not (images_dir / image_filename).is_file():
+            errors.append(f"{car_id}: imagen no encontrada '{image_filename}'")
+        elif image_filename not in valid:
+            valid.append(image_filename)
+    
+    return valid, errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compila las variantes de imágenes del catálogo")
+    parser.add_argument("--catalog", default=str(PROJECT_ROOT / "data" / "cars.json"))
+    parser.add_argument("--images-dir", default=str(DEFAULT_IMAGES_DIR))
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos en paralelo (por defecto, uno por CPU)")
+    args = parser.parse_args()
+    
+    images_dir = Path(args.images_dir)
+    cache_dir = Path(args.cache_dir)
+    
+    with open(args.catalog, 'r', encoding='utf-8') as file:
+        cars = json.load(file).get('cars', [])
+    
+    image_filenames, errors = validate_image_references(cars, images_dir)
+    
+    start = time.perf_counter()
+    images: Dict[str, Any] = {}
+    
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(build_image, str(images_dir / filename), str(cache_dir), VARIANTS): filename
+            for filename in image_filenames
+        }
+        
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                images[filename] = future.result()
+            except Exception as e:
+                errors.append(f"{filename}: no se pudo procesar ({e})")
+    
+    manifest = {
+        "format": OUTPUT_FORMAT,
+        "quality": OUTPUT_QUALITY,
+        "images": {filename: images[filename] for filename in sorted(images)},
+    }
+    write_atomic(cache_dir / MANIFEST_NAME,
+                 json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(images)} imágenes, {len(images) * len(VARIANTS)} variantes en {elapsed:.2f}s")
+    print(f"📄 Manifiesto: {cache_dir / MANIFEST_NAME}")
+    
+    for error in errors:
+        print(f"❌ {error}", file=sys.stderr)
+    
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Catálogo de autos compilado en formato binario para Auto Personality App
+
+El archivo compilado guarda los vectores en un arreglo float64 contiguo y los
+campos de texto en una tabla de cadenas indexada por offsets (cada cadena
+distinta se guarda una sola vez). Se abre con ``mmap``: los procesos que leen
+el mismo archivo comparten sus páginas y nada se decodifica hasta que se usa.
+
+Estructura del archivo:
+    MAGIC (8 bytes) | largo del encabezado (uint64) | encabezado JSON |
+    secciones alineadas a 64 bytes (ver ``encabezado["sections"]``)
+
+Uso:
+    python src/catalog.py [--input data/cars.json] [--output data/cars.catalog]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import numpy as np
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from records import CarRecord, ColumnarCars
+
+MAGIC = b"APCATLG1"
+FORMAT_VERSION = 2
+COMPILED_EXTENSION = ".catalog"
+SECTION_ALIGNMENT = 64
+
+REQUIRED_FIELDS = ('id', 'brand', 'model', 'vector')
+VECTOR_SIZE = 5
+
+# Campos de texto guardados como columnas de la tabla de cadenas
+STRING_FIELDS = ('id', 'brand', 'model', 'type', 'price_range', 'description', 'emoji', 'image')
+
+# Bits de la columna ``flags``
+HAS_YEAR = 1
+HAS_FEATURES = 2
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+
+def validate_car(car: Any) -> Optional[str]:
+    """
+    Verifica que un auto tenga el formato que necesita el matcher
+    
+    Args:
+        car (Any): Registro del catálogo
+    
+    Returns:
+        Optional[str]: Motivo del rechazo, o None si el auto es válido
+    """
+    if not isinstance(car, Mapping):
+        return "el registro no es un objeto"
+    
+    missing = [field for field in REQUIRED_FIELDS if field not in car]
+    if missing:
+        return f"faltan campos: {', '.join(missing)}"
+    
+    vector = car['vector']
+    if not isinstance(vector, list) or len(vector) != VECTOR_SIZE:
+        return f"'vector' debe ser una lista de {VECTOR_SIZE} elementos"
+    
+    if not all(isinstance(x, (int, float)) for x in vector):
+        return "'vector' debe contener solo números"
+    
+    return None
+
+
+def compiled_catalog_path(catalog_path: Union[str, Path]) -> Path:
+    """
+    Ruta del catálogo compilado junto al archivo JSON
+    
+    Args:
+        catalog_path (Union[str, Path]): Ruta al catálogo (por ejemplo ``data/cars.json``)
+    
+    Returns:
+        Path: Ruta ``<catálogo>.catalog`` en el mismo directorio
+    """
+    path = Path(catalog_path)
+    return path.with_name(f"{path.stem}{COMPILED_EXTENSION}")
+
+
+class _StringTable:
+    """Cadenas distintas en orden de aparición, con su identificador"""
+    
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.chunks: List[bytes] = []
+    
+    def add(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.chunks)
+            self.ids[value] = string_id
+            self.chunks.append(value.encode("utf-8"))
+        return string_id
+    
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = np.zeros(len(self.chunks) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(chunk) for chunk in self.chunks], dtype=np.int64)
+        data = np.frombuffer(b"".join(self.chunks), dtype=np.uint8)
+        return offsets, data
+
+
+def compile_catalog(cars: Iterable[Dict[str, Any]], output_path: Union[str, Path]) -> Tuple[int, List[str]]:
+    """
+    Compila autos al formato binario
+    
+    Solo se incluyen los autos que aceptaría ``AutoMatcher``. Los campos que
+    no encajan en las columnas (otros nombres u otros tipos) se conservan como
+    JSON en la tabla de cadenas.
+    
+    Args:
+        cars (Iterable[Dict[str, Any]]): Autos del catálogo
+        output_path (Union[str, Path]): Archivo de salida
+    
+    Returns:
+        Tuple[int, List[str]]: Autos escritos y motivos de los rechazados
+    """
+    strings = _StringTable()
+    vectors: List[List[float]] = []
+    years: List[int] = []
+    flags: List[int] = []
+    string_columns: Dict[str, List[int]] = {field: [] for field in STRING_FIELDS}
+    extras: List[int] = []
+    feature_offsets = [0]
+    feature_ids: List[int] = []
+    rejected: List[str] = []
+    
+    for position, car in enumerate(cars):
+        reason = validate_car(car)
+        if reason is not None:
+            rejected.append(f"#{position} ({car.get('id', '?') if isinstance(car, Mapping) else '?'}): {reason}")
+            continue
+        
+        car_flags = 0
+        year = 0
+        extra: Dict[str, Any] = {}
+        columns = {field: -1 for field in STRING_FIELDS}
+        
+        for key, value in car.items():
+            if key == 'vector':
+                continue
+            if key in columns and isinstance(value, str):
+                columns[key] = strings.add(value)
+            elif key == 'year' and type(value) is int and -2 ** 31 <= value < 2 ** 31:
+                car_flags |= HAS_YEAR
+                year = value
+            elif key == 'features' and isinstance(value, list) and all(isinstance(x, str) for x in value):
+                car_flags |= HAS_FEATURES
+                feature_ids.extend(strings.add(feature) for feature in value)
+            else:
+                extra[key] = value
+        
+        vectors.append(car['vector'])
+        years.append(year)
+        flags.append(car_flags)
+        for field in STRING_FIELDS:
+            string_columns[field].append(columns[field])
+        extras.append(strings.add(json.dumps(extra, ensure_ascii=False)) if extra else -1)
+        feature_offsets.append(len(feature_ids))
+    
+    string_offsets, string_data = strings.arrays()
+    num_cars = len(vectors)
+    
+    sections: Dict[str, np.ndarray] = {
+        "vectors": np.array(vectors, dtype=np.float64).reshape(num_cars, VECTOR_SIZE),
+        "years": np.array(years, dtype=np.int32),
+        "flags": np.array(flags, dtype=np.uint8),
+        "extras": np.array(extras, dtype=np.int32),
+        "feature_offsets": np.array(feature_offsets, dtype=np.int64),
+        "feature_ids": np.array(feature_ids, dtype=np.int32),
+        "string_offsets": string_offsets,
+        "string_data": string_data,
+    }
+    for field in STRING_FIELDS:
+        sections[f"str_{field}"] = np.array(string_columns[field], dtype=np.int32)
+    
+    _write_sections(Path(output_path), num_cars, sections)
+    return num_cars, rejected
+
+
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+
+def _write_sections(path: Path, num_cars: int, sections: Dict[str, np.ndarray]) -> None:
+    """
+    Escribe encabezado y secciones de forma atómica
+    
+    Los offsets de las secciones dependen del largo del encabezado, así que se
+    calculan sobre un encabezado con espacio reservado y se rellena con espacios.
+    
+    Args:
+        path (Path): Archivo de salida
+        num_cars (int): Número de autos
+        sections (Dict[str, np.ndarray]): Arreglos por nombre de sección
+    """
+    layout = {name: {"dtype": array.dtype.str, "shape": list(array.shape)} for name, array in sections.items()}
+    header = {"version": FORMAT_VERSION, "num_cars": num_cars,
+              "string_fields": list(STRING_FIELDS), "sections": layout}
+    
+    # Reservar espacio para los offsets (como mucho 20 dígitos cada uno)
+    for entry in layout.values():
+        entry["offset"] = 10 ** 19
+    header_size = len(json.dumps(header).encode("utf-8"))
+    
+    offset = _align(len(MAGIC) + _HEADER_LENGTH.size + header_size)
+    for name, array in sections.items():
+        layout[name]["offset"] = offset
+        offset = _align(offset + array.nbytes)
+    
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC + _HEADER_LENGTH.pack(header_size) + header_bytes)
+        for name, array in sections.items():
+            file.write(b"\0" * (layout[name]["offset"] - file.tell()))
+            file.write(np.ascontiguousarray(array).tobytes())
+    
+    os.replace(tmp_path, path)
+
+
+class CompiledCatalog(ColumnarCars):
+    """
+    Catálogo compilado abierto con ``mmap``, usable como lista de autos
+    
+    Cada acceso por índice arma un ``CarRecord`` a partir de las columnas; los
+    vectores y las columnas se exponen sin copiarlos.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """
+        Abre un catálogo compilado
+        
+        Args:
+            path (Union[str, Path]): Archivo generado por ``compile_catalog``
+        
+        Raises:
+            ValueError: Si el archivo no es un catálogo compilado válido
+        """
+        self.path = Path(path)
+        
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        buffer = self._mmap
+        prefix = len(MAGIC) + _HEADER_LENGTH.size
+        
+        if len(buffer) < prefix or buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"No es un catálogo compilado: {self.path}")
+        
+        (header_size,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+        header = json.loads(bytes(buffer[prefix:prefix + header_size]))
+        
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Versión de catálogo no soportada: {header.get('version')} "
+                             f"(se espera {FORMAT_VERSION}; vuelve a compilarlo con src/catalog.py)")
+        
+        self.num_cars = header["num_cars"]
+        self.string_fields = tuple(header["string_fields"])
+        self._sections: Dict[str, np.ndarray] = {}
+        
+        for name, entry in header["sections"].items():
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            count = int(np.prod(shape, dtype=np.int64))
+            if entry["offset"] + count * dtype.itemsize > len(buffer):
+                raise ValueError(f"Sección '{name}' fuera del archivo: {self.path}")
+            self._sections[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                                 offset=entry["offset"]).reshape(shape)
+        
+        self._string_offsets = self._sections["string_offsets"]
+        self._string_data = self._sections["string_data"]
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        """Matriz (N, 5) float64 de vectores, de solo lectura"""
+        return self._sections["vectors"]
+    
+    def string(self, string_id: int) -> str:
+        """
+        Decodifica una cadena de la tabla
+        
+        Args:
+            string_id (int): Identificador de la cadena
+        
+        Returns:
+            str: Cadena decodificada
+        """
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return self._string_data[start:end].tobytes().decode("utf-8")
+    
+    def _extra(self, index: int) -> Dict[str, Any]:
+        """Campos guardados como JSON de un auto"""
+        string_id = int(self._sections["extras"][index])
+        return json.loads(self.string(string_id)) if string_id >= 0 else {}
+    
+    def categories(self, field: str) -> Tuple[List[Any], np.ndarray]:
+        """
+        Codifica un campo de todos los autos como categorías
+        
+        Útil para campos con pocos valores distintos (tipo, marca, precio): solo
+        se decodifica cada valor distinto una vez.
+        
+        Args:
+            field (str): Campo de texto (ver ``STRING_FIELDS``)
+        
+        Returns:
+            Tuple[List[Any], np.ndarray]: Valores distintos (None si falta) y el
+            código de cada auto (N,) como posición en esa lista
+        """
+        string_ids = self._sections[f"str_{field}"]
+        unique_ids, codes = np.unique(string_ids, return_inverse=True)
+        values = [self.string(int(string_id)) if string_id >= 0 else None for string_id in unique_ids]
+        codes = codes.reshape(-1).astype(np.intp)
+        
+        # Valores de otro tipo guardados como JSON
+        for index in np.flatnonzero((string_ids < 0) & (self._sections["extras"] >= 0)):
+            value = self._extra(int(index)).get(field)
+            if value is not None:
+                codes[index] = len(values)
+                values.append(value)
+        
+        return values, codes
+    
+    def years(self, missing: int) -> np.ndarray:
+        """
+        Columna de años
+        
+        Args:
+            missing (int): Valor para autos sin año entero
+        
+        Returns:
+            np.ndarray: Años (N,) int32
+        """
+        has_year = (self._sections["flags"] & HAS_YEAR).astype(bool)
+        return np.where(has_year, self._sections["years"], np.int32(missing)).astype(np.int32)
+    
+    def __len__(self) -> int:
+        return self.num_cars
+    
+    def __getitem__(self, index) -> Union[CarRecord, List[CarRecord]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.num_cars))]
+        
+        index = int(index)
+        if index < 0:
+            index += self.num_cars
+        if not 0 <= index < self.num_cars:
+            raise IndexError("Índice de auto fuera de rango")
+        
+        car: Dict[str, Any] = {}
+        for field in self.string_fields:
+            string_id = int(self._sections[f"str_{field}"][index])
+            if string_id >= 0:
+                car[field] = self.string(string_id)
+        
+        flags = int(self._sections["flags"][index])
+        if flags & HAS_YEAR:
+            car['year'] = int(self._sections["years"][index])
+        
+        if flags & HAS_FEATURES:
+            start, end = self._sections["feature_offsets"][index:index + 2]
+            car['features'] = [self.string(int(string_id))
+                               for string_id in self._sections["feature_ids"][start:end]]
+        
+        car.update(self._extra(index))
+        return CarRecord(car, self.vectors, index)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compila el catálogo JSON al formato binario")
+    parser.add_argument("--input", default=str(Path(__file__).parent.parent / "data" / "cars.json"))
+    parser.add_argument("--output", default=None, help="Por defecto, <catálogo>.catalog")
+    args = parser.parse_args()
+    
+    output = Path(args.output) if args.output else compiled_catalog_path(args.input)
+    
+    start = time.perf_counter()
+    with open(args.input, 'r', encoding='utf-8') as file:
+        cars = json.load(file).get('cars', [])
+    
+    written, rejected = compile_catalog(cars, output)
+    elapsed = time.perf_counter() - start
+    
+    print(f"✅ {written} autos compilados en {elapsed:.2f}s")
+    print(f"📄 Catálogo: {output} ({output.stat().st_size / 1024:.1f} KB)")
+    
+    for reason in rejected:
+        print(f"❌ {reason}", file=sys.stderr)
+    
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
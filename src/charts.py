@@ -0,0 +1,189 @@
+"""
+Gráfico de radar de personalidad con caché de figuras para Auto Personality App
+
+Armar la figura de Plotly cuesta varios milisegundos y la página de
+resultados la pedía en cada rerun. ``RadarFigureCache`` guarda las figuras ya
+armadas en una LRU cuya clave es el vector redondeado (a ``RADAR_DECIMALS``
+decimales, una diferencia invisible en el gráfico).
+
+La comparación con un auto superpone su vector en una figura aparte, con su
+propia entrada en la caché: la figura base en caché nunca se modifica.
+Copiar una figura de Plotly cuesta más que armarla de nuevo, así que la
+figura comparativa no parte de una copia de la base.
+
+Plotly se importa solo al armar la primera figura.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Sequence, Tuple
+
+from metrics import increment
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+RADAR_DIMENSIONS = ["Sostenibilidad", "Prestaciones", "Lujo y Confort", "Versatilidad", "Tech-savvy"]
+
+# Decimales de los vectores graficados (y de la clave de la caché)
+RADAR_DECIMALS = 2
+
+# Figuras que se conservan en la caché
+DEFAULT_MAX_FIGURES = 128
+
+
+def quantize_vector(vector: Sequence[float]) -> Tuple[float, ...]:
+    """
+    Redondea un vector para graficarlo y usarlo como clave
+    
+    Args:
+        vector (Sequence[float]): Vector de personalidad o de un auto
+    
+    Returns:
+        Tuple[float, ...]: Vector redondeado a ``RADAR_DECIMALS`` decimales
+    """
+    return tuple(round(float(score), RADAR_DECIMALS) for score in vector)
+
+
+def build_radar_figure(personality_vector: Sequence[float],
+                       overlay_vector: Optional[Sequence[float]] = None,
+                       overlay_name: str = "") -> "go.Figure":
+    """
+    Arma el gráfico de radar de un vector de personalidad
+    
+    Args:
+        personality_vector (Sequence[float]): Vector del usuario
+        overlay_vector (Optional[Sequence[float]]): Vector de un auto a superponer
+        overlay_name (str): Nombre del auto superpuesto (leyenda)
+    
+    Returns:
+        go.Figure: Figura de Plotly
+    """
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=list(personality_vector),
+        theta=RADAR_DIMENSIONS,
+        fill='toself',
+        name='Tu personalidad'
+    ))
+    
+    if overlay_vector is not None:
+        fig.add_trace(go.Scatterpolar(
+            r=list(overlay_vector),
+            theta=RADAR_DIMENSIONS,
+            fill='toself',
+            opacity=0.6,
+            name=overlay_name or 'Auto'
+        ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 5]
+            )),
+        showlegend=overlay_vector is not None,
+        height=300
+    )
+    return fig
+
+
+class RadarFigureCache:
+    """
+    LRU de figuras de radar por vector redondeado (y vector superpuesto)
+    
+    Las figuras se comparten entre sesiones: quien las reciba no debe
+    modificarlas.
+    """
+    
+    def __init__(self, max_figures: int = DEFAULT_MAX_FIGURES):
+        """
+        Inicializa la caché vacía
+        
+        Args:
+            max_figures (int): Figuras que se conservan
+        """
+        self.max_figures = max_figures
+        
+        self._figures: "OrderedDict[Hashable, go.Figure]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def figure(self, personality_vector: Sequence[float],
+               overlay_vector: Optional[Sequence[float]] = None,
+               overlay_name: str = "") -> "go.Figure":
+        """
+        Obtiene la figura de radar de un vector, armándola solo si no está en caché
+        
+        Args:
+            personality_vector (Sequence[float]): Vector del usuario
+            overlay_vector (Optional[Sequence[float]]): Vector de un auto a superponer
+            overlay_name (str): Nombre del auto superpuesto (leyenda)
+        
+        Returns:
+            go.Figure: Figura compartida (de solo lectura)
+        """
+        vector = quantize_vector(personality_vector)
+        overlay = quantize_vector(overlay_vector) if overlay_vector is not None else None
+        key = (vector, overlay, overlay_name if overlay is not None else "")
+        
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                increment("radar_cache_hit")
+                return fig
+        
+        # Armar fuera del lock: otra sesión puede armar la misma figura a la vez
+        fig = build_radar_figure(vector, overlay, overlay_name)
+        
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+            self.misses += 1
+        
+        increment("radar_cache_miss")
+        return fig
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Estadísticas de uso de la caché
+        
+        Returns:
+            Dict[str, int]: Aciertos, fallos y figuras en caché
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "figures": len(self._figures)}
+    
+    def clear(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._figures.clear()
+
+
+_default_cache: Optional[RadarFigureCache] = None
+_default_lock = threading.Lock()
+
+
+def get_radar_cache() -> RadarFigureCache:
+    """
+    Obtiene la caché de figuras compartida por todo el proceso
+    
+    Returns:
+        RadarFigureCache: Caché compartida entre sesiones
+    """
+    global _default_cache
+    
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = RadarFigureCache()
+    
+    return _default_cache
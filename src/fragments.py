@@ -0,0 +1,323 @@
+"""
+Fragmentos HTML de la interfaz de Auto Personality App, precompilados y en caché
+
+Streamlit vuelve a ejecutar el script completo en cada interacción, así que
+las tarjetas de autos se armaban de nuevo con f-strings en cada rerun. Aquí
+las partes fijas de cada tarjeta (marca, modelo, tipo, descripción) se
+arman una sola vez por auto y versión del catálogo; cada tarjeta completa se
+guarda por ``(car_id, bucket de match)``. El bucket es el porcentaje con un
+decimal, igual al que se muestra, así que el HTML en caché es idéntico al
+que se generaría en vivo.
+
+El CSS de la app también se arma (y compacta) una sola vez por proceso, pero
+se sigue enviando en cada rerun: Streamlit quita de la página los elementos
+que un rerun no vuelve a emitir.
+
+No depende de Streamlit.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Tarjetas completas que se conservan por catálogo
+DEFAULT_MAX_ENTRIES = 4096
+
+MATCH_FIELD = "{match}"
+
+# Plantillas por tipo de tarjeta; ``{match}`` es el porcentaje con un decimal
+CARD_TEMPLATES: Dict[str, str] = {
+    # Resultado simple (display_car_result)
+    "result": """
+<div style="
+    background: white;
+    padding: 2rem;
+    border-radius: 15px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    text-align: center;
+    margin: 1rem 0;
+">
+    <h2>{emoji} {brand} {model}</h2>
+    <h3 style="color: #667eea;">Match: {match}%</h3>
+    <p><strong>{type}</strong></p>
+    <p>{description}</p>
+</div>
+""",
+    # Texto junto a la imagen en la tarjeta principal (create_car_card)
+    "details": """
+<div style="padding: 1rem;">
+    <h2 style="color: #667eea; margin-bottom: 0.5rem;">
+        {emoji} {brand} {model}
+    </h2>
+    <h3 style="color: #28a745; margin-bottom: 1rem;">
+        ✨ Match: {match}%
+    </h3>
+    <p style="color: #6c757d; font-weight: 500; margin-bottom: 1rem;">
+        {type} • {year}
+    </p>
+    <p style="margin-bottom: 1.5rem;">
+        {description}
+    </p>
+</div>
+""",
+    # Tarjeta principal sin imagen (create_car_card con show_image=False)
+    "plain": """
+<div style="
+    background: white;
+    padding: 2rem;
+    border-radius: 15px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    text-align: center;
+    margin: 1rem 0;
+">
+    <h2 style="color: #667eea;">
+        {emoji} {brand} {model}
+    </h2>
+    <h3 style="color: #28a745;">Match: {match}%</h3>
+    <p><strong>{type}</strong></p>
+    <p>{description}</p>
+</div>
+""",
+    # Alternativas en la página de resultados
+    "alternative": """
+<div class="alternative-card">
+    <h4>{emoji} {brand} {model}</h4>
+    <p><strong>Match: {match}%</strong></p>
+    <p>{type}</p>
+    <p style="font-size: 0.9em;">{short_description}...</p>
+</div>
+""",
+}
+
+# Plantillas separadas en (antes, después) del porcentaje de match
+_TEMPLATE_PARTS: Dict[str, Tuple[str, str]] = {
+    kind: tuple(template.split(MATCH_FIELD)) for kind, template in CARD_TEMPLATES.items()
+}
+
+APP_CSS = """
+.main-header {
+    text-align: center;
+    padding: 2rem 0;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    border-radius: 10px;
+    margin-bottom: 2rem;
+    color: white;
+}
+.question-card {
+    background: #f8f9fa;
+    padding: 1.5rem;
+    border-radius: 10px;
+    border-left: 4px solid #667eea;
+    margin: 1rem 0;
+}
+.result-card {
+    background: #fff;
+    padding: 2rem;
+    border-radius: 15px;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    text-align: center;
+}
+.alternative-card {
+    background: #f8f9fa;
+    padding: 1rem;
+    border-radius: 10px;
+    text-align: center;
+    border: 1px solid #dee2e6;
+    margin: 0.5rem 0;
+}
+.share-button {
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 0.5rem 1rem;
+    border: none;
+    border-radius: 5px;
+    margin: 0.25rem;
+    text-decoration: none;
+    display: inline-block;
+}
+"""
+
+
+def compact_css(css: str) -> str:
+    """
+    Quita espacios y saltos de línea que no cambian el significado del CSS
+    
+    Args:
+        css (str): Hoja de estilos
+    
+    Returns:
+        str: Hoja de estilos compacta
+    """
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+# Bloque de estilos que la app emite al inicio de cada rerun
+APP_STYLE = f"<style>{compact_css(APP_CSS)}</style>"
+
+
+def match_bucket(match_percentage: float) -> str:
+    """Porcentaje de match tal como se muestra (un decimal)"""
+    return f"{match_percentage:.1f}"
+
+
+def _card_fields(car: Mapping[str, Any]) -> Dict[str, Any]:
+    """Valores de un auto que usan las plantillas, con los mismos valores por defecto de la interfaz"""
+    description = car.get('description', 'Sin descripción disponible.')
+    return {
+        "emoji": car.get('emoji', '🚗'),
+        "brand": car.get('brand', 'Unknown'),
+        "model": car.get('model', 'Unknown'),
+        "type": car.get('type', 'Vehículo'),
+        "year": car.get('year', 'N/A'),
+        "description": description,
+        "short_description": description[:100],
+    }
+
+
+def render_card(kind: str, car: Mapping[str, Any], match_percentage: float) -> str:
+    """
+    Arma una tarjeta sin caché
+    
+    Args:
+        kind (str): Tipo de tarjeta (clave de ``CARD_TEMPLATES``)
+        car (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
+        match_percentage (float): Porcentaje de coincidencia
+    
+    Returns:
+        str: HTML de la tarjeta
+    """
+    head, tail = _TEMPLATE_PARTS[kind]
+    fields = _card_fields(car)
+    return head.format(**fields) + match_bucket(match_percentage) + tail.format(**fields)
+
+
+class CardFragments:
+    """
+    Caché de tarjetas HTML para una versión del catálogo
+    
+    Las partes fijas de cada auto se arman una vez (antes y después del
+    porcentaje de match) y las tarjetas completas se guardan en una LRU por
+    ``(tipo, car_id, bucket)``. Los autos se identifican por ``id``: con IDs
+    repetidos en el catálogo se usan los datos del primero que se muestre.
+    """
+    
+    def __init__(self, matcher: Any = None, version: Optional[int] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Inicializa la caché vacía
+        
+        Args:
+            matcher (Any): Matcher al que corresponden las tarjetas
+            version (Optional[int]): Versión del catálogo (``AutoMatcher.catalog_version``)
+            max_entries (int): Tarjetas completas que se conservan
+        """
+        self.matcher = matcher
+        self.version = version
+        self.max_entries = max_entries
+        
+        self._static: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._cards: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def _static_parts(self, kind: str, car_id: str, car: Mapping[str, Any]) -> Tuple[str, str]:
+        """HTML fijo de un auto antes y después del porcentaje de match"""
+        parts = self._static.get((kind, car_id))
+        
+        if parts is None:
+            head, tail = _TEMPLATE_PARTS[kind]
+            fields = _card_fields(car)
+            parts = (head.format(**fields), tail.format(**fields))
+            self._static[(kind, car_id)] = parts
+        
+        return parts
+    
+    def render(self, kind: str, car: Mapping[str, Any], match_percentage: float) -> str:
+        """
+        Obtiene una tarjeta de la caché o la arma a partir de sus partes fijas
+        
+        Args:
+            kind (str): Tipo de tarjeta (clave de ``CARD_TEMPLATES``)
+            car (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
+            match_percentage (float): Porcentaje de coincidencia
+        
+        Returns:
+            str: HTML de la tarjeta, idéntico al de ``render_card``
+        """
+        car_id = car.get('id')
+        if car_id is None:
+            return render_card(kind, car, match_percentage)
+        
+        bucket = match_bucket(match_percentage)
+        key = (kind, car_id, bucket)
+        
+        with self._lock:
+            html = self._cards.get(key)
+            
+            if html is not None:
+                self._cards.move_to_end(key)
+                self.hits += 1
+                return html
+            
+            head, tail = self._static_parts(kind, car_id, car)
+            html = head + bucket + tail
+            
+            self._cards[key] = html
+            if len(self._cards) > self.max_entries:
+                self._cards.popitem(last=False)
+            self.misses += 1
+        
+        return html
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Estadísticas de uso de la caché
+        
+        Returns:
+            Dict[str, int]: Aciertos, fallos, tarjetas y autos con partes fijas
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "cards": len(self._cards),
+                "static_parts": len(self._static),
+            }
+
+
+_current: Optional[CardFragments] = None
+_current_lock = threading.Lock()
+
+
+def card_fragments(matcher: Any) -> CardFragments:
+    """
+    Obtiene la caché de tarjetas de la versión vigente del catálogo
+    
+    La caché se identifica por el matcher y su ``catalog_version``: si cambian
+    los autos (actualización en memoria o recarga de archivos, que crea otro
+    matcher) se descarta y se empieza una nueva. Publicar un KD-tree o una
+    tabla de similitud crea otro snapshot pero no cambia la versión, así que
+    la caché se conserva.
+    
+    Args:
+        matcher (Any): Matcher vigente (``AutoMatcher``)
+    
+    Returns:
+        CardFragments: Caché compartida por todas las sesiones del proceso
+    """
+    global _current
+    
+    version = matcher.catalog_version
+    
+    current = _current
+    if current is not None and current.matcher is matcher and current.version == version:
+        return current
+    
+    with _current_lock:
+        if _current is None or _current.matcher is not matcher or _current.version != version:
+            _current = CardFragments(matcher, version)
+        return _current
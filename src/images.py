@@ -0,0 +1,438 @@
+"""
+Pipeline de imágenes de autos: variantes redimensionadas con caché en disco y en memoria
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Variantes usadas por la interfaz: (ancho, alto) máximos
+VARIANTS: Dict[str, Tuple[int, int]] = {
+    "card": (350, 262),       # Tarjeta principal (display_car_image con width=350)
+    "thumbnail": (160, 120),  # Miniaturas de alternativas
+    "share": (1200, 630),     # Vista previa al compartir en redes
+}
+
+# Formato de salida apto para web y su calidad
+OUTPUT_FORMAT = "WEBP"
+OUTPUT_EXTENSION = "webp"
+OUTPUT_QUALITY = 85
+
+# Presupuesto por defecto de la caché en memoria
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_IMAGES_DIR = PROJECT_ROOT / "data" / "images"
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "images"
+
+# Manifiesto de variantes precompiladas dentro de la carpeta de caché
+MANIFEST_NAME = "manifest.json"
+
+VariantSpec = Union[str, Tuple[int, int]]
+
+
+class ManifestEntry(NamedTuple):
+    """Variante precompilada y versión del original con la que se generó"""
+    file: str
+    source_sha256: Optional[str]
+    source_version: Optional[Tuple[int, int]]  # (mtime en ns, tamaño)
+
+
+def resolve_variant_size(variant: VariantSpec) -> Tuple[int, int]:
+    """
+    Obtiene el tamaño de una variante por nombre o tamaño explícito
+    
+    Args:
+        variant (VariantSpec): Nombre en ``VARIANTS`` o tupla (ancho, alto)
+    
+    Returns:
+        Tuple[int, int]: Tamaño máximo (ancho, alto)
+    """
+    if isinstance(variant, str):
+        if variant not in VARIANTS:
+            raise ValueError(f"Variante de imagen desconocida: {variant}")
+        return VARIANTS[variant]
+    
+    width, height = variant
+    return int(width), int(height)
+
+
+def variant_key(source_digest: str, size: Tuple[int, int]) -> str:
+    """
+    Clave de contenido de una variante
+    
+    Depende solo del contenido de la imagen original y de los parámetros de
+    conversión, así que un cambio en cualquiera de ellos genera otra entrada.
+    
+    Args:
+        source_digest (str): SHA-256 del archivo original
+        size (Tuple[int, int]): Tamaño máximo de la variante
+    
+    Returns:
+        str: Clave hexadecimal
+    """
+    spec = f"{source_digest}:{size[0]}x{size[1]}:{OUTPUT_FORMAT}:{OUTPUT_QUALITY}"
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+def render_variants(source_path: Union[str, Path], sizes: List[Tuple[int, int]]) -> List[bytes]:
+    """
+    Decodifica una imagen una sola vez y genera varias variantes en el formato de salida
+    
+    Args:
+        source_path (Union[str, Path]): Imagen original
+        sizes (List[Tuple[int, int]]): Tamaños máximos manteniendo el aspecto
+    
+    Returns:
+        List[bytes]: Imágenes codificadas, en el mismo orden que ``sizes``
+    """
+    # PIL se carga solo al generar: servir variantes desde la caché no lo necesita
+    from PIL import Image
+    
+    largest = (max(size[0] for size in sizes), max(size[1] for size in sizes))
+    
+    with Image.open(source_path) as image:
+        # Decodificación reducida para JPEG grandes; LANCZOS hace el ajuste fino
+        image.draft("RGB", (largest[0] * 2, largest[1] * 2))
+        
+        # Convertir a RGB si es necesario (para formatos como AVIF/WebP)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        else:
+            image.load()
+        
+        rendered = []
+        for size in sizes:
+            variant = image.copy()
+            variant.thumbnail(size, Image.Resampling.LANCZOS)
+            
+            buffer = io.BytesIO()
+            variant.save(buffer, OUTPUT_FORMAT, quality=OUTPUT_QUALITY, method=4)
+            rendered.append(buffer.getvalue())
+        
+        return rendered
+
+
+def render_variant(source_path: Union[str, Path], size: Tuple[int, int]) -> bytes:
+    """
+    Decodifica, redimensiona y codifica una imagen en el formato de salida
+    
+    Args:
+        source_path (Union[str, Path]): Imagen original
+        size (Tuple[int, int]): Tamaño máximo manteniendo el aspecto
+    
+    Returns:
+        bytes: Imagen codificada
+    """
+    return render_variants(source_path, [size])[0]
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Escribe un archivo de forma atómica
+    
+    Otro hilo o proceso puede estar generando la misma variante a la vez; el
+    archivo final nunca queda a medio escribir.
+    
+    Args:
+        path (Path): Ruta final
+        data (bytes): Contenido
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def load_manifest(cache_dir: Union[str, Path]) -> Dict[Tuple[str, Tuple[int, int]], ManifestEntry]:
+    """
+    Carga el manifiesto generado por ``build_assets.py``
+    
+    Args:
+        cache_dir (Union[str, Path]): Carpeta de variantes generadas
+    
+    Returns:
+        Dict[Tuple[str, Tuple[int, int]], ManifestEntry]: Variante de cada
+        (imagen, tamaño); vacío si no hay manifiesto
+    """
+    manifest_path = Path(cache_dir) / MANIFEST_NAME
+    
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    
+    entries = {}
+    for image_filename, image in manifest.get("images", {}).items():
+        source_version = None
+        if "source_mtime_ns" in image and "source_bytes" in image:
+            source_version = (image["source_mtime_ns"], image["source_bytes"])
+        
+        for variant in image.get("variants", {}).values():
+            size = (variant["max_width"], variant["max_height"])
+            entries[(image_filename, size)] = ManifestEntry(
+                variant["file"], image.get("source_sha256"), source_version
+            )
+    
+    return entries
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    Calcula el SHA-256 de un archivo
+    
+    Args:
+        path (Union[str, Path]): Ruta del archivo
+    
+    Returns:
+        str: Digest hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ImagePipeline:
+    """
+    Sirve variantes de imágenes desde memoria, disco o generándolas una sola vez
+    
+    Niveles de caché:
+    1. LRU en memoria con presupuesto en bytes
+    2. Directorio en disco direccionado por contenido
+    3. Generación a partir del original (solo la primera vez)
+    
+    Si existe un manifiesto de ``build_assets.py``, las variantes que incluye se
+    sirven sin abrir los originales: solo se comprueba con ``stat`` que no hayan
+    cambiado desde que se compilaron (y, si cambió su mtime, su SHA-256). Un
+    original reemplazado se sirve como si no estuviera en el manifiesto. El
+    manifiesto se vuelve a leer cuando cambia su mtime.
+    """
+    
+    def __init__(self,
+                 images_dir: Union[str, Path] = DEFAULT_IMAGES_DIR,
+                 cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        Inicializa el pipeline
+        
+        Args:
+            images_dir (Union[str, Path]): Carpeta de imágenes originales
+            cache_dir (Union[str, Path]): Carpeta de variantes generadas
+            memory_budget (int): Bytes máximos en la caché en memoria
+        """
+        self.images_dir = Path(images_dir)
+        self.cache_dir = Path(cache_dir)
+        self.memory_budget = memory_budget
+        
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._manifest_version = self._manifest_file_version()
+        self._manifest = load_manifest(self.cache_dir)
+        self._lock = threading.Lock()
+        
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "renders": 0, "evictions": 0}
+        self._seconds = {"memory_hits": 0.0, "disk_hits": 0.0, "renders": 0.0}
+    
+    def _source_digest(self, source_path: Path) -> str:
+        """
+        Digest del original, recalculado solo si cambió su mtime o tamaño
+        
+        Args:
+            source_path (Path): Imagen original
+        
+        Returns:
+            str: SHA-256 del archivo
+        """
+        stat = source_path.stat()
+        key = (str(source_path), stat.st_mtime_ns, stat.st_size)
+        
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = file_digest(source_path)
+            self._digests[key] = digest
+        return digest
+    
+    def _manifest_file_version(self) -> Optional[Tuple[int, int]]:
+        """Versión del manifiesto como (mtime en ns, tamaño), o None si no existe"""
+        try:
+            stat = (self.cache_dir / MANIFEST_NAME).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _manifest_path(self, image_filename: str, size: Tuple[int, int],
+                       source_path: Path) -> Optional[Path]:
+        """
+        Variante precompilada de una imagen, si sigue correspondiendo al original
+        
+        Recarga el manifiesto si ``build_assets.py`` lo volvió a escribir. Si el
+        original ya no existe se sirve la variante precompilada.
+        
+        Args:
+            image_filename (str): Nombre del archivo en la carpeta de imágenes
+            size (Tuple[int, int]): Tamaño máximo de la variante
+            source_path (Path): Imagen original
+        
+        Returns:
+            Optional[Path]: Archivo de la variante, o None si no está en el
+            manifiesto o el original cambió desde que se compiló
+        """
+        version = self._manifest_file_version()
+        if version != self._manifest_version:
+            manifest = load_manifest(self.cache_dir)
+            with self._lock:
+                self._manifest = manifest
+                self._manifest_version = version
+        
+        entry = self._manifest.get((image_filename, size))
+        if entry is None:
+            return None
+        
+        try:
+            stat = source_path.stat()
+        except OSError:
+            return self.cache_dir / entry.file
+        
+        if entry.source_version == (stat.st_mtime_ns, stat.st_size):
+            return self.cache_dir / entry.file
+        
+        # El mtime puede cambiar al copiar los archivos: se confirma por contenido
+        if entry.source_sha256 is not None and self._source_digest(source_path) == entry.source_sha256:
+            return self.cache_dir / entry.file
+        
+        return None
+    
+    def _remember(self, key: str, data: bytes) -> None:
+        """
+        Guarda una variante en la LRU en memoria respetando el presupuesto
+        
+        Args:
+            key (str): Clave de la variante
+            data (bytes): Imagen codificada
+        """
+        if len(data) > self.memory_budget:
+            return
+        
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            
+            while self._memory_bytes > self.memory_budget:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self._counters["evictions"] += 1
+    
+    def _record(self, tier: str, start: float) -> None:
+        """Acumula contador y tiempo de un nivel de caché"""
+        with self._lock:
+            self._counters[tier] += 1
+            self._seconds[tier] += time.perf_counter() - start
+    
+    def get_variant(self, image_filename: str, variant: VariantSpec = "card") -> bytes:
+        """
+        Obtiene una variante de una imagen de auto
+        
+        Args:
+            image_filename (str): Nombre del archivo en la carpeta de imágenes
+            variant (VariantSpec): Nombre de variante o tamaño (ancho, alto)
+        
+        Returns:
+            bytes: Imagen codificada en el formato de salida
+        
+        Raises:
+            FileNotFoundError: Si la imagen original no existe
+        """
+        start = time.perf_counter()
+        size = resolve_variant_size(variant)
+        source_path = self.images_dir / image_filename
+        
+        cache_path = self._manifest_path(image_filename, size, source_path)
+        
+        if cache_path is None or not cache_path.exists():
+            # Sin variante precompilada: la clave sale del contenido del original
+            if not source_path.exists():
+                raise FileNotFoundError(f"Imagen no encontrada: {image_filename}")
+            
+            key = variant_key(self._source_digest(source_path), size)
+            cache_path = self.cache_dir / f"{key}.{OUTPUT_EXTENSION}"
+        
+        key = cache_path.name
+        
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        
+        if data is not None:
+            self._record("memory_hits", start)
+            return data
+        
+        if cache_path.exists():
+            data = cache_path.read_bytes()
+            tier = "disk_hits"
+        else:
+            data = render_variant(source_path, size)
+            write_atomic(cache_path, data)
+            tier = "renders"
+        
+        self._remember(key, data)
+        self._record(tier, start)
+        return data
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Estadísticas de uso para medir tiempos en frío y en caliente
+        
+        Returns:
+            Dict[str, float]: Contadores, bytes en memoria y tiempo medio por nivel (ms)
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counters)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["memory_entries"] = len(self._memory)
+            
+            for tier, seconds in self._seconds.items():
+                count = self._counters[tier]
+                stats[f"{tier}_avg_ms"] = seconds * 1000 / count if count else 0.0
+        
+        return stats
+    
+    def clear_memory(self) -> None:
+        """Vacía la caché en memoria (la caché en disco se conserva)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+
+_default_pipeline: Optional[ImagePipeline] = None
+_default_lock = threading.Lock()
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """
+    Obtiene el pipeline compartido por todo el proceso
+    
+    Returns:
+        ImagePipeline: Instancia con las carpetas por defecto del proyecto
+    """
+    global _default_pipeline
+    
+    if _default_pipeline is None:
+        with _default_lock:
+            if _default_pipeline is None:
+                _default_pipeline = ImagePipeline()
+    
+    return _default_pipeline
@@ -0,0 +1,194 @@
+"""
+Ingesta por streaming de catálogos JSON Lines para Auto Personality App
+
+Los feeds de concesionarios traen millones de autos, uno por línea. Cada
+línea se valida al leerla y se agrega directamente a las columnas del
+catálogo (registros ``CarRecord`` y matriz de vectores), sin cargar el
+archivo completo ni mantener los diccionarios parseados. Los registros
+rechazados se cuentan por motivo y se guarda una muestra con su línea.
+
+Uso:
+    python src/ingest.py feed.jsonl [--compile data/feed.catalog]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+import numpy as np
+from collections import Counter
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from catalog import VECTOR_SIZE, compile_catalog, validate_car
+from records import CarRecord, CarTable
+
+# Rechazos guardados con detalle; el resto solo se cuenta
+MAX_REJECTION_SAMPLES = 100
+
+# Filas iniciales de la matriz de vectores (crece al doble al llenarse)
+INITIAL_CAPACITY = 1024
+
+
+class IngestReport:
+    """
+    Resultado de una ingesta: autos aceptados y rechazados
+    
+    La memoria del reporte no depende del tamaño del feed: solo se guardan
+    los primeros ``max_samples`` rechazos con detalle.
+    """
+    
+    def __init__(self, max_samples: int = MAX_REJECTION_SAMPLES):
+        """
+        Inicializa el reporte vacío
+        
+        Args:
+            max_samples (int): Rechazos a guardar con número de línea y motivo
+        """
+        self.max_samples = max_samples
+        self.accepted = 0
+        self.rejected = 0
+        self.reasons: Counter = Counter()
+        self.samples: List[Tuple[int, Optional[str], str]] = []
+    
+    def reject(self, line_number: int, car_id: Optional[str], reason: str) -> None:
+        """
+        Registra un rechazo
+        
+        Args:
+            line_number (int): Línea del feed (desde 1)
+            car_id (Optional[str]): ID del auto, si se pudo leer
+            reason (str): Motivo del rechazo
+        """
+        self.rejected += 1
+        self.reasons[reason] += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line_number, car_id, reason))
+    
+    def summary(self) -> str:
+        """
+        Resumen legible del reporte
+        
+        Returns:
+            str: Totales, motivos más frecuentes y muestra de líneas rechazadas
+        """
+        lines = [f"Aceptados: {self.accepted} | Rechazados: {self.rejected}"]
+        
+        for reason, count in self.reasons.most_common():
+            lines.append(f"  {count:>8}  {reason}")
+        
+        for line_number, car_id, reason in self.samples:
+            lines.append(f"  línea {line_number} ({car_id or '?'}): {reason}")
+        
+        if self.rejected > len(self.samples):
+            lines.append(f"  ... y {self.rejected - len(self.samples)} rechazos más")
+        
+        return "\n".join(lines)
+
+
+def _open_feed(path: Union[str, Path]) -> IO[str]:
+    """Abre un feed de texto, descomprimiendo si termina en ``.gz``"""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def iter_valid_cars(lines: Iterator[str], report: IngestReport) -> Iterator[dict]:
+    """
+    Parsea y valida autos línea por línea
+    
+    Las líneas vacías se ignoran; las que no son JSON válido o no pasan
+    ``validate_car`` se registran en el reporte.
+    
+    Args:
+        lines (Iterator[str]): Líneas del feed
+        report (IngestReport): Reporte donde registrar aceptados y rechazados
+    
+    Returns:
+        Iterator[dict]: Autos válidos, en orden
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        
+        try:
+            car = json.loads(line)
+        except ValueError as e:
+            report.reject(line_number, None, f"JSON inválido ({e.msg})")
+            continue
+        
+        reason = validate_car(car)
+        if reason is not None:
+            car_id = car.get('id') if isinstance(car, dict) else None
+            report.reject(line_number, None if car_id is None else str(car_id), reason)
+            continue
+        
+        report.accepted += 1
+        yield car
+
+
+def ingest_json_lines(path: Union[str, Path],
+                      max_samples: int = MAX_REJECTION_SAMPLES) -> Tuple[CarTable, IngestReport]:
+    """
+    Carga un catálogo JSON Lines directamente en columnas
+    
+    Cada auto válido pasa a ser un ``CarRecord`` y su vector se copia a una
+    matriz float64 que crece por duplicación; el diccionario parseado se
+    descarta enseguida. La memoria máxima es la del catálogo final más una
+    línea y el crecimiento de la matriz, no el doble del archivo.
+    
+    Args:
+        path (Union[str, Path]): Archivo ``.jsonl`` (o ``.jsonl.gz``)
+        max_samples (int): Rechazos a guardar con detalle
+    
+    Returns:
+        Tuple[CarTable, IngestReport]: Autos listos para ``AutoMatcher`` y reporte
+    """
+    report = IngestReport(max_samples)
+    records: List[CarRecord] = []
+    vectors = np.empty((INITIAL_CAPACITY, VECTOR_SIZE), dtype=np.float64)
+    
+    with _open_feed(path) as feed:
+        for car in iter_valid_cars(feed, report):
+            index = len(records)
+            
+            if index == len(vectors):
+                grown = np.empty((len(vectors) * 2, VECTOR_SIZE), dtype=np.float64)
+                grown[:index] = vectors
+                vectors = grown
+            
+            vectors[index] = car['vector']
+            records.append(CarRecord(car, vectors, index))
+    
+    # Recortar la capacidad sobrante y apuntar todos los registros a la matriz final
+    return CarTable.from_records(records, vectors[:len(records)].copy()), report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Valida e ingiere un feed JSON Lines de autos")
+    parser.add_argument("feed", help="Archivo .jsonl o .jsonl.gz, un auto por línea")
+    parser.add_argument("--compile", default=None, help="Compilar los autos válidos a este .catalog")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    
+    if args.compile:
+        # Directo al formato compilado, sin construir los registros en memoria
+        report = IngestReport()
+        with _open_feed(args.feed) as feed:
+            compile_catalog(iter_valid_cars(feed, report), args.compile)
+        destination = f"📄 Catálogo: {args.compile}"
+    else:
+        table, report = ingest_json_lines(args.feed)
+        destination = f"🚗 {len(table)} autos en memoria"
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ Ingesta en {elapsed:.2f}s — {destination}")
+    print(report.summary(), file=sys.stderr if report.rejected else sys.stdout)
+    
+    return 1 if report.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
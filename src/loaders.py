@@ -0,0 +1,108 @@
+"""
+Carga de datos de Auto Personality App, sin dependencias de interfaz
+
+Lee los JSON del proyecto y las imágenes de los autos para la app de
+Streamlit, el servicio HTTP y los procesos batch. Los errores se reportan con
+excepciones (``DataLoadError`` y sus subclases) y se registran con
+``logging``; mostrarlos al usuario es tarea de la capa de interfaz (ver
+``utils.py``).
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from images import PROJECT_ROOT, VariantSpec, get_image_pipeline
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class DataLoadError(Exception):
+    """Error al cargar un archivo de datos o una imagen"""
+    
+    def __init__(self, message: str, path: Optional[Union[str, Path]] = None):
+        super().__init__(message)
+        self.message = message
+        self.path = str(path) if path is not None else None
+
+
+class DataNotFoundError(DataLoadError, FileNotFoundError):
+    """El archivo solicitado no existe"""
+
+
+class DataFormatError(DataLoadError, ValueError):
+    """El archivo existe pero su contenido no es válido"""
+
+
+def resolve_data_path(file_path: str) -> Path:
+    """
+    Resuelve una ruta relativa a la raíz del proyecto
+    
+    Args:
+        file_path (str): Ruta relativa (por ejemplo ``data/cars.json``)
+    
+    Returns:
+        Path: Ruta absoluta al archivo
+    """
+    return PROJECT_ROOT / file_path
+
+
+@timed("load_json_data")
+def load_json_file(file_path: str) -> Dict[str, Any]:
+    """
+    Carga datos desde un archivo JSON
+    
+    Args:
+        file_path (str): Ruta al archivo JSON, relativa a la raíz del proyecto
+    
+    Returns:
+        Dict[str, Any]: Datos cargados del archivo
+    
+    Raises:
+        DataNotFoundError: Si el archivo no existe
+        DataFormatError: Si el contenido no es JSON válido
+        DataLoadError: Si el archivo no se pudo leer
+    """
+    full_path = resolve_data_path(file_path)
+    
+    try:
+        with open(full_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        raise DataNotFoundError(f"Archivo no encontrado: {full_path}", full_path) from None
+    except json.JSONDecodeError as e:
+        raise DataFormatError(f"Error al parsear JSON en {file_path}: {e}", full_path) from e
+    except (OSError, UnicodeDecodeError) as e:
+        raise DataLoadError(f"Error inesperado al cargar {file_path}: {e}", full_path) from e
+    
+    logger.debug("JSON cargado: %s", full_path)
+    return data
+
+
+@timed("load_car_image")
+def load_car_image_bytes(image_filename: str, variant: VariantSpec = "card") -> bytes:
+    """
+    Obtiene una variante redimensionada de la imagen de un auto
+    
+    Las variantes se generan una sola vez y se sirven desde la caché del
+    pipeline de imágenes (memoria y disco).
+    
+    Args:
+        image_filename (str): Nombre del archivo de imagen
+        variant (VariantSpec): Nombre de variante ("card", "thumbnail", "share") o (ancho, alto)
+    
+    Returns:
+        bytes: Imagen codificada
+    
+    Raises:
+        DataNotFoundError: Si la imagen original no existe
+        DataLoadError: Si la imagen no se pudo decodificar o generar
+    """
+    try:
+        return get_image_pipeline().get_variant(image_filename, variant)
+    except FileNotFoundError:
+        raise DataNotFoundError(f"Imagen no encontrada: {image_filename}", image_filename) from None
+    except Exception as e:
+        raise DataLoadError(f"Error al cargar imagen {image_filename}: {e}", image_filename) from e
@@ -2,49 +2,905 @@
 Motor de recomendación para Auto Personality App
 """
 
+import threading
 import numpy as np
-from typing import List, Dict, Any, Optional
+from collections.abc import Mapping
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Tuple, Union
+
+from catalog import CompiledCatalog, validate_car
+from metrics import timed, timer
+from records import CarRecord, CarTable, ColumnarCars, Recommendation, SimilarCar
+from similarity import SimilarityTable, catalog_fingerprint
+from spatial import KDTree, squared_distances
+
+# Distancia máxima teórica entre vectores en [1, 5]^5: sqrt(5 * 4^2) = ~8.94
+MAX_DISTANCE = np.sqrt(5 * (4 ** 2))
+
+# Margen relativo para detectar empates de score al usar el índice espacial
+SCORE_TIE_TOLERANCE = 1e-9
+
+# Atributos con índice invertido; tipo y marca no distinguen mayúsculas
+INDEXED_ATTRIBUTES = ('type', 'price_range', 'brand')
+CASE_INSENSITIVE_ATTRIBUTES = ('type', 'brand')
+
+# Año usado para autos sin año; nunca cumple un filtro por año
+MISSING_YEAR = -1
+
+# Máximo de distancias (usuarios x autos) calculadas a la vez en modo batch; los
+# bloques de ~0,5 MB quedan en caché y rinden más que matrices grandes
+BATCH_MAX_DISTANCES = 64_000
+
+
+def _attribute_key(field: str, value: Any) -> str:
+    """
+    Normaliza el valor de un atributo para los índices invertidos
+    
+    Args:
+        field (str): Nombre del atributo
+        value (Any): Valor del atributo en el auto o en el filtro
+    
+    Returns:
+        str: Clave del índice
+    """
+    key = '' if value is None else str(value)
+    return key.lower() if field in CASE_INSENSITIVE_ATTRIBUTES else key
+
+
+def _group_indices(keys: List[str], codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Agrupa los índices de autos por clave de atributo
+    
+    Args:
+        keys (List[str]): Claves por código; puede haber claves repetidas
+        codes (np.ndarray): Código de la clave de cada auto (N,)
+    
+    Returns:
+        Dict[str, np.ndarray]: Índices ascendentes de los autos de cada clave
+    """
+    # Unificar códigos de claves repetidas (por ejemplo, "SUV" y "suv")
+    key_codes: Dict[str, int] = {}
+    remap = np.array([key_codes.setdefault(key, len(key_codes)) for key in keys], dtype=np.intp)
+    merged = remap[codes]
+    
+    order = np.argsort(merged, kind='stable')
+    groups = np.split(order, np.flatnonzero(np.diff(merged[order])) + 1)
+    
+    unique_keys = list(key_codes)
+    return {unique_keys[merged[group[0]]]: group.astype(np.intp) for group in groups if len(group)}
+
+
+def _euclidean_distances(car_vectors: np.ndarray, user_vectors: np.ndarray) -> np.ndarray:
+    """
+    Calcula la distancia euclidiana de uno o varios vectores de usuario a todos los autos
+    
+    Las diferencias se elevan en float64 y se suman dimensión a dimensión en el
+    mismo orden que ``calculate_match_score``. Con los vectores float64 del
+    catálogo (``reference_vectors``) los resultados son idénticos bit a bit a
+    los del cálculo por auto; con la matriz float32 solo sirven como cota.
+    
+    Args:
+        car_vectors (np.ndarray): Matriz (N, D) de vectores de autos
+        user_vectors (np.ndarray): Vector (D,) o matriz (M, D) de usuarios en float64
+    
+    Returns:
+        np.ndarray: Distancias (N,) o (M, N) en float64
+    """
+    distances = squared_distances(car_vectors, user_vectors)
+    return np.sqrt(distances, out=distances)
+
+
+def _distances_to_percentages(distances: np.ndarray) -> np.ndarray:
+    """
+    Convierte distancias en porcentajes de similitud (0-100)
+    
+    Args:
+        distances (np.ndarray): Distancias euclidianas
+    
+    Returns:
+        np.ndarray: Similitud como porcentaje, recortada a [0, 100]
+    """
+    # Mismas operaciones que (1 - d / MAX_DISTANCE) * 100, sobre un solo arreglo
+    similarity = distances / MAX_DISTANCE
+    np.subtract(1, similarity, out=similarity)
+    similarity *= 100
+    return np.clip(similarity, 0.0, 100.0, out=similarity)
+
+
+def _top_n_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Obtiene los índices de los N scores más altos, ordenados de mayor a menor
+    
+    Usa ``np.argpartition`` para no ordenar todo el catálogo. Los empates se
+    resuelven por orden en el catálogo, igual que un ``sort`` estable.
+    
+    Args:
+        scores (np.ndarray): Scores (N,)
+        top_n (int): Número de índices a retornar
+    
+    Returns:
+        np.ndarray: Índices de los mejores scores
+    """
+    n = len(scores)
+    
+    if top_n <= 0 or top_n >= n:
+        # Mismo comportamiento que el slicing de una lista ordenada
+        return np.argsort(-scores, kind='stable')[:top_n]
+    
+    partition = np.argpartition(-scores, top_n - 1)[:top_n]
+    threshold = scores[partition].min()
+    
+    # Incluir todos los empates en el umbral para conservar el orden estable
+    candidates = np.flatnonzero(scores >= threshold)
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order][:top_n]
+
+
+def _top_n_indices_rows(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Versión por filas de ``_top_n_indices`` para una matriz de scores
+    
+    Args:
+        scores (np.ndarray): Scores (M, N)
+        top_n (int): Número de índices a retornar por fila
+    
+    Returns:
+        np.ndarray: Índices (M, top_n) ordenados de mayor a menor score
+    """
+    n = scores.shape[1]
+    top_n = max(0, min(top_n, n))
+    
+    if top_n == 0 or top_n == n:
+        return np.argsort(-scores, axis=1, kind='stable')[:, :top_n]
+    
+    partition = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+    partition_scores = np.take_along_axis(scores, partition, axis=1)
+    threshold = partition_scores.min(axis=1, keepdims=True)
+    
+    # Sin empates en el umbral, la partición es el top-N: basta ordenarla por
+    # score descendente y luego por orden de catálogo
+    order = np.lexsort((partition, -partition_scores))
+    top = np.take_along_axis(partition, order, axis=1)
+    
+    # Filas con empates en el umbral: elegir los primeros del catálogo, como un sort estable
+    for row in np.flatnonzero((scores >= threshold).sum(axis=1) > top_n):
+        top[row] = _top_n_indices(scores[row], top_n)
+    
+    return top
+
+
+def top_matches_batch(car_vectors: np.ndarray,
+                      user_matrix: np.ndarray,
+                      top_n: int,
+                      chunk_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula el top-N de autos para cada fila de una matriz de usuarios
+    
+    Es el núcleo de ``AutoMatcher.find_best_matches_batch``; también lo usan los
+    workers de ``sharding.py`` sobre su parte del catálogo.
+    
+    Args:
+        car_vectors (np.ndarray): Matriz (N, 5) float64 de vectores de autos
+        user_matrix (np.ndarray): Matriz (M, 5) de vectores de usuario
+        top_n (int): Número de autos por usuario
+        chunk_size (Optional[int]): Filas por bloque (automático si es None)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Índices (M, top_n) y scores (M, top_n)
+    """
+    user_matrix = np.asarray(user_matrix, dtype=np.float64)
+    num_cars = len(car_vectors)
+    top_n = max(0, min(top_n, num_cars))
+    
+    if chunk_size is None:
+        chunk_size = max(1, BATCH_MAX_DISTANCES // max(num_cars, 1))
+    
+    indices = np.empty((len(user_matrix), top_n), dtype=np.intp)
+    scores = np.empty((len(user_matrix), top_n), dtype=np.float64)
+    
+    for start in range(0, len(user_matrix), chunk_size):
+        chunk = user_matrix[start:start + chunk_size]
+        
+        distances = _euclidean_distances(car_vectors, chunk)
+        chunk_scores = _distances_to_percentages(distances)
+        chunk_indices = _top_n_indices_rows(chunk_scores, top_n)
+        
+        indices[start:start + len(chunk)] = chunk_indices
+        scores[start:start + len(chunk)] = np.take_along_axis(chunk_scores, chunk_indices, axis=1)
+    
+    return indices, scores
+
+
+def _merge_neighbors(neighbors: np.ndarray, scores: np.ndarray,
+                     candidates: np.ndarray, candidate_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Combina filas de una tabla de similitud con nuevos autos candidatos
+    
+    Args:
+        neighbors (np.ndarray): Vecinos actuales (R, K), -1 en posiciones vacías
+        scores (np.ndarray): Scores actuales (R, K)
+        candidates (np.ndarray): Índices candidatos (R, C), -1 si no aplican
+        candidate_scores (np.ndarray): Scores de los candidatos (R, C)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Los K mejores de cada fila, por score
+        descendente y luego por orden de catálogo
+    """
+    top_k = neighbors.shape[1]
+    all_neighbors = np.concatenate([neighbors, candidates], axis=1)
+    all_scores = np.where(all_neighbors >= 0,
+                          np.concatenate([scores, candidate_scores], axis=1), -np.inf)
+    
+    # lexsort usa la última clave como principal: score descendente, luego índice
+    order = np.lexsort((all_neighbors, -all_scores))[:, :top_k]
+    merged = np.take_along_axis(all_neighbors, order, axis=1)
+    merged_scores = np.take_along_axis(all_scores, order, axis=1)
+    
+    empty = np.isneginf(merged_scores)
+    merged[empty] = -1
+    merged_scores[empty] = 0.0
+    return merged, merged_scores
+
+
+def _remap_groups(groups: Dict[str, np.ndarray], remap: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Traslada un índice invertido a las posiciones de un catálogo con autos quitados
+    
+    Args:
+        groups (Dict[str, np.ndarray]): Índices ascendentes por clave
+        remap (np.ndarray): Nueva posición de cada auto (-1 si se quitó)
+    
+    Returns:
+        Dict[str, np.ndarray]: Índice invertido sin los autos quitados
+    """
+    remapped = {}
+    
+    for key, indices in groups.items():
+        moved = remap[indices]
+        moved = moved[moved >= 0]
+        if len(moved):
+            remapped[key] = moved
+    
+    return remapped
+
+
+def _first_indices(car_ids: List[str]) -> Dict[str, int]:
+    """
+    Construye el índice por ID de un catálogo
+    
+    Args:
+        car_ids (List[str]): IDs en orden de catálogo
+    
+    Returns:
+        Dict[str, int]: Posición de cada ID; la primera aparición gana, igual
+        que en una búsqueda lineal
+    """
+    id_index: Dict[str, int] = {}
+    
+    for index, car_id in enumerate(car_ids):
+        id_index.setdefault(car_id, index)
+    
+    return id_index
+
+
+def _car_year(car: Mapping[str, Any]) -> int:
+    """Año de un auto para el filtro por año (``MISSING_YEAR`` si no es entero)"""
+    year = car.get('year')
+    return year if isinstance(year, int) else MISSING_YEAR
+
+
+def _validate_new_cars(cars: List[Mapping[str, Any]]) -> None:
+    """
+    Valida los autos de una actualización
+    
+    Args:
+        cars (List[Mapping[str, Any]]): Autos a agregar o reemplazar
+    
+    Raises:
+        ValueError: Con el motivo de cada auto rechazado
+    """
+    problems = []
+    
+    for position, car in enumerate(cars):
+        reason = validate_car(car)
+        if reason is not None:
+            car_id = car.get('id', '?') if isinstance(car, Mapping) else '?'
+            problems.append(f"#{position} ({car_id}): {reason}")
+    
+    if problems:
+        raise ValueError(f"Autos inválidos: {'; '.join(problems)}")
+
+
+def _value_counts(cars: ColumnarCars, field: str) -> Dict[Any, int]:
+    """
+    Cuenta los autos por valor de un campo, como ``car.get(field, 'Unknown')``
+    
+    Se cuenta sobre los valores tal como figuran en cada auto (sin normalizar
+    mayúsculas como los índices invertidos), en orden de primera aparición.
+    Los autos sin el campo cuentan como 'Unknown'; los que lo tienen en None
+    cuentan como None.
+    
+    Args:
+        cars (ColumnarCars): Catálogo del snapshot
+        field (str): Nombre del campo
+    
+    Returns:
+        Dict[Any, int]: Cantidad de autos por valor
+    """
+    values, codes = cars.categories(field)
+    counts = np.bincount(codes, minlength=len(values))
+    first_seen = np.full(len(values), len(codes), dtype=np.intp)
+    np.minimum.at(first_seen, codes, np.arange(len(codes)))
+    
+    # (primera aparición, valor, cantidad); None agrupa ausentes y None explícitos
+    entries = []
+    for code, value in enumerate(values):
+        if counts[code] == 0:
+            continue
+        if value is not None:
+            entries.append((int(first_seen[code]), value, int(counts[code])))
+            continue
+        
+        present, absent = [], []
+        for index in np.flatnonzero(codes == code).tolist():
+            (present if field in cars[index] else absent).append(index)
+        if present:
+            entries.append((present[0], None, len(present)))
+        if absent:
+            entries.append((absent[0], 'Unknown', len(absent)))
+    
+    distribution: Dict[Any, int] = {}
+    for _, value, count in sorted(entries, key=lambda entry: entry[0]):
+        distribution[value] = distribution.get(value, 0) + count
+    return distribution
+
+
+def _mutable_records(cars: ColumnarCars) -> List[CarRecord]:
+    """
+    Copia la lista de registros de un catálogo para el siguiente snapshot
+    
+    Un catálogo compilado se materializa en registros la primera vez que se
+    modifica; los registros siguen leyendo sus campos del archivo mapeado.
+    
+    Args:
+        cars (ColumnarCars): Catálogo del snapshot actual
+    
+    Returns:
+        List[CarRecord]: Registros en orden de catálogo
+    """
+    if isinstance(cars, CarTable):
+        return list(cars.records)
+    return [cars[index] for index in range(len(cars))]
+
+
+def _float32_margin(reference_vectors: np.ndarray, car_vectors: np.ndarray) -> float:
+    """
+    Cota del error de distancia al buscar con los vectores float32 del KD-tree
+    
+    Es la mayor distancia entre un vector float32 y su valor exacto: por la
+    desigualdad triangular, ninguna distancia calculada con ``car_vectors``
+    difiere más que eso de la exacta. Se mide sobre los datos, sin suponer un
+    rango para los vectores.
+    
+    Args:
+        reference_vectors (np.ndarray): Vectores exactos (N, 5) float64
+        car_vectors (np.ndarray): Los mismos vectores (N, 5) en float32
+    
+    Returns:
+        float: Margen a sumar a los radios de búsqueda
+    """
+    if len(reference_vectors) == 0:
+        return 0.0
+    
+    error = car_vectors.astype(np.float64) - reference_vectors
+    return float(np.sqrt(np.einsum('ij,ij->i', error, error).max()))
+
+
+class CatalogSnapshot(NamedTuple):
+    """
+    Estado inmutable del catálogo con el que responde el matcher
+    
+    Cada consulta toma el snapshot vigente una sola vez y trabaja solo con él.
+    Las actualizaciones (``add_cars``, ``remove_cars``, ``update_car``) arman un
+    snapshot nuevo copiando lo que cambia y lo publican con una asignación, así
+    nunca bloquean ni mezclan versiones con las consultas en curso.
+    """
+    version: int
+    cars: ColumnarCars
+    reference_vectors: np.ndarray
+    car_vectors: np.ndarray
+    car_ids: List[str]
+    car_years: np.ndarray
+    id_index: Dict[str, int]
+    attribute_indexes: Dict[str, Dict[str, np.ndarray]]
+    # Cota del error de distancia por usar ``car_vectors`` (ver ``_float32_margin``)
+    distance_margin: float = 0.0
+    spatial_index: Optional[KDTree] = None
+    similarity_table: Optional[SimilarityTable] = None
+
 
 class AutoMatcher:
     """
     Clase para encontrar coincidencias entre personalidad del usuario y autos disponibles
     """
     
-    def __init__(self, cars_data: Dict[str, Any]):
+    @timed("matcher_init")
+    def __init__(self, cars_data: Dict[str, Any], use_spatial_index: bool = False):
         """
         Inicializa el matcher con datos de autos
         
         Args:
             cars_data (Dict[str, Any]): Datos de autos cargados desde JSON
+            use_spatial_index (bool): Si construir un KD-tree para catálogos grandes
+        """
+        cars = cars_data.get('cars', [])
+        
+        # Validar datos de autos; un catálogo por columnas (compilado o leído
+        # por streaming) ya contiene solo autos válidos
+        if not isinstance(cars, ColumnarCars):
+            with timer("matcher_validation"):
+                cars = [car for car in cars if validate_car(car) is None]
+        
+        if not cars:
+            raise ValueError("No se encontraron autos válidos en los datos proporcionados")
+        
+        # El resto de los datos se conserva; 'cars' sale siempre del snapshot vigente
+        self._extra_data = {key: value for key, value in cars_data.items() if key != 'cars'}
+        
+        # Solo las actualizaciones se serializan; las consultas nunca esperan
+        self._write_lock = threading.Lock()
+        self._spatial_leaf_size: Optional[int] = None
+        
+        self._snapshot = self._build_snapshot(cars)
+        
+        if use_spatial_index:
+            self.build_spatial_index()
+    
+    @classmethod
+    def from_compiled_catalog(cls, path: str, use_spatial_index: bool = False) -> "AutoMatcher":
         """
-        self.cars_data = cars_data
-        self.cars = cars_data.get('cars', [])
+        Crea un matcher a partir de un catálogo compilado (ver ``catalog.py``)
         
-        # Validar datos de autos
-        self._validate_car_data()
+        Los vectores se usan directamente desde el archivo mapeado en memoria y
+        los autos se arman como diccionarios solo cuando se accede a ellos.
+        
+        Args:
+            path (str): Archivo generado por ``compile_catalog``
+            use_spatial_index (bool): Si construir un KD-tree para catálogos grandes
+        
+        Returns:
+            AutoMatcher: Matcher sobre el catálogo compilado
+        """
+        return cls({'cars': CompiledCatalog(path)}, use_spatial_index=use_spatial_index)
     
-    def _validate_car_data(self) -> None:
+    def _build_snapshot(self, cars: Union[List[Dict[str, Any]], ColumnarCars]) -> CatalogSnapshot:
         """
-        Valida que los datos de autos tengan el formato correcto
+        Construye la matriz de vectores, los índices y los registros del catálogo
+        
+        Args:
+            cars (Union[List[Dict[str, Any]], ColumnarCars]): Autos ya validados
+        
+        Returns:
+            CatalogSnapshot: Snapshot inicial (versión 0)
         """
-        valid_cars = []
+        attribute_keys: Dict[str, Tuple[List[str], np.ndarray]] = {}
         
-        for car in self.cars:
-            # Verificar campos requeridos
-            required_fields = ['id', 'brand', 'model', 'vector']
+        if isinstance(cars, ColumnarCars):
+            # Columnas leídas del catálogo sin armar los diccionarios de los autos
+            reference_vectors = np.asarray(cars.vectors, dtype=np.float64)
+            car_ids = cars.column('id')
+            car_years = cars.years(MISSING_YEAR)
+            
+            for field in INDEXED_ATTRIBUTES:
+                values, codes = cars.categories(field)
+                attribute_keys[field] = ([_attribute_key(field, value) for value in values], codes)
+        else:
+            # Vectores originales en float64 para los autos usados como referencia
+            reference_vectors = np.array([car['vector'] for car in cars], dtype=np.float64)
+            car_ids = [car.get('id') for car in cars]
+            
+            # Columna de años; los autos sin año válido quedan fuera de los filtros por año
+            car_years = np.array([_car_year(car) for car in cars], dtype=np.int32)
+            
+            for field in INDEXED_ATTRIBUTES:
+                key_codes: Dict[str, int] = {}
+                codes = np.array(
+                    [key_codes.setdefault(_attribute_key(field, car.get(field, '')), len(key_codes))
+                     for car in cars],
+                    dtype=np.intp
+                )
+                attribute_keys[field] = (list(key_codes), codes)
             
-            if all(field in car for field in required_fields):
-                # Verificar que el vector tenga 5 dimensiones
-                vector = car.get('vector', [])
-                if isinstance(vector, list) and len(vector) == 5:
-                    # Verificar que todos los elementos sean números
-                    if all(isinstance(x, (int, float)) for x in vector):
-                        valid_cars.append(car)
+            # Registros compactos respaldados por la matriz de vectores; los
+            # diccionarios originales se pueden liberar si nadie más los referencia
+            records = [CarRecord(car, reference_vectors, index) for index, car in enumerate(cars)]
+            cars = CarTable(records, reference_vectors)
         
-        self.cars = valid_cars
+        # Matriz contigua float32 solo para el KD-tree; los scores usan reference_vectors
+        car_vectors = np.ascontiguousarray(reference_vectors, dtype=np.float32)
         
-        if not self.cars:
-            raise ValueError("No se encontraron autos válidos en los datos proporcionados")
+        return CatalogSnapshot(
+            version=0,
+            cars=cars,
+            reference_vectors=reference_vectors,
+            car_vectors=car_vectors,
+            car_ids=car_ids,
+            car_years=car_years,
+            # Índices por ID y por atributo para búsquedas y filtros sin recorrer el catálogo
+            id_index=_first_indices(car_ids),
+            attribute_indexes={
+                field: _group_indices(keys, codes) for field, (keys, codes) in attribute_keys.items()
+            },
+            distance_margin=_float32_margin(reference_vectors, car_vectors),
+        )
+    
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """Snapshot vigente; tomarlo una vez para leer varios datos consistentes"""
+        return self._snapshot
+    
+    @property
+    def catalog_version(self) -> int:
+        """Versión del catálogo; aumenta con cada actualización"""
+        return self._snapshot.version
+    
+    @property
+    def cars(self) -> ColumnarCars:
+        """Autos del catálogo vigente"""
+        return self._snapshot.cars
+    
+    @property
+    def cars_data(self) -> Dict[str, Any]:
+        """Datos de entrada con los autos del catálogo vigente"""
+        return dict(self._extra_data, cars=self._snapshot.cars)
+    
+    @property
+    def reference_vectors(self) -> np.ndarray:
+        """Vectores originales (N, 5) en float64"""
+        return self._snapshot.reference_vectors
+    
+    @property
+    def car_vectors(self) -> np.ndarray:
+        """Matriz contigua (N, 5) float32 de vectores, usada solo por el KD-tree"""
+        return self._snapshot.car_vectors
+    
+    @property
+    def car_ids(self) -> List[str]:
+        """IDs en orden de catálogo"""
+        return self._snapshot.car_ids
+    
+    @property
+    def car_years(self) -> np.ndarray:
+        """Años (N,) con ``MISSING_YEAR`` para autos sin año"""
+        return self._snapshot.car_years
+    
+    @property
+    def spatial_index(self) -> Optional[KDTree]:
+        """KD-tree del catálogo vigente, si ya está construido"""
+        return self._snapshot.spatial_index
+    
+    @property
+    def similarity_table(self) -> Optional[SimilarityTable]:
+        """Tabla de autos similares, si está activa"""
+        return self._snapshot.similarity_table
+    
+    def build_spatial_index(self, leaf_size: int = 32) -> None:
+        """
+        Construye un KD-tree sobre los vectores de autos
+        
+        Con el índice, las consultas top-N exactas dejan de recorrer todo el
+        catálogo. Compensa a partir de ~50.000 autos
+        (ver ``benchmarks/bench_spatial_index.py``). Tras una actualización del
+        catálogo se reconstruye en la siguiente consulta que lo necesite.
+        
+        Args:
+            leaf_size (int): Número máximo de autos por hoja del árbol
+        """
+        with self._write_lock:
+            self._spatial_leaf_size = leaf_size
+            snapshot = self._snapshot
+            tree = KDTree(snapshot.car_vectors, leaf_size=leaf_size)
+            self._snapshot = snapshot._replace(spatial_index=tree)
+    
+    def _spatial_index_for(self, snapshot: CatalogSnapshot) -> Optional[KDTree]:
+        """
+        Obtiene el KD-tree de un snapshot, reconstruyéndolo si quedó invalidado
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot de la consulta
+        
+        Returns:
+            Optional[KDTree]: El árbol, o None si el índice espacial no está activo
+        """
+        if snapshot.spatial_index is not None or self._spatial_leaf_size is None:
+            return snapshot.spatial_index
+        
+        tree = KDTree(snapshot.car_vectors, leaf_size=self._spatial_leaf_size)
+        
+        # Publicarlo solo si nadie actualizó el catálogo mientras se construía;
+        # si hay una actualización en curso, la consulta no la espera
+        if self._write_lock.acquire(blocking=False):
+            try:
+                if self._snapshot is snapshot:
+                    self._snapshot = snapshot._replace(spatial_index=tree)
+            finally:
+                self._write_lock.release()
+        
+        return tree
+    
+    def add_cars(self, cars: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Agrega autos al catálogo sin reconstruir el matcher
+        
+        Solo se validan los autos nuevos. La matriz de vectores, los índices y
+        la tabla de similitud se extienden en un snapshot nuevo; las consultas
+        en curso terminan con el anterior.
+        
+        Args:
+            cars (Iterable[Mapping[str, Any]]): Autos en el formato de ``cars.json``
+        
+        Returns:
+            int: Número de autos agregados
+        
+        Raises:
+            ValueError: Si algún auto no es válido (en ese caso no se agrega ninguno)
+        """
+        cars = list(cars)
+        _validate_new_cars(cars)
+        
+        if not cars:
+            return 0
+        
+        added_vectors = np.array([car['vector'] for car in cars], dtype=np.float64)
+        added_records = [CarRecord(car, added_vectors, offset) for offset, car in enumerate(cars)]
+        
+        with self._write_lock:
+            base = self._snapshot
+            start = len(base.car_ids)
+            added_indices = np.arange(start, start + len(cars), dtype=np.intp)
+            
+            car_ids = base.car_ids + [record.id for record in added_records]
+            id_index = dict(base.id_index)
+            for index in added_indices.tolist():
+                id_index.setdefault(car_ids[index], index)
+            
+            # Los índices nuevos son mayores que todos los existentes: se agregan al final
+            attribute_indexes = {}
+            for field, groups in base.attribute_indexes.items():
+                groups = dict(groups)
+                keys = [_attribute_key(field, record.get(field, '')) for record in added_records]
+                for key, offsets in _group_indices(keys, np.arange(len(keys))).items():
+                    previous = groups.get(key, np.empty(0, dtype=np.intp))
+                    groups[key] = np.concatenate([previous, start + offsets])
+                attribute_indexes[field] = groups
+            
+            reference_vectors = np.concatenate([base.reference_vectors, added_vectors])
+            added_car_vectors = added_vectors.astype(np.float32)
+            snapshot = base._replace(
+                version=base.version + 1,
+                cars=CarTable(_mutable_records(base.cars) + added_records, reference_vectors),
+                reference_vectors=reference_vectors,
+                car_vectors=np.concatenate([base.car_vectors, added_car_vectors]),
+                car_ids=car_ids,
+                car_years=np.concatenate([
+                    base.car_years, np.array([_car_year(car) for car in cars], dtype=np.int32)
+                ]),
+                id_index=id_index,
+                attribute_indexes=attribute_indexes,
+                distance_margin=max(base.distance_margin,
+                                    _float32_margin(added_vectors, added_car_vectors)),
+                spatial_index=None,
+                similarity_table=None,
+            )
+            
+            table = base.similarity_table
+            if table is not None:
+                # Filas nuevas por calcular; las existentes solo evalúan los autos agregados
+                padding = ((0, len(cars)), (0, 0))
+                stale = np.zeros(len(car_ids), dtype=bool)
+                stale[start:] = True
+                table = self._refresh_similarity_table(
+                    snapshot,
+                    np.pad(table.neighbors, padding, constant_values=-1),
+                    np.pad(table.scores, padding, constant_values=0.0),
+                    stale,
+                    added_indices,
+                )
+            
+            self._snapshot = snapshot._replace(similarity_table=table)
+        
+        return len(cars)
+    
+    def remove_cars(self, car_ids: Iterable[str]) -> int:
+        """
+        Quita autos del catálogo sin reconstruir el matcher
+        
+        Se quitan todas las apariciones de cada ID. Los índices se trasladan a
+        las nuevas posiciones y en la tabla de similitud solo se recalculan las
+        filas que tenían como vecino a un auto quitado.
+        
+        Args:
+            car_ids (Iterable[str]): IDs a quitar; los que no existen se ignoran
+        
+        Returns:
+            int: Número de autos quitados
+        
+        Raises:
+            ValueError: Si se intenta dejar el catálogo vacío
+        """
+        removed_ids = set(car_ids)
+        
+        with self._write_lock:
+            base = self._snapshot
+            keep = np.fromiter((car_id not in removed_ids for car_id in base.car_ids),
+                               dtype=bool, count=len(base.car_ids))
+            num_removed = len(keep) - int(keep.sum())
+            
+            if num_removed == 0:
+                return 0
+            if num_removed == len(keep):
+                raise ValueError("No se pueden quitar todos los autos del catálogo")
+            
+            # Nueva posición de cada auto (-1 si se quita)
+            remap = np.cumsum(keep) - 1
+            remap[~keep] = -1
+            kept = np.flatnonzero(keep).tolist()
+            
+            records = _mutable_records(base.cars)
+            car_ids = [base.car_ids[index] for index in kept]
+            reference_vectors = base.reference_vectors[keep]
+            
+            snapshot = base._replace(
+                version=base.version + 1,
+                cars=CarTable([records[index] for index in kept], reference_vectors),
+                reference_vectors=reference_vectors,
+                car_vectors=base.car_vectors[keep],
+                car_ids=car_ids,
+                car_years=base.car_years[keep],
+                id_index=_first_indices(car_ids),
+                attribute_indexes={
+                    field: _remap_groups(groups, remap)
+                    for field, groups in base.attribute_indexes.items()
+                },
+                spatial_index=None,
+                similarity_table=None,
+            )
+            
+            table = base.similarity_table
+            if table is not None:
+                neighbors = table.neighbors[keep]
+                remapped = np.where(neighbors >= 0, remap[neighbors], -1)
+                table = self._refresh_similarity_table(
+                    snapshot,
+                    remapped,
+                    table.scores[keep],
+                    ((neighbors >= 0) & (remapped < 0)).any(axis=1),
+                    np.empty(0, dtype=np.intp),
+                )
+            
+            self._snapshot = snapshot._replace(similarity_table=table)
+        
+        return num_removed
+    
+    def update_car(self, car_id: str, changes: Mapping[str, Any]) -> CarRecord:
+        """
+        Modifica los campos de un auto sin reconstruir el matcher
+        
+        Se modifica la misma aparición que devuelve ``get_car_by_id`` y el auto
+        conserva su posición en el catálogo. Si cambia el vector, en la tabla
+        de similitud solo se recalculan la fila del auto y las que lo tenían
+        como vecino; el resto solo lo evalúa como candidato.
+        
+        Args:
+            car_id (str): ID del auto
+            changes (Mapping[str, Any]): Campos nuevos (el resto se conserva)
+        
+        Returns:
+            CarRecord: Registro actualizado
+        
+        Raises:
+            KeyError: Si el ID no existe
+            ValueError: Si el auto resultante no es válido o cambia su ID
+        """
+        with self._write_lock:
+            base = self._snapshot
+            index = base.id_index.get(car_id)
+            
+            if index is None:
+                raise KeyError(car_id)
+            
+            current = base.cars[index]
+            fields = dict(current)
+            fields.update(changes)
+            
+            if fields.get('id') != car_id:
+                raise ValueError("No se puede cambiar el ID de un auto; usa remove_cars y add_cars")
+            _validate_new_cars([fields])
+            
+            vector = np.array([fields['vector']], dtype=np.float64)
+            record = CarRecord(fields, vector, 0)
+            
+            records = _mutable_records(base.cars)
+            records[index] = record
+            reference_vectors = base.reference_vectors.copy()
+            reference_vectors[index] = vector[0]
+            car_vectors = base.car_vectors.copy()
+            car_vectors[index] = vector[0]
+            car_years = base.car_years.copy()
+            car_years[index] = _car_year(record)
+            
+            # Mover el auto de grupo solo en los atributos que cambiaron
+            attribute_indexes = dict(base.attribute_indexes)
+            for field, groups in base.attribute_indexes.items():
+                old_key = _attribute_key(field, current.get(field, ''))
+                new_key = _attribute_key(field, record.get(field, ''))
+                if old_key == new_key:
+                    continue
+                
+                groups = dict(groups)
+                remaining = groups[old_key][groups[old_key] != index]
+                if len(remaining):
+                    groups[old_key] = remaining
+                else:
+                    del groups[old_key]
+                
+                target = groups.get(new_key, np.empty(0, dtype=np.intp))
+                groups[new_key] = np.insert(target, np.searchsorted(target, index), index)
+                attribute_indexes[field] = groups
+            
+            vector_changed = not np.array_equal(base.reference_vectors[index], vector[0])
+            
+            snapshot = base._replace(
+                version=base.version + 1,
+                cars=CarTable(records, reference_vectors),
+                reference_vectors=reference_vectors,
+                car_vectors=car_vectors,
+                car_years=car_years,
+                attribute_indexes=attribute_indexes,
+                distance_margin=max(base.distance_margin,
+                                    _float32_margin(reference_vectors[index:index + 1],
+                                                    car_vectors[index:index + 1])),
+                spatial_index=None if vector_changed else base.spatial_index,
+                similarity_table=None,
+            )
+            
+            table = base.similarity_table
+            if table is not None and vector_changed:
+                stale = (table.neighbors == index).any(axis=1)
+                stale[index] = True
+                table = self._refresh_similarity_table(
+                    snapshot, table.neighbors, table.scores, stale,
+                    np.array([index], dtype=np.intp)
+                )
+            
+            self._snapshot = snapshot._replace(similarity_table=table)
+        
+        return record
+    
+    def calculate_match_scores(self, user_vector: List[float],
+                               indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula el score de coincidencia del usuario contra todos los autos
+        
+        Args:
+            user_vector (List[float]): Vector de personalidad del usuario
+            indices (Optional[np.ndarray]): Limitar el cálculo a estos autos
+        
+        Returns:
+            np.ndarray: Scores como porcentaje (0-100), uno por auto
+        """
+        return self._match_scores(self._snapshot, user_vector, indices)
+    
+    def _match_scores(self, snapshot: CatalogSnapshot, user_vector: List[float],
+                      indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Versión de ``calculate_match_scores`` sobre un snapshot dado"""
+        car_vectors = snapshot.reference_vectors if indices is None else snapshot.reference_vectors[indices]
+        user_array = np.asarray(user_vector, dtype=np.float64)
+        
+        if user_array.shape != (snapshot.reference_vectors.shape[1],):
+            return np.zeros(len(car_vectors), dtype=np.float64)
+        
+        distances = _euclidean_distances(car_vectors, user_array)
+        return _distances_to_percentages(distances)
     
     def calculate_match_score(self, user_vector: List[float], car_vector: List[float]) -> float:
         """
@@ -63,49 +919,149 @@ class AutoMatcher:
         # Calcular distancia euclidiana
         distance = np.sqrt(sum((u - c) ** 2 for u, c in zip(user_vector, car_vector)))
         
-        # Convertir a porcentaje de similitud
-        # Distancia máxima teórica: sqrt(5 * 4^2) = ~8.94
-        max_distance = np.sqrt(5 * (4 ** 2))
-        
         # Calcular similitud (inversa de la distancia normalizada)
-        similarity = (1 - (distance / max_distance)) * 100
+        similarity = (1 - (distance / MAX_DISTANCE)) * 100
         
         # Asegurar que esté en el rango [0, 100]
         return max(0.0, min(100.0, similarity))
     
-    def find_best_matches(self, user_vector: List[float], top_n: int = 3) -> List[Dict[str, Any]]:
+    @timed("find_best_matches")
+    def find_best_matches(self,
+                          user_vector: List[float],
+                          top_n: int = 3,
+                          car_type: Optional[str] = None,
+                          price_range: Optional[str] = None,
+                          brand: Optional[str] = None,
+                          year: Optional[int] = None,
+                          min_year: Optional[int] = None,
+                          min_match: float = 0.0) -> List[Recommendation]:
         """
         Encuentra los mejores matches para un usuario
         
+        Los filtros se aplican sobre los índices antes de calcular distancias,
+        de modo que solo se puntúan los autos candidatos.
+        
         Args:
             user_vector (List[float]): Vector de personalidad del usuario
             top_n (int): Número de recomendaciones a retornar
+            car_type (Optional[str]): Tipo de auto (sin distinguir mayúsculas)
+            price_range (Optional[str]): Rango de precio exacto
+            brand (Optional[str]): Marca (sin distinguir mayúsculas)
+            year (Optional[int]): Año exacto
+            min_year (Optional[int]): Año mínimo
+            min_match (float): Score mínimo de match requerido
             
         Returns:
-            List[Dict[str, Any]]: Lista de recomendaciones ordenadas por score
+            List[Recommendation]: Lista de recomendaciones ordenadas por score
         """
-        if not self.cars:
+        snapshot = self._snapshot
+        
+        if not snapshot.cars:
             return []
         
+        candidates = None
+        if car_type or price_range or brand or year is not None or min_year is not None:
+            candidates = self._filter_indices(snapshot, car_type, price_range, brand, year, min_year)
+        
         recommendations = []
         
-        for car in self.cars:
-            car_vector = car.get('vector', [])
-            match_score = self.calculate_match_score(user_vector, car_vector)
+        for index, match_score in zip(*self._top_matches(snapshot, user_vector, top_n, candidates)):
+            match_score = float(match_score)
+            
+            # Los resultados vienen ordenados: el primero bajo el mínimo corta la lista
+            if match_score < min_match:
+                break
+            
+            recommendations.append(Recommendation(snapshot.cars[index], match_score))
+        
+        return recommendations
+    
+    def _top_matches(self, snapshot: CatalogSnapshot, user_vector: List[float], top_n: int,
+                     candidates: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene los índices y scores de los N autos más cercanos a un vector
+        
+        Usa el índice espacial si existe; si no, puntúa todo el catálogo (o solo
+        los candidatos indicados) de una vez.
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot de la consulta
+            user_vector (List[float]): Vector de referencia
+            top_n (int): Número de autos a retornar
+            candidates (Optional[np.ndarray]): Índices de autos a considerar
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices en ``snapshot.cars`` y scores (0-100)
+        """
+        if candidates is not None:
+            scores = self._match_scores(snapshot, user_vector, candidates)
+            order = _top_n_indices(scores, top_n)
+            return candidates[order], scores[order]
+        
+        user_array = np.asarray(user_vector, dtype=np.float64)
+        
+        if (0 < top_n < len(snapshot.cars)
+                and user_array.shape == (snapshot.reference_vectors.shape[1],)):
+            spatial_index = self._spatial_index_for(snapshot)
+        else:
+            spatial_index = None
+        
+        if spatial_index is not None:
+            _, distances = spatial_index.query(user_array, top_n)
             
-            recommendations.append({
-                'car': car,
-                'match_percentage': match_score,
-                'match_score': match_score / 100.0  # Score normalizado 0-1
-            })
+            # El árbol usa vectores float32: se recogen todos los autos que
+            # podrían estar en el top-N con los vectores exactos (más los casi
+            # empatados) y se puntúan en float64, desempatando por orden de
+            # catálogo igual que en el cálculo completo. Quitar autos no agranda
+            # el error, así que el margen del snapshot sigue siendo una cota
+            radius = np.sqrt(distances[-1]) + 2 * snapshot.distance_margin
+            
+            # Más allá de MAX_DISTANCE el score se recorta a 0 y todos esos autos
+            # empatan: el orden lo decide el catálogo, no la distancia
+            if radius < MAX_DISTANCE * (1 - SCORE_TIE_TOLERANCE):
+                cutoff = radius ** 2 * (1 + SCORE_TIE_TOLERANCE) + SCORE_TIE_TOLERANCE
+                candidates, _ = spatial_index.query_radius(user_array, cutoff)
+                scores = self._match_scores(snapshot, user_array, candidates)
+                order = _top_n_indices(scores, top_n)
+                return candidates[order], scores[order]
+        
+        # Scores de todo el catálogo en una sola operación
+        scores = self._match_scores(snapshot, user_vector)
+        indices = _top_n_indices(scores, top_n)
+        return indices, scores[indices]
+    
+    @timed("find_best_matches_batch")
+    def find_best_matches_batch(self,
+                                user_matrix: np.ndarray,
+                                top_n: int = 3,
+                                chunk_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encuentra los mejores matches para muchos usuarios en una sola llamada
+        
+        Las filas se procesan por bloques para acotar la memoria: cada bloque
+        calcula a lo sumo ``BATCH_MAX_DISTANCES`` distancias.
         
-        # Ordenar por score descendente
-        recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+        Args:
+            user_matrix (np.ndarray): Matriz (M, 5) de vectores de personalidad
+            top_n (int): Número de recomendaciones por usuario
+            chunk_size (Optional[int]): Filas por bloque (automático si es None)
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices en ``self.cars`` (M, top_n) y
+            scores como porcentaje (M, top_n), ordenados de mayor a menor
+        """
+        car_vectors = self._snapshot.reference_vectors
+        user_matrix = np.asarray(user_matrix, dtype=np.float64)
+        
+        if user_matrix.ndim != 2 or user_matrix.shape[1] != car_vectors.shape[1]:
+            raise ValueError(
+                f"Se esperaba una matriz (M, {car_vectors.shape[1]}), "
+                f"se recibió {user_matrix.shape}"
+            )
         
-        # Retornar top N
-        return recommendations[:top_n]
+        return top_matches_batch(car_vectors, user_matrix, top_n, chunk_size)
     
-    def get_car_by_id(self, car_id: str) -> Optional[Dict[str, Any]]:
+    def get_car_by_id(self, car_id: str) -> Optional[CarRecord]:
         """
         Obtiene un auto específico por su ID
         
@@ -113,42 +1069,89 @@ class AutoMatcher:
             car_id (str): ID del auto a buscar
             
         Returns:
-            Optional[Dict[str, Any]]: Datos del auto o None si no se encuentra
+            Optional[CarRecord]: Datos del auto o None si no se encuentra
         """
-        for car in self.cars:
-            if car.get('id') == car_id:
-                return car
-        return None
+        snapshot = self._snapshot
+        index = snapshot.id_index.get(car_id)
+        return snapshot.cars[index] if index is not None else None
+    
+    def _filter_indices(self,
+                        snapshot: CatalogSnapshot,
+                        car_type: Optional[str] = None,
+                        price_range: Optional[str] = None,
+                        brand: Optional[str] = None,
+                        year: Optional[int] = None,
+                        min_year: Optional[int] = None) -> np.ndarray:
+        """
+        Obtiene los índices de autos que cumplen los filtros de atributos
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot de la consulta
+            car_type (Optional[str]): Tipo de auto (sin distinguir mayúsculas)
+            price_range (Optional[str]): Rango de precio exacto
+            brand (Optional[str]): Marca (sin distinguir mayúsculas)
+            year (Optional[int]): Año exacto
+            min_year (Optional[int]): Año mínimo
+        
+        Returns:
+            np.ndarray: Índices en ``snapshot.cars`` en orden de catálogo
+        """
+        candidates = None
+        
+        for field, value in (('type', car_type), ('price_range', price_range), ('brand', brand)):
+            if not value:
+                continue
+            
+            matches = snapshot.attribute_indexes[field].get(
+                _attribute_key(field, value), np.empty(0, dtype=np.intp)
+            )
+            candidates = matches if candidates is None else np.intersect1d(
+                candidates, matches, assume_unique=True
+            )
+        
+        if candidates is None:
+            candidates = np.arange(len(snapshot.cars))
+        
+        # Filtros de año como máscaras sobre los candidatos restantes
+        if year is not None:
+            candidates = candidates[snapshot.car_years[candidates] == year]
+        if min_year is not None:
+            candidates = candidates[snapshot.car_years[candidates] >= min_year]
+        
+        return candidates
     
     def filter_cars_by_criteria(self, 
                                min_match: float = 0.0,
                                car_type: Optional[str] = None,
-                               price_range: Optional[str] = None) -> List[Dict[str, Any]]:
+                               price_range: Optional[str] = None,
+                               brand: Optional[str] = None,
+                               user_vector: Optional[List[float]] = None,
+                               year: Optional[int] = None,
+                               min_year: Optional[int] = None) -> List[CarRecord]:
         """
         Filtra autos por criterios específicos
         
         Args:
-            min_match (float): Score mínimo de match requerido
+            min_match (float): Score mínimo de match requerido (requiere ``user_vector``)
             car_type (Optional[str]): Tipo de auto a filtrar
             price_range (Optional[str]): Rango de precio a filtrar
+            brand (Optional[str]): Marca a filtrar
+            user_vector (Optional[List[float]]): Vector del usuario para aplicar ``min_match``
+            year (Optional[int]): Año exacto
+            min_year (Optional[int]): Año mínimo
             
         Returns:
-            List[Dict[str, Any]]: Lista de autos filtrados
+            List[CarRecord]: Lista de autos filtrados
         """
-        filtered_cars = []
+        snapshot = self._snapshot
+        indices = self._filter_indices(snapshot, car_type, price_range, brand, year, min_year)
         
-        for car in self.cars:
-            # Filtrar por tipo si se especifica
-            if car_type and car.get('type', '').lower() != car_type.lower():
-                continue
-            
-            # Filtrar por rango de precio si se especifica
-            if price_range and car.get('price_range', '') != price_range:
-                continue
-            
-            filtered_cars.append(car)
+        # Puntuar solo los autos que pasaron los filtros de atributos
+        if user_vector is not None and min_match > 0:
+            scores = self._match_scores(snapshot, user_vector, indices)
+            indices = indices[scores >= min_match]
         
-        return filtered_cars
+        return [snapshot.cars[index] for index in indices]
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -157,46 +1160,207 @@ class AutoMatcher:
         Returns:
             Dict[str, Any]: Estadísticas de la base de datos
         """
-        if not self.cars:
-            return {"total_cars": 0}
-        
-        # Contar por tipo
-        types_count = {}
-        brands_count = {}
-        price_ranges_count = {}
+        snapshot = self._snapshot
+        cars = snapshot.cars
         
-        for car in self.cars:
-            # Tipos
-            car_type = car.get('type', 'Unknown')
-            types_count[car_type] = types_count.get(car_type, 0) + 1
-            
-            # Marcas
-            brand = car.get('brand', 'Unknown')
-            brands_count[brand] = brands_count.get(brand, 0) + 1
-            
-            # Rangos de precio
-            price_range = car.get('price_range', 'Unknown')
-            price_ranges_count[price_range] = price_ranges_count.get(price_range, 0) + 1
+        if not cars:
+            return {"total_cars": 0}
         
-        # Calcular promedios de vectores por dimensión
-        vectors = [car.get('vector', [0, 0, 0, 0, 0]) for car in self.cars]
-        avg_vector = []
+        distributions = {field: _value_counts(cars, field) for field in INDEXED_ATTRIBUTES}
         
-        if vectors:
-            for i in range(5):  # 5 dimensiones
-                dimension_values = [v[i] if i < len(v) else 0 for v in vectors]
-                avg_vector.append(sum(dimension_values) / len(dimension_values))
+        # Promedio de cada dimensión sobre la matriz de vectores
+        avg_vector = snapshot.reference_vectors.mean(axis=0).tolist()
         
         return {
-            "total_cars": len(self.cars),
-            "types_distribution": types_count,
-            "brands_distribution": brands_count,
-            "price_ranges_distribution": price_ranges_count,
+            "total_cars": len(cars),
+            "types_distribution": distributions['type'],
+            "brands_distribution": distributions['brand'],
+            "price_ranges_distribution": distributions['price_range'],
             "average_vector": avg_vector,
             "dimensions": ["Sostenibilidad", "Prestaciones", "Lujo y Confort", "Versatilidad", "Tech-savvy"]
         }
     
-    def recommend_similar_cars(self, reference_car_id: str, top_n: int = 3) -> List[Dict[str, Any]]:
+    
+    def _rank_similar(self, snapshot: CatalogSnapshot, reference_car_id: str,
+                      reference_vector: List[float], top_n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ordena el catálogo por similitud a un vector, excluyendo un ID
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot de la consulta
+            reference_car_id (str): ID a excluir del resultado
+            reference_vector (List[float]): Vector del auto de referencia
+            top_n (int): Número de autos a retornar (todos si es <= 0)
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices en ``snapshot.cars`` y scores (0-100)
+        """
+        num_cars = len(snapshot.cars)
+        
+        # Pedir uno más para descartar el propio auto; ampliar si hay IDs repetidos
+        fetch = num_cars if top_n <= 0 else min(top_n + 1, num_cars)
+        
+        while True:
+            indices, scores = self._top_matches(snapshot, reference_vector, fetch)
+            keep = np.array(
+                [snapshot.car_ids[index] != reference_car_id for index in indices],
+                dtype=bool
+            )
+            indices, scores = indices[keep], scores[keep]
+            
+            if top_n <= 0:
+                return indices, scores
+            
+            if len(indices) >= top_n or fetch >= num_cars:
+                return indices[:top_n], scores[:top_n]
+            
+            fetch = min(fetch * 2, num_cars)
+    
+    def build_similarity_table(self, top_k: int = 10) -> SimilarityTable:
+        """
+        Precalcula los K autos más similares a cada auto del catálogo
+        
+        Args:
+            top_k (int): Número de vecinos por auto
+        
+        Returns:
+            SimilarityTable: Tabla de vecinos con la huella del catálogo actual
+        """
+        snapshot = self._snapshot
+        neighbors, scores = self._similarity_rows(snapshot, np.arange(len(snapshot.car_ids)), top_k)
+        return SimilarityTable(snapshot.car_ids, neighbors, scores,
+                               catalog_fingerprint(snapshot.car_ids, snapshot.reference_vectors))
+    
+    def _similarity_rows(self, snapshot: CatalogSnapshot, rows: np.ndarray,
+                         top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula las filas de la tabla de similitud de algunos autos
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot del catálogo
+            rows (np.ndarray): Índices de los autos de referencia
+            top_k (int): Número de vecinos por auto
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Vecinos (R, top_k), con -1 en las
+            posiciones vacías, y sus scores (R, top_k)
+        """
+        ids = snapshot.car_ids
+        num_cars = len(ids)
+        fetch = min(top_k + 1, num_cars)
+        
+        candidates, candidate_scores = top_matches_batch(
+            snapshot.reference_vectors, snapshot.reference_vectors[rows], fetch
+        )
+        
+        # Descartar el propio auto (y sus IDs repetidos) conservando el orden
+        id_array = np.array(ids, dtype=object)
+        same_id = id_array[candidates] == id_array[rows][:, None]
+        order = np.argsort(same_id, axis=1, kind='stable')[:, :top_k]
+        
+        neighbors = np.take_along_axis(candidates, order, axis=1)
+        scores = np.take_along_axis(candidate_scores, order, axis=1)
+        valid = ~np.take_along_axis(same_id, order, axis=1)
+        
+        if neighbors.shape[1] < top_k:
+            padding = top_k - neighbors.shape[1]
+            neighbors = np.pad(neighbors, ((0, 0), (0, padding)), constant_values=-1)
+            scores = np.pad(scores, ((0, 0), (0, padding)), constant_values=0.0)
+            valid = np.pad(valid, ((0, 0), (0, padding)), constant_values=False)
+        
+        neighbors[~valid] = -1
+        
+        # Filas con demasiados IDs repetidos entre los candidatos: calcular aparte
+        for position in np.flatnonzero(valid.sum(axis=1) < min(top_k, num_cars - 1)):
+            row = rows[position]
+            row_indices, row_scores = self._rank_similar(
+                snapshot, ids[row], snapshot.reference_vectors[row], top_k
+            )
+            neighbors[position] = -1
+            neighbors[position, :len(row_indices)] = row_indices
+            scores[position, :len(row_scores)] = row_scores
+        
+        return neighbors, scores
+    
+    def _refresh_similarity_table(self, snapshot: CatalogSnapshot, neighbors: np.ndarray,
+                                  scores: np.ndarray, stale: np.ndarray,
+                                  candidates: np.ndarray) -> SimilarityTable:
+        """
+        Actualiza la tabla de similitud tras un cambio en el catálogo
+        
+        Las filas que perdieron un vecino se recalculan completas. En el resto
+        basta con evaluar los autos nuevos o modificados: el top-K del catálogo
+        actualizado es el top-K de los vecinos previos más esos candidatos.
+        
+        Args:
+            snapshot (CatalogSnapshot): Snapshot ya actualizado
+            neighbors (np.ndarray): Vecinos previos (N, K) en posiciones del nuevo catálogo
+            scores (np.ndarray): Scores previos (N, K)
+            stale (np.ndarray): Máscara (N,) de filas a recalcular
+            candidates (np.ndarray): Índices de autos a evaluar en las demás filas
+        
+        Returns:
+            SimilarityTable: Tabla igual a la de ``build_similarity_table`` sobre el snapshot
+        """
+        ids = snapshot.car_ids
+        neighbors = neighbors.copy()
+        scores = scores.astype(np.float64, copy=True)
+        
+        fresh = np.flatnonzero(~stale)
+        if len(candidates) and len(fresh):
+            id_array = np.array(ids, dtype=object)
+            candidate_ids = id_array[candidates]
+            candidate_vectors = snapshot.reference_vectors[candidates]
+            chunk_size = max(1, BATCH_MAX_DISTANCES // len(candidates))
+            
+            for start in range(0, len(fresh), chunk_size):
+                rows = fresh[start:start + chunk_size]
+                reference_vectors = np.asarray(snapshot.reference_vectors[rows], dtype=np.float64)
+                distances = _euclidean_distances(candidate_vectors, reference_vectors)
+                
+                # Un auto nunca es vecino de sí mismo ni de sus IDs repetidos
+                row_candidates = np.where(candidate_ids == id_array[rows][:, None], -1, candidates)
+                neighbors[rows], scores[rows] = _merge_neighbors(
+                    neighbors[rows], scores[rows],
+                    row_candidates, _distances_to_percentages(distances)
+                )
+        
+        stale_rows = np.flatnonzero(stale)
+        if len(stale_rows):
+            neighbors[stale_rows], scores[stale_rows] = self._similarity_rows(
+                snapshot, stale_rows, neighbors.shape[1]
+            )
+        
+        return SimilarityTable(ids, neighbors, scores, catalog_fingerprint(ids, snapshot.reference_vectors))
+    
+    def enable_similarity_table(self, top_k: int = 10, cache_path: Optional[str] = None) -> None:
+        """
+        Activa la tabla de autos similares para ``recommend_similar_cars``
+        
+        Si ``cache_path`` existe y corresponde al catálogo actual se reutiliza;
+        si no, se construye y se guarda en esa ruta. Las actualizaciones del
+        catálogo la mantienen al día (en memoria; el archivo no se reescribe).
+        
+        Args:
+            top_k (int): Número de vecinos por auto
+            cache_path (Optional[str]): Archivo de la tabla (ver ``similarity_cache_path``)
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            fingerprint = catalog_fingerprint(snapshot.car_ids, snapshot.reference_vectors)
+            table = SimilarityTable.load(cache_path) if cache_path else None
+            
+            # La huella usa str(id): se comparan también los IDs con su tipo
+            if (table is None or table.fingerprint != fingerprint or table.top_k < top_k
+                    or table.ids != list(snapshot.car_ids)):
+                table = self.build_similarity_table(top_k)
+                
+                if cache_path:
+                    table.save(cache_path)
+            
+            self._snapshot = snapshot._replace(similarity_table=table)
+    
+    def recommend_similar_cars(self, reference_car_id: str, top_n: int = 3) -> List[SimilarCar]:
         """
         Recomienda autos similares a uno de referencia
         
@@ -205,30 +1369,31 @@ class AutoMatcher:
             top_n (int): Número de recomendaciones
             
         Returns:
-            List[Dict[str, Any]]: Lista de autos similares
+            List[SimilarCar]: Lista de autos similares
         """
-        reference_car = self.get_car_by_id(reference_car_id)
+        snapshot = self._snapshot
+        table = snapshot.similarity_table
         
-        if not reference_car:
-            return []
-        
-        reference_vector = reference_car.get('vector', [])
-        similar_cars = []
-        
-        for car in self.cars:
-            if car.get('id') == reference_car_id:
-                continue  # Saltar el auto de referencia
+        if table is not None and 0 < top_n <= table.top_k:
+            result = table.lookup(reference_car_id, top_n)
+            
+            if result is None:
+                return []
+            
+            indices, scores = result
+        else:
+            index = snapshot.id_index.get(reference_car_id)
             
-            car_vector = car.get('vector', [])
-            similarity = self.calculate_match_score(reference_vector, car_vector)
+            if index is None:
+                return []
             
-            similar_cars.append({
-                'car': car,
-                'similarity_percentage': similarity,
-                'similarity_score': similarity / 100.0
-            })
+            reference_vector = snapshot.reference_vectors[index]
+            indices, scores = self._rank_similar(snapshot, reference_car_id, reference_vector, top_n)
+        
+        similar_cars = []
         
-        # Ordenar por similitud descendente
-        similar_cars.sort(key=lambda x: x['similarity_score'], reverse=True)
+        for index, similarity in zip(indices, scores):
+            similarity = float(similarity)
+            similar_cars.append(SimilarCar(snapshot.cars[index], similarity))
         
         return similar_cars[:top_n]
@@ -0,0 +1,279 @@
+"""
+Métricas de tiempos y contadores en proceso para Auto Personality App
+
+Las etapas del flujo de recomendación (carga de JSON, vector de personalidad,
+matcher, imágenes, gráfico de radar) se envuelven con ``timed`` o ``timer``:
+cada llamada suma su duración a un histograma por etapa. Los contadores
+(``increment``) registran eventos como aciertos de la tabla de respuestas.
+
+Por defecto las métricas están desactivadas y cada etapa solo paga la
+consulta de una variable global. Se activan con la variable de entorno
+``AUTO_PERSONALITY_METRICS=1`` o con ``enable()``; ``render_prometheus``
+las exporta en el formato de texto de Prometheus.
+
+Cada proceso tiene su propio registro: con varios workers, cada uno reporta
+sus propias métricas.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+METRICS_ENV = "AUTO_PERSONALITY_METRICS"
+METRIC_PREFIX = "auto_personality"
+
+# Límites superiores (segundos) de los buckets, de 100 µs a 10 s
+BUCKET_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes")
+
+
+class Histogram:
+    """
+    Histograma de duraciones con buckets fijos, al estilo de Prometheus
+    
+    Los buckets son acumulativos solo al exportar; aquí se guarda el conteo
+    de cada intervalo.
+    """
+    
+    __slots__ = ("counts", "count", "sum", "max")
+    
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        """Registra una duración en segundos"""
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def quantile(self, fraction: float) -> float:
+        """
+        Cota superior del cuantil ``fraction`` según los buckets
+        
+        Args:
+            fraction (float): Cuantil entre 0 y 1
+        
+        Returns:
+            float: Límite del bucket que contiene el cuantil (o el máximo observado)
+        """
+        if not self.count:
+            return 0.0
+        
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def enable(value: bool = True) -> None:
+    """Activa (o desactiva) el registro de métricas en este proceso"""
+    global _enabled
+    _enabled = value
+
+
+def is_enabled() -> bool:
+    """Indica si se están registrando métricas"""
+    return _enabled
+
+
+def observe(stage: str, seconds: float) -> None:
+    """
+    Suma una duración al histograma de una etapa
+    
+    Args:
+        stage (str): Nombre de la etapa
+        seconds (float): Duración en segundos
+    """
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+
+def increment(event: str, amount: int = 1) -> None:
+    """
+    Incrementa el contador de un evento (no hace nada si las métricas están desactivadas)
+    
+    Args:
+        event (str): Nombre del evento
+        amount (int): Cantidad a sumar
+    """
+    if not _enabled:
+        return
+    
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + amount
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """
+    Decorador que mide cada llamada a una función como la etapa ``stage``
+    
+    Args:
+        stage (str): Nombre de la etapa
+    
+    Returns:
+        Callable[[F], F]: Decorador
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        
+        return wrapper  # type: ignore[return-value]
+    
+    return decorator
+
+
+class _Timer:
+    """Context manager de ``timer``"""
+    
+    __slots__ = ("stage", "start")
+    
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.start = 0.0
+    
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        observe(self.stage, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    """Context manager vacío que se usa con las métricas desactivadas"""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> "_NullTimer":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage: str):
+    """
+    Context manager que mide un bloque de código como la etapa ``stage``
+    
+    Args:
+        stage (str): Nombre de la etapa
+    
+    Returns:
+        Context manager que registra la duración del bloque
+    """
+    return _Timer(stage) if _enabled else _NULL_TIMER
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Copia de las métricas actuales para mostrarlas (por ejemplo, en el panel de debug)
+    
+    Returns:
+        Dict[str, Any]: ``stages`` (conteo y tiempos en ms por etapa) y ``counters``
+    """
+    with _lock:
+        stages = {
+            stage: {
+                "count": histogram.count,
+                "total_ms": histogram.sum * 1000,
+                "mean_ms": histogram.sum * 1000 / histogram.count if histogram.count else 0.0,
+                "p50_ms": histogram.quantile(0.5) * 1000,
+                "p95_ms": histogram.quantile(0.95) * 1000,
+                "max_ms": histogram.max * 1000,
+            }
+            for stage, histogram in sorted(_histograms.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    
+    return {"stages": stages, "counters": counters}
+
+
+def _format_value(value: float) -> str:
+    """Formato numérico de Prometheus (enteros sin decimales)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(gauges: Optional[Dict[str, float]] = None) -> str:
+    """
+    Exporta las métricas en el formato de texto de Prometheus
+    
+    Args:
+        gauges (Optional[Dict[str, float]]): Valores instantáneos adicionales
+            (por ejemplo, estadísticas del agrupador de consultas)
+    
+    Returns:
+        str: Texto para un endpoint ``/metrics``
+    """
+    lines: List[str] = []
+    
+    with _lock:
+        histograms = [(stage, list(h.counts), h.count, h.sum) for stage, h in sorted(_histograms.items())]
+        counters = sorted(_counters.items())
+    
+    name = f"{METRIC_PREFIX}_stage_duration_seconds"
+    lines.append(f"# HELP {name} Duración de cada etapa del flujo de recomendación")
+    lines.append(f"# TYPE {name} histogram")
+    
+    for stage, counts, count, total in histograms:
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {_format_value(total)}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+    
+    name = f"{METRIC_PREFIX}_events_total"
+    lines.append(f"# HELP {name} Eventos contados en el flujo de recomendación")
+    lines.append(f"# TYPE {name} counter")
+    
+    for event, count in counters:
+        lines.append(f'{name}{{event="{event}"}} {count}')
+    
+    for gauge, value in sorted((gauges or {}).items()):
+        name = f"{METRIC_PREFIX}_{gauge}"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(value)}")
+    
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Borra todas las métricas registradas"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
@@ -2,18 +2,35 @@
 Procesamiento de personalidad para Auto Personality App
 """
 
+import threading
 import numpy as np
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from metrics import timed
+
+# Entradas por defecto de la caché de perfiles exportados
+PROFILE_CACHE_SIZE = 1024
+
+# Decimales con los que se cuantiza un vector para usarlo como clave de caché
+PROFILE_CACHE_DECIMALS = 6
 
 class PersonalityProcessor:
     """
     Clase para procesar respuestas del cuestionario y calcular vectores de personalidad
     """
     
-    def __init__(self):
+    def __init__(self, questions_data: Optional[Dict[str, Any]] = None,
+                 profile_cache_size: int = PROFILE_CACHE_SIZE):
         """
         Inicializa el procesador de personalidad
         
+        Args:
+            questions_data (Optional[Dict[str, Any]]): Preguntas a compilar para
+                calcular vectores a partir de índices de respuesta
+            profile_cache_size (int): Perfiles exportados que se guardan en la
+                caché LRU (0 la desactiva)
+        
         Dimensiones del vector de personalidad:
         0: Sostenibilidad (consciencia ambiental)
         1: Prestaciones (búsqueda de potencia/velocidad)
@@ -31,7 +48,111 @@ class PersonalityProcessor:
         
         # Pesos por defecto para normalización
         self.dimension_weights = [1.0, 1.0, 1.0, 1.0, 1.0]
+        
+        # Tensor (preguntas x opciones x dimensiones) con los pesos de cada opción
+        self.weight_tensor: Optional[np.ndarray] = None
+        self.option_counts: Optional[np.ndarray] = None
+        
+        # Caché LRU de las partes derivadas de export_personality_profile
+        self.profile_cache_size = profile_cache_size
+        self._profile_cache: "OrderedDict[Tuple[float, ...], Dict[str, Any]]" = OrderedDict()
+        self._profile_lock = threading.Lock()
+        self._profile_counters = {"hits": 0, "misses": 0, "evictions": 0}
+        
+        if questions_data is not None:
+            self.compile_questions(questions_data)
+    
+    def compile_questions(self, questions_data: Dict[str, Any]) -> None:
+        """
+        Compila las preguntas en un tensor de pesos para responder con índices
+        
+        Las opciones cuyos pesos no tienen el tamaño correcto se guardan como
+        ceros, igual que las ignora ``calculate_personality_vector``.
+        
+        Args:
+            questions_data (Dict[str, Any]): Datos de preguntas cargados desde JSON
+        """
+        questions = questions_data.get('questions', [])
+        num_dimensions = len(self.dimensions)
+        max_options = max((len(q.get('options', [])) for q in questions), default=0)
+        
+        self.weight_tensor = np.zeros((len(questions), max_options, num_dimensions), dtype=np.float64)
+        self.option_counts = np.zeros(len(questions), dtype=np.int64)
+        
+        for q_index, question in enumerate(questions):
+            options = question.get('options', [])
+            self.option_counts[q_index] = len(options)
+            
+            for o_index, option in enumerate(options):
+                weights = option.get('weights', [])
+                if len(weights) == num_dimensions:
+                    self.weight_tensor[q_index, o_index] = weights
+    
+    def _validate_answer_indices(self, answer_indices: np.ndarray) -> None:
+        """
+        Verifica que una matriz de índices de respuesta sea compatible con las preguntas
+        
+        Args:
+            answer_indices (np.ndarray): Índices (M, Q') con Q' <= número de preguntas
+        """
+        if self.weight_tensor is None:
+            raise ValueError("No hay preguntas compiladas: llama a compile_questions primero")
+        
+        num_answers = answer_indices.shape[1]
+        
+        if num_answers > len(self.option_counts):
+            raise ValueError(
+                f"Se recibieron {num_answers} respuestas para {len(self.option_counts)} preguntas"
+            )
+        
+        if ((answer_indices < 0) | (answer_indices >= self.option_counts[:num_answers])).any():
+            raise ValueError("Índice de respuesta fuera de rango")
+    
+    def calculate_personality_vectors(self, answer_indices: Sequence[Sequence[int]]) -> np.ndarray:
+        """
+        Calcula vectores de personalidad para muchos conjuntos de respuestas a la vez
+        
+        Args:
+            answer_indices (Sequence[Sequence[int]]): Matriz (M, Q') con el índice de la
+                opción elegida en cada una de las primeras Q' preguntas
+        
+        Returns:
+            np.ndarray: Vectores de personalidad (M, 5)
+        """
+        answer_indices = np.asarray(answer_indices, dtype=np.int64)
+        
+        if answer_indices.ndim != 2:
+            raise ValueError("Se esperaba una matriz (M, preguntas) de índices de respuesta")
+        
+        if answer_indices.shape[1] == 0:
+            return np.full((len(answer_indices), len(self.dimensions)), 2.5)  # Vector neutro
+        
+        self._validate_answer_indices(answer_indices)
+        
+        # Gather de los pesos elegidos y media por dimensión
+        question_indices = np.arange(answer_indices.shape[1])
+        personality_vectors = self.weight_tensor[question_indices, answer_indices].mean(axis=1)
+        
+        personality_vectors *= np.asarray(self.dimension_weights, dtype=np.float64)
+        return np.clip(personality_vectors, 1.0, 5.0)
+    
+    @timed("calculate_personality_vector")
+    def calculate_personality_vector_from_indices(self, answer_indices: Sequence[int]) -> List[float]:
+        """
+        Calcula el vector de personalidad a partir de los índices de las opciones elegidas
+        
+        Args:
+            answer_indices (Sequence[int]): Índice de la opción elegida en cada pregunta, en orden
+        
+        Returns:
+            List[float]: Vector de personalidad de 5 dimensiones
+        """
+        if len(answer_indices) == 0:
+            return [2.5, 2.5, 2.5, 2.5, 2.5]  # Vector neutro
+        
+        return self.calculate_personality_vectors([answer_indices])[0].tolist()
     
+    @timed("calculate_personality_vector")
     def calculate_personality_vector(self, answers: List[Dict[str, Any]]) -> List[float]:
         """
         Calcula el vector de personalidad basado en las respuestas
@@ -150,9 +271,18 @@ class PersonalityProcessor:
         Returns:
             str: Texto con insights de personalidad
         """
-        dominant_traits = self.get_dominant_traits(personality_vector)
-        descriptions = self.get_personality_description(personality_vector)
+        return self._insights_from_traits(self.get_dominant_traits(personality_vector))
+    
+    def _insights_from_traits(self, dominant_traits: List[str]) -> str:
+        """
+        Genera el texto de insights a partir de los rasgos dominantes ya calculados
         
+        Args:
+            dominant_traits (List[str]): Rasgos dominantes (ver ``get_dominant_traits``)
+        
+        Returns:
+            str: Texto con insights de personalidad
+        """
         if not dominant_traits:
             return "Tienes un perfil equilibrado, valorando todos los aspectos por igual al elegir un auto."
         
@@ -172,22 +302,91 @@ class PersonalityProcessor:
         
         return insights
     
+    def _profile_parts(self, personality_vector: List[float]) -> Dict[str, Any]:
+        """
+        Obtiene descripciones, rasgos dominantes e insights de un vector, con caché LRU
+        
+        La clave es el vector redondeado a ``PROFILE_CACHE_DECIMALS`` decimales,
+        así vectores que solo difieren por errores de redondeo comparten entrada.
+        Las partes se calculan sobre ese vector redondeado, de modo que el valor
+        guardado depende solo de la clave y no del vector que la creó primero.
+        
+        Args:
+            personality_vector (List[float]): Vector de personalidad
+        
+        Returns:
+            Dict[str, Any]: Partes derivadas del perfil (compartidas; no modificar)
+        """
+        key = tuple(round(float(score), PROFILE_CACHE_DECIMALS) for score in personality_vector)
+        
+        with self._profile_lock:
+            parts = self._profile_cache.get(key)
+            if parts is not None:
+                self._profile_cache.move_to_end(key)
+                self._profile_counters["hits"] += 1
+                return parts
+            self._profile_counters["misses"] += 1
+        
+        # Cada helper se calcula una sola vez por perfil
+        rounded_vector = list(key)
+        dominant_traits = self.get_dominant_traits(rounded_vector)
+        parts = {
+            "descriptions": self.get_personality_description(rounded_vector),
+            "dominant_traits": dominant_traits,
+            "insights": self._insights_from_traits(dominant_traits),
+        }
+        
+        if self.profile_cache_size > 0:
+            with self._profile_lock:
+                self._profile_cache[key] = parts
+                self._profile_cache.move_to_end(key)
+                
+                while len(self._profile_cache) > self.profile_cache_size:
+                    self._profile_cache.popitem(last=False)
+                    self._profile_counters["evictions"] += 1
+        
+        return parts
+    
     def export_personality_profile(self, personality_vector: List[float]) -> Dict[str, Any]:
         """
         Exporta un perfil completo de personalidad
         
+        Las descripciones, rasgos e insights salen de una caché LRU (ver
+        ``profile_cache_stats``); el resultado es una copia que se puede modificar.
+        
         Args:
             personality_vector (List[float]): Vector de personalidad
             
         Returns:
             Dict[str, Any]: Perfil completo con todas las métricas
         """
+        parts = self._profile_parts(personality_vector)
+        
         return {
             "vector": personality_vector,
-            "descriptions": self.get_personality_description(personality_vector),
-            "dominant_traits": self.get_dominant_traits(personality_vector),
-            "insights": self.generate_personality_insights(personality_vector),
+            "descriptions": dict(parts["descriptions"]),
+            "dominant_traits": list(parts["dominant_traits"]),
+            "insights": parts["insights"],
             "dimensions": {
                 name: score for name, score in zip(self.dimensions, personality_vector)
             }
         }
+    
+    def profile_cache_stats(self) -> Dict[str, int]:
+        """
+        Estadísticas de la caché de perfiles exportados
+        
+        Returns:
+            Dict[str, int]: Aciertos, fallos, desalojos, entradas y capacidad
+        """
+        with self._profile_lock:
+            stats = dict(self._profile_counters)
+            stats["entries"] = len(self._profile_cache)
+            stats["capacity"] = self.profile_cache_size
+        
+        return stats
+    
+    def clear_profile_cache(self) -> None:
+        """Vacía la caché de perfiles exportados (las estadísticas se conservan)"""
+        with self._profile_lock:
+            self._profile_cache.clear()
@@ -0,0 +1,334 @@
+"""
+Representación compacta de autos y recomendaciones para Auto Personality App
+
+``CarRecord`` guarda los campos de un auto en slots (sin ``__dict__``) y toma su
+vector de la matriz del matcher; ``Recommendation`` y ``SimilarCar`` guardan el
+auto y su porcentaje. Los tres se comportan como diccionarios de solo lectura
+(``record['brand']``, ``record.get('type', 'Vehículo')``, ``dict(record)``),
+así el código escrito para los diccionarios de ``cars.json`` sigue funcionando.
+"""
+
+import abc
+import numpy as np
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Campos con slot propio, en el orden en que se exportan
+CAR_FIELDS = ('id', 'brand', 'model', 'type', 'year', 'vector',
+              'description', 'emoji', 'image', 'features', 'price_range')
+
+_FIELD_BITS = {field: 1 << position for position, field in enumerate(CAR_FIELDS)}
+_SLOT_FIELDS = tuple(field for field in CAR_FIELDS if field != 'vector')
+
+_FIELD_NAMES = frozenset(CAR_FIELDS)
+
+
+class CarRecord(Mapping):
+    """
+    Auto del catálogo con acceso por atributo (``car.brand``) o por clave
+    
+    Los campos ausentes valen None como atributo y no aparecen como claves,
+    igual que en el diccionario original. Los campos desconocidos se conservan
+    aparte y solo son accesibles por clave. El vector se lee de la matriz la
+    primera vez que se pide y queda guardado en el registro.
+    """
+    
+    __slots__ = _SLOT_FIELDS + ('_vectors', '_index', '_vector', '_present', '_extra')
+    
+    def __init__(self, fields: Mapping, vectors: np.ndarray, index: int):
+        """
+        Crea un registro a partir de los campos de un auto
+        
+        Args:
+            fields (Mapping): Campos del auto (por ejemplo, un diccionario de ``cars.json``)
+            vectors (np.ndarray): Matriz (N, 5) de vectores del catálogo
+            index (int): Fila del auto en ``vectors``
+        """
+        present = _FIELD_BITS['vector']
+        extra: Optional[Dict[str, Any]] = None
+        
+        for field in _SLOT_FIELDS:
+            setattr(self, field, None)
+        
+        for key, value in fields.items():
+            bit = _FIELD_BITS.get(key)
+            if bit is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif key != 'vector':
+                setattr(self, key, value)
+                present |= bit
+        
+        self._vectors = vectors
+        self._index = index
+        self._vector = None
+        self._present = present
+        self._extra = extra
+    
+    @property
+    def vector(self) -> list:
+        """Vector de personalidad del auto, leído de la matriz del catálogo"""
+        vector = self._vector
+        if vector is None:
+            # Los valores enteros se devuelven como int, igual que en cars.json
+            vector = [int(x) if x.is_integer() else x for x in self._vectors[self._index].tolist()]
+            self._vector = vector
+        return vector
+    
+    # Lectura directa del slot; los bits de presencia solo se consultan si el
+    # slot vale None, así los campos ausentes no pasan por excepciones
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_NAMES:
+            value = getattr(self, key)
+            if value is not None or self._present & _FIELD_BITS[key]:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_NAMES:
+            value = getattr(self, key)
+            if value is None and not self._present & _FIELD_BITS[key]:
+                return default
+            return value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+    
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_NAMES:
+            return bool(self._present & _FIELD_BITS[key])
+        return self._extra is not None and key in self._extra
+    
+    def __iter__(self) -> Iterator[str]:
+        for field in CAR_FIELDS:
+            if self._present & _FIELD_BITS[field]:
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return bin(self._present).count("1") + (len(self._extra) if self._extra is not None else 0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte el registro en un diccionario (por ejemplo, para JSON)
+        
+        Returns:
+            Dict[str, Any]: Campos presentes del auto
+        """
+        return {key: self[key] for key in self}
+    
+    def __repr__(self) -> str:
+        return f"CarRecord({self.to_dict()!r})"
+
+
+class _ScoredCar(Mapping):
+    """Auto con un porcentaje de coincidencia; base de los tipos de resultado"""
+    
+    __slots__ = ('car', 'percentage')
+    
+    # Claves de la vista de diccionario, definidas por cada subclase
+    _KEYS: tuple = ()
+    
+    def __init__(self, car: CarRecord, percentage: float):
+        self.car = car
+        self.percentage = percentage
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte el resultado en un diccionario con el auto también convertido
+        
+        Returns:
+            Dict[str, Any]: Resultado listo para serializar a JSON
+        """
+        result = dict(self)
+        result['car'] = self.car.to_dict() if isinstance(self.car, CarRecord) else dict(self.car)
+        return result
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.car.get('id')!r}, {self.percentage:.2f})"
+
+
+class Recommendation(_ScoredCar):
+    """Resultado de ``find_best_matches``: auto, porcentaje y score normalizado"""
+    
+    __slots__ = ()
+    _KEYS = ('car', 'match_percentage', 'match_score')
+    
+    @property
+    def match_percentage(self) -> float:
+        """Score de match como porcentaje (0-100)"""
+        return self.percentage
+    
+    @property
+    def match_score(self) -> float:
+        """Score de match normalizado (0-1)"""
+        return self.percentage / 100.0
+
+
+class SimilarCar(_ScoredCar):
+    """Resultado de ``recommend_similar_cars``: auto y similitud con el de referencia"""
+    
+    __slots__ = ()
+    _KEYS = ('car', 'similarity_percentage', 'similarity_score')
+    
+    @property
+    def similarity_percentage(self) -> float:
+        """Similitud como porcentaje (0-100)"""
+        return self.percentage
+    
+    @property
+    def similarity_score(self) -> float:
+        """Similitud normalizada (0-1)"""
+        return self.percentage / 100.0
+
+
+class ColumnarCars(Sequence, abc.ABC):
+    """
+    Catálogo de autos ya validados, organizado por columnas
+    
+    El matcher lee estas columnas directamente, sin recorrer los autos como
+    diccionarios. Al acceder por índice se obtiene un ``CarRecord``. Las
+    subclases deben implementar ``vectors``, ``categories`` y ``years`` (además
+    de ``__len__`` y ``__getitem__``) para poder instanciarse.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    @abc.abstractmethod
+    def vectors(self) -> np.ndarray:
+        """Matriz (N, 5) de vectores"""
+    
+    @abc.abstractmethod
+    def categories(self, field: str) -> Tuple[List[Any], np.ndarray]:
+        """
+        Codifica un campo de todos los autos como categorías
+        
+        Args:
+            field (str): Nombre del campo
+        
+        Returns:
+            Tuple[List[Any], np.ndarray]: Valores distintos (None si falta) y el
+            código de cada auto (N,) como posición en esa lista
+        """
+    
+    def column(self, field: str) -> List[Any]:
+        """
+        Obtiene un campo de todos los autos
+        
+        Args:
+            field (str): Nombre del campo
+        
+        Returns:
+            List[Any]: Valor de cada auto, o None si no lo tiene
+        """
+        values, codes = self.categories(field)
+        return [values[code] for code in codes.tolist()]
+    
+    @abc.abstractmethod
+    def years(self, missing: int) -> np.ndarray:
+        """
+        Columna de años
+        
+        Args:
+            missing (int): Valor para autos sin año entero
+        
+        Returns:
+            np.ndarray: Años (N,) int32
+        """
+
+
+class CarTable(ColumnarCars):
+    """Registros en memoria junto con la matriz de sus vectores, en el mismo orden"""
+    
+    __slots__ = ('records', '_vectors')
+    
+    def __init__(self, records: List[CarRecord], vectors: np.ndarray):
+        """
+        Inicializa la tabla
+        
+        Args:
+            records (List[CarRecord]): Registros; el de la posición ``i`` tiene el vector ``vectors[i]``
+            vectors (np.ndarray): Matriz (N, 5) de vectores
+        """
+        self.records = records
+        self._vectors = vectors
+    
+    @classmethod
+    def from_records(cls, records: List[CarRecord], vectors: np.ndarray) -> "CarTable":
+        """
+        Arma una tabla haciendo que cada registro lea su vector de ``vectors``
+        
+        Sirve cuando los registros se crearon sobre otra matriz (por ejemplo,
+        una que crecía durante la ingesta) y ``vectors`` tiene los mismos
+        valores en el mismo orden.
+        
+        Args:
+            records (List[CarRecord]): Registros; el de la posición ``i`` pasa a leer ``vectors[i]``
+            vectors (np.ndarray): Matriz (N, 5) definitiva
+        
+        Returns:
+            CarTable: Tabla sobre ``vectors``
+        """
+        for index, record in enumerate(records):
+            record._vectors = vectors
+            record._index = index
+        return cls(records, vectors)
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors
+    
+    def categories(self, field: str) -> Tuple[List[Any], np.ndarray]:
+        value_codes: Dict[Any, int] = {}
+        values: List[Any] = []
+        codes = np.empty(len(self.records), dtype=np.intp)
+        
+        for index, record in enumerate(self.records):
+            value = record.get(field)
+            try:
+                code = value_codes.get(value)
+            except TypeError:
+                code = None  # Valor no hashable: categoría propia
+            if code is None:
+                code = len(values)
+                values.append(value)
+                try:
+                    value_codes[value] = code
+                except TypeError:
+                    pass
+            codes[index] = code
+        
+        return values, codes
+    
+    def column(self, field: str) -> List[Any]:
+        return [record.get(field) for record in self.records]
+    
+    def years(self, missing: int) -> np.ndarray:
+        return np.array(
+            [record.year if isinstance(record.year, int) else missing
+             for record in self.records],
+            dtype=np.int32
+        )
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index):
+        return self.records[index]
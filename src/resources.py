@@ -0,0 +1,131 @@
+"""
+Caché de recursos compartidos por todas las sesiones de Auto Personality App
+
+No depende de Streamlit: la usan también el servicio HTTP y los procesos batch.
+Los errores de carga se registran con ``logging``.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from answer_table import AnswerTable, load_answer_table
+from catalog import COMPILED_EXTENSION
+from ingest import ingest_json_lines
+from matcher import AutoMatcher
+from personality import PersonalityProcessor
+from loaders import DataFormatError, DataLoadError, load_json_file, resolve_data_path
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS_PATH = "data/questions.json"
+CARS_PATH = "data/cars.json"
+
+# Extensiones de feeds que se cargan por streaming
+JSON_LINES_EXTENSIONS = (".jsonl", ".jsonl.gz")
+
+
+class AppResources(NamedTuple):
+    """
+    Datos parseados y objetos listos para usar, compartidos entre sesiones
+    
+    Son de solo lectura: ninguna sesión debe modificarlos.
+    """
+    questions_data: Dict[str, Any]
+    cars_data: Dict[str, Any]
+    matcher: AutoMatcher
+    processor: PersonalityProcessor
+    answer_table: Optional[AnswerTable]
+
+
+# Versión de archivos y recursos cargados, por par de rutas
+_cache: Dict[Tuple[str, str], Tuple[Tuple[Any, ...], AppResources]] = {}
+_lock = threading.Lock()
+
+
+def _file_version(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Obtiene la versión de un archivo como (mtime en ns, tamaño)
+    
+    Args:
+        file_path (str): Ruta relativa a la raíz del proyecto
+    
+    Returns:
+        Optional[Tuple[int, int]]: Versión del archivo o None si no existe
+    """
+    try:
+        stat = resolve_data_path(file_path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_app_resources(questions_path: str = QUESTIONS_PATH,
+                      cars_path: str = CARS_PATH) -> Optional[AppResources]:
+    """
+    Obtiene los recursos de la app, cargándolos solo si los archivos cambiaron
+    
+    La primera llamada (o la primera tras modificar un archivo) lee y valida los
+    JSON, construye el matcher y abre la tabla de respuestas; el resto reutiliza
+    la misma instancia en todo el proceso.
+    
+    Args:
+        questions_path (str): Ruta al archivo de preguntas
+        cars_path (str): Ruta al archivo de autos (JSON, JSON Lines o catálogo
+            compilado ``.catalog``)
+    
+    Returns:
+        Optional[AppResources]: Recursos compartidos o None si no se pudieron cargar
+    """
+    key = (questions_path, cars_path)
+    version = (_file_version(questions_path), _file_version(cars_path))
+    
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    with _lock:
+        # Otra sesión pudo haber recargado mientras esperábamos el lock
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        try:
+            questions_data = load_json_file(questions_path)
+            if not questions_data:
+                raise DataFormatError(f"Archivo de preguntas vacío: {questions_path}", questions_path)
+            
+            if cars_path.endswith(COMPILED_EXTENSION):
+                # Catálogo compilado: vectores mapeados en memoria, compartidos entre procesos
+                matcher = AutoMatcher.from_compiled_catalog(str(resolve_data_path(cars_path)))
+            elif cars_path.endswith(JSON_LINES_EXTENSIONS):
+                # Feed JSON Lines: validado y cargado en columnas línea por línea
+                cars, report = ingest_json_lines(resolve_data_path(cars_path))
+                if report.rejected:
+                    logger.warning("Autos rechazados al cargar %s:\n%s", cars_path, report.summary())
+                matcher = AutoMatcher({'cars': cars})
+            else:
+                matcher = AutoMatcher(load_json_file(cars_path))
+        except DataLoadError as e:
+            logger.error("No se pudieron cargar los datos: %s", e.message)
+            return None
+        except (OSError, ValueError) as e:
+            logger.error("No se pudo cargar el catálogo %s: %s", cars_path, e)
+            return None
+        
+        # Autos como registros compactos; los diccionarios del JSON se liberan
+        cars_data = matcher.cars_data
+        
+        processor = PersonalityProcessor(questions_data)
+        
+        resources = AppResources(
+            questions_data=questions_data,
+            cars_data=cars_data,
+            matcher=matcher,
+            processor=processor,
+            # Tabla precalculada de respuestas, si existe y está al día
+            answer_table=load_answer_table(processor, matcher)
+        )
+        _cache[key] = (version, resources)
+    
+    return resources
@@ -0,0 +1,356 @@
+"""
+Servicio HTTP de recomendaciones (sin interfaz) para Auto Personality App
+
+Expone el mismo motor que la app de Streamlit para integraciones externas:
+    
+    GET  /health      Estado del servicio y tamaño del catálogo
+    GET  /metrics     Tiempos por etapa y contadores del proceso (formato Prometheus)
+    POST /recommend   {"answers": [0, 3, 1, ...]} o {"vector": [5 números]}, "top_n" opcional
+
+Cada proceso carga el catálogo una sola vez (ver ``resources.get_app_resources``).
+Con un catálogo compilado (``--cars data/cars.catalog``), los workers comparten
+las páginas del archivo mapeado en memoria. Las consultas que no resuelve la
+tabla de respuestas se agrupan en lotes (ver ``batching.py``); con
+``--max-batch 1`` cada una se calcula por separado. Las métricas se registran
+salvo con ``--no-metrics``; cada worker reporta las suyas.
+
+Uso:
+    python src/service.py [--host 127.0.0.1] [--port 8000] [--workers 1] [--cars data/cars.json]
+                          [--batch-window-ms 0] [--max-batch 256] [--no-metrics]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import signal
+import socket
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from answer_table import precomputed_recommendations
+from batching import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY, MicroBatcher
+from matcher import AutoMatcher
+from metrics import enable, increment, is_enabled, render_prometheus, timer
+from records import Recommendation
+from resources import CARS_PATH, AppResources, get_app_resources
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_TOP_N = 20
+
+# Catálogo que sirve el proceso (JSON o compilado) y ventana de agrupación, fijados por ``main``
+cars_path = CARS_PATH
+batch_window = 0.0
+max_batch = DEFAULT_MAX_BATCH
+
+# Agrupador del matcher actual del proceso (se recrea si el catálogo se recarga)
+_batcher: Optional[MicroBatcher] = None
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class RequestError(Exception):
+    """Error de la petición que se devuelve al cliente con su código HTTP"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def find_best_matches(matcher: AutoMatcher, personality_vector: List[float],
+                            top_n: int) -> List[Recommendation]:
+    """
+    Calcula las recomendaciones de un vector, agrupándolo con otras peticiones
+    
+    Args:
+        matcher (AutoMatcher): Matcher del catálogo
+        personality_vector (List[float]): Vector de personalidad
+        top_n (int): Número de recomendaciones
+    
+    Returns:
+        List[Recommendation]: Recomendaciones ordenadas por score
+    """
+    global _batcher
+    
+    if max_batch <= 1:
+        return matcher.find_best_matches(personality_vector, top_n=top_n)
+    
+    if _batcher is None or _batcher.matcher is not matcher:
+        _batcher = MicroBatcher(matcher, max_delay=batch_window, max_batch=max_batch)
+    
+    return await _batcher.find_best_matches(personality_vector, top_n)
+
+
+async def recommend(resources: AppResources, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calcula el vector de personalidad y las recomendaciones para una petición
+    
+    Args:
+        resources (AppResources): Recursos cargados del proceso
+        payload (Dict[str, Any]): Cuerpo JSON con ``answers`` o ``vector``
+    
+    Returns:
+        Dict[str, Any]: Vector de personalidad y recomendaciones
+    """
+    top_n = payload.get('top_n', 3)
+    if not isinstance(top_n, int) or isinstance(top_n, bool) or not 1 <= top_n <= MAX_TOP_N:
+        raise RequestError(400, f"'top_n' debe ser un entero entre 1 y {MAX_TOP_N}")
+    
+    if 'answers' in payload:
+        answers = payload['answers']
+        if (not isinstance(answers, list)
+                or not all(isinstance(x, int) and not isinstance(x, bool) for x in answers)):
+            raise RequestError(400, "'answers' debe ser una lista de índices")
+        result = precomputed_recommendations(resources.matcher, answers, top_n, resources.answer_table)
+        if result is not None:
+            personality_vector, recommendations = result
+        else:
+            try:
+                personality_vector = resources.processor.calculate_personality_vector_from_indices(answers)
+            except ValueError as e:
+                raise RequestError(400, str(e))
+            recommendations = await find_best_matches(resources.matcher, personality_vector, top_n)
+    elif 'vector' in payload:
+        personality_vector = payload['vector']
+        if (not isinstance(personality_vector, list) or len(personality_vector) != 5
+                or not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in personality_vector)):
+            raise RequestError(400, "'vector' debe ser una lista de 5 números")
+        # json.loads acepta NaN e Infinity, que no tienen score ni se pueden devolver como JSON
+        if not all(math.isfinite(x) for x in personality_vector):
+            raise RequestError(400, "'vector' solo admite números finitos")
+        recommendations = await find_best_matches(resources.matcher, personality_vector, top_n)
+    else:
+        raise RequestError(400, "Se requiere 'answers' o 'vector'")
+    
+    return {
+        "vector": [float(x) for x in personality_vector],
+        "recommendations": [rec.to_dict() for rec in recommendations],
+    }
+
+
+def metrics_text(resources: AppResources) -> str:
+    """
+    Métricas del proceso en formato Prometheus, con el estado del catálogo y del agrupador
+    
+    Args:
+        resources (AppResources): Recursos cargados del proceso
+    
+    Returns:
+        str: Cuerpo de la respuesta de ``/metrics``
+    """
+    gauges = {
+        "catalog_cars": len(resources.matcher.cars),
+        "catalog_version": resources.matcher.catalog_version,
+    }
+    
+    if _batcher is not None:
+        for name, value in _batcher.stats().items():
+            gauges[f"batcher_{name}"] = value
+    
+    return render_prometheus(gauges)
+
+
+async def handle_request(method: str, path: str, body: bytes) -> Tuple[int, Union[Dict[str, Any], str]]:
+    """
+    Enruta una petición y devuelve el código HTTP y el cuerpo
+    
+    Args:
+        method (str): Método HTTP
+        path (str): Ruta solicitada (sin query string)
+        body (bytes): Cuerpo de la petición
+    
+    Returns:
+        Tuple[int, Union[Dict[str, Any], str]]: Código HTTP y respuesta (JSON, o
+        texto plano para ``/metrics``)
+    """
+    try:
+        if len(body) > MAX_BODY_BYTES:
+            raise RequestError(413, "Cuerpo demasiado grande")
+        
+        resources = get_app_resources(cars_path=cars_path)
+        if resources is None:
+            raise RequestError(503, "No se pudieron cargar los datos")
+        
+        if path == "/health":
+            if method != "GET":
+                raise RequestError(405, "Usa GET")
+            return 200, {"status": "ok", "cars": len(resources.matcher.cars)}
+        
+        if path == "/metrics":
+            if method != "GET":
+                raise RequestError(405, "Usa GET")
+            if not is_enabled():
+                raise RequestError(404, "Métricas desactivadas (--no-metrics)")
+            return 200, metrics_text(resources)
+        
+        if path == "/recommend":
+            if method != "POST":
+                raise RequestError(405, "Usa POST")
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise RequestError(400, "El cuerpo debe ser JSON válido")
+            if not isinstance(payload, dict):
+                raise RequestError(400, "El cuerpo debe ser un objeto JSON")
+            return 200, await recommend(resources, payload)
+        
+        raise RequestError(404, f"Ruta no encontrada: {path}")
+    
+    except RequestError as e:
+        return e.status, {"error": e.message}
+    except Exception as e:
+        return 500, {"error": f"Error inesperado: {str(e)}"}
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Atiende una conexión HTTP/1.1 con soporte de keep-alive
+    
+    Args:
+        reader (asyncio.StreamReader): Flujo de entrada
+        writer (asyncio.StreamWriter): Flujo de salida
+    """
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                return
+            
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                return
+            
+            if length > MAX_BODY_BYTES:
+                status, response = 413, {"error": "Cuerpo demasiado grande"}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                with timer("http_request"):
+                    status, response = await handle_request(method, target.split("?", 1)[0], body)
+                increment(f"http_{status}")
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+            
+            if isinstance(response, str):
+                payload = response.encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                try:
+                    # Sin NaN/Infinity: no son JSON válido para los clientes
+                    payload = json.dumps(response, ensure_ascii=False, allow_nan=False).encode("utf-8")
+                except ValueError:
+                    status = 500
+                    payload = json.dumps({"error": "Respuesta con valores no finitos"}).encode("utf-8")
+                content_type = "application/json; charset=utf-8"
+            
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                + payload
+            )
+            await writer.drain()
+            
+            if not keep_alive:
+                return
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, sock: Optional[socket.socket] = None) -> None:
+    """
+    Ejecuta el servidor hasta que se cancele
+    
+    Args:
+        host (str): Interfaz de escucha
+        port (int): Puerto de escucha
+        sock (Optional[socket.socket]): Socket ya abierto (compartido entre procesos)
+    """
+    # Cargar el catálogo antes de aceptar conexiones
+    get_app_resources(cars_path=cars_path)
+    
+    if sock is not None:
+        server = await asyncio.start_server(handle_connection, sock=sock)
+    else:
+        server = await asyncio.start_server(handle_connection, host, port)
+    
+    async with server:
+        await server.serve_forever()
+
+
+def run_worker(sock: socket.socket) -> None:
+    """Punto de entrada de cada proceso worker"""
+    try:
+        asyncio.run(serve("", 0, sock=sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servicio HTTP de recomendaciones")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Procesos que comparten el puerto")
+    parser.add_argument("--cars", default=CARS_PATH, help="Catálogo JSON o compilado (.catalog)")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help=f"Espera máxima para agrupar consultas; 0 junta solo las ya "
+                             f"recibidas, sin agregar latencia (p. ej. {DEFAULT_MAX_DELAY * 1000:g})")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Consultas que cierran un lote sin esperar la ventana (1 desactiva la agrupación)")
+    parser.add_argument("--no-metrics", action="store_true", help="No registrar tiempos ni contadores")
+    args = parser.parse_args()
+    
+    global cars_path, batch_window, max_batch
+    cars_path = args.cars
+    batch_window = args.batch_window_ms / 1000
+    max_batch = args.max_batch
+    enable(not args.no_metrics)
+    
+    # Un único socket heredado por todos los workers
+    sock = socket.create_server((args.host, args.port), reuse_port=False)
+    sock.setblocking(False)
+    print(f"🚗 Servicio de recomendaciones en http://{args.host}:{args.port} ({args.workers} worker(s))")
+    
+    if args.workers <= 1:
+        run_worker(sock)
+        return
+    
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=run_worker, args=(sock,)) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    
+    # SIGTERM detiene al proceso principal igual que Ctrl+C, llevándose a los workers
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
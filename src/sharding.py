@@ -0,0 +1,273 @@
+"""
+Matcher por shards en varios procesos para Auto Personality App
+
+Con catálogos muy grandes, una consulta top-N recorre todos los vectores en un
+solo núcleo. ``ShardedMatcher`` copia la matriz de vectores a un bloque de
+memoria compartida y reparte rangos contiguos entre procesos worker: cada uno
+calcula el top-N local de su rango y el coordinador los combina con un heap.
+Los scores se calculan con las mismas funciones que ``AutoMatcher``, así los
+resultados (incluido el desempate por orden de catálogo) son idénticos.
+
+Ver ``benchmarks/bench_sharding.py`` para la latencia y el throughput según el
+número de workers.
+"""
+
+import heapq
+import multiprocessing
+import os
+import threading
+import weakref
+import numpy as np
+from itertools import islice
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+from matcher import AutoMatcher, CatalogSnapshot, top_matches_batch
+from records import Recommendation
+
+# Los workers solo se adjuntan a la memoria compartida: no necesitan heredar
+# el proceso padre (ni sus hilos, por ejemplo los de Streamlit)
+DEFAULT_START_METHOD = "spawn"
+
+
+def _worker_main(connection: Connection, shm_name: str, shape: Tuple[int, int],
+                 start: int, stop: int) -> None:
+    """
+    Bucle de un worker: responde el top-N de su shard para cada lote recibido
+    
+    Args:
+        connection (Connection): Extremo del pipe con el coordinador
+        shm_name (str): Nombre del bloque de memoria compartida
+        shape (Tuple[int, int]): Forma (N, 5) de la matriz completa
+        start (int): Primer auto del shard
+        stop (int): Fin (exclusivo) del shard
+    """
+    shm = SharedMemory(name=shm_name)
+    vectors = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[start:stop]
+    
+    try:
+        # Avisar al coordinador que el shard está listo
+        connection.send(True)
+        
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                break
+            
+            if message is None:
+                break
+            
+            user_matrix, top_n = message
+            indices, scores = top_matches_batch(vectors, user_matrix, top_n)
+            connection.send((indices + start, scores))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Soltar la vista antes de cerrar: el buffer no se puede liberar con vistas vivas
+        del vectors
+        shm.close()
+        connection.close()
+
+
+def _shutdown(processes: List[multiprocessing.Process], connections: List[Connection],
+              shm: SharedMemory) -> None:
+    """Detiene los workers y libera la memoria compartida"""
+    for connection in connections:
+        try:
+            connection.send(None)
+        except (OSError, ValueError):
+            pass
+    
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    
+    for connection in connections:
+        connection.close()
+    
+    shm.close()
+    shm.unlink()
+
+
+def _merge_row(shard_indices: List[np.ndarray], shard_scores: List[np.ndarray],
+               top_n: int) -> Tuple[List[int], List[float]]:
+    """
+    Combina los top-N locales de una consulta en el top-N global
+    
+    Cada lista local viene ordenada por score descendente y, en empates, por
+    índice ascendente; el heap conserva ese orden entre shards.
+    
+    Args:
+        shard_indices (List[np.ndarray]): Índices globales de cada shard
+        shard_scores (List[np.ndarray]): Scores de cada shard
+        top_n (int): Número de autos a retornar
+    
+    Returns:
+        Tuple[List[int], List[float]]: Índices y scores del top-N global
+    """
+    merged = heapq.merge(
+        *(zip((-scores).tolist(), indices.tolist()) for indices, scores in zip(shard_indices, shard_scores))
+    )
+    best = list(islice(merged, top_n))
+    return [index for _, index in best], [-score for score, _ in best]
+
+
+class ShardedMatcher:
+    """
+    Búsqueda top-N sobre un catálogo repartido entre procesos worker
+    
+    Trabaja sobre el snapshot del matcher vigente al crearlo; tras actualizar
+    el catálogo (``add_cars``, etc.) hay que crear uno nuevo. No aplica
+    filtros: con filtros el catálogo candidato ya es chico y conviene usar
+    ``AutoMatcher.find_best_matches``.
+    """
+    
+    def __init__(self, matcher: AutoMatcher, num_workers: Optional[int] = None,
+                 start_method: str = DEFAULT_START_METHOD):
+        """
+        Copia los vectores a memoria compartida y arranca los workers
+        
+        Args:
+            matcher (AutoMatcher): Matcher con el catálogo a repartir
+            num_workers (Optional[int]): Procesos worker (por defecto, uno por núcleo)
+            start_method (str): Método de inicio de ``multiprocessing``
+        """
+        self.snapshot: CatalogSnapshot = matcher.snapshot
+        car_vectors = self.snapshot.reference_vectors
+        num_cars = len(car_vectors)
+        
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_cars))
+        self.shard_bounds = [num_cars * shard // num_workers for shard in range(num_workers + 1)]
+        
+        self._shm = SharedMemory(create=True, size=max(car_vectors.nbytes, 1))
+        shared = np.ndarray(car_vectors.shape, dtype=np.float64, buffer=self._shm.buf)
+        shared[:] = car_vectors
+        del shared
+        
+        context = multiprocessing.get_context(start_method)
+        self._connections: List[Connection] = []
+        self._processes: List[multiprocessing.Process] = []
+        
+        # Registrar la limpieza antes de arrancar: si un worker falla al iniciar,
+        # la memoria compartida se libera igual
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, self._connections, self._shm)
+        
+        for start, stop in zip(self.shard_bounds, self.shard_bounds[1:]):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(child_end, self._shm.name, car_vectors.shape, start, stop),
+                daemon=True,
+            )
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+        
+        # Esperar a que todos los workers se adjunten a la memoria compartida
+        for connection in self._connections:
+            try:
+                connection.recv()
+            except EOFError:
+                self.close()
+                raise RuntimeError("No se pudo iniciar un worker del matcher por shards")
+        
+        # Cada consulta usa todos los pipes: una a la vez
+        self._lock = threading.Lock()
+    
+    @property
+    def num_workers(self) -> int:
+        """Número de procesos worker"""
+        return len(self._processes)
+    
+    def _query(self, user_matrix: np.ndarray, top_n: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Envía un lote a todos los workers y recoge sus top-N locales
+        
+        Args:
+            user_matrix (np.ndarray): Matriz (M, 5) float64 de vectores
+            top_n (int): Autos por consulta
+        
+        Returns:
+            Tuple[List[np.ndarray], List[np.ndarray]]: Índices y scores (M, n) de cada shard
+        """
+        if not self._finalizer.alive:
+            raise RuntimeError("El matcher por shards está cerrado")
+        
+        with self._lock:
+            for connection in self._connections:
+                connection.send((user_matrix, top_n))
+            
+            try:
+                results = [connection.recv() for connection in self._connections]
+            except EOFError:
+                raise RuntimeError("Un worker del matcher por shards terminó inesperadamente")
+        
+        return [indices for indices, _ in results], [scores for _, scores in results]
+    
+    def find_best_matches_batch(self, user_matrix: np.ndarray,
+                                top_n: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encuentra los mejores matches para muchos usuarios
+        
+        Args:
+            user_matrix (np.ndarray): Matriz (M, 5) de vectores de personalidad
+            top_n (int): Número de recomendaciones por usuario
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices en ``snapshot.cars`` (M, top_n) y
+            scores (M, top_n), iguales a los de ``AutoMatcher.find_best_matches_batch``
+        """
+        user_matrix = np.asarray(user_matrix, dtype=np.float64)
+        num_dimensions = self.snapshot.reference_vectors.shape[1]
+        
+        if user_matrix.ndim != 2 or user_matrix.shape[1] != num_dimensions:
+            raise ValueError(f"Se esperaba una matriz (M, {num_dimensions}), se recibió {user_matrix.shape}")
+        
+        top_n = max(0, min(top_n, len(self.snapshot.reference_vectors)))
+        shard_indices, shard_scores = self._query(user_matrix, top_n)
+        
+        indices = np.empty((len(user_matrix), top_n), dtype=np.intp)
+        scores = np.empty((len(user_matrix), top_n), dtype=np.float64)
+        
+        for row in range(len(user_matrix)):
+            indices[row], scores[row] = _merge_row(
+                [shard[row] for shard in shard_indices], [shard[row] for shard in shard_scores], top_n
+            )
+        
+        return indices, scores
+    
+    def find_best_matches(self, user_vector: List[float], top_n: int = 3,
+                          min_match: float = 0.0) -> List[Recommendation]:
+        """
+        Encuentra los mejores matches para un usuario
+        
+        Args:
+            user_vector (List[float]): Vector de personalidad del usuario
+            top_n (int): Número de recomendaciones a retornar
+            min_match (float): Score mínimo de match requerido
+        
+        Returns:
+            List[Recommendation]: Recomendaciones ordenadas por score, como las de
+            ``AutoMatcher.find_best_matches``
+        """
+        indices, scores = self.find_best_matches_batch(np.asarray([user_vector], dtype=np.float64), top_n)
+        
+        return [
+            Recommendation(self.snapshot.cars[index], match_score)
+            for index, match_score in zip(indices[0].tolist(), scores[0].tolist())
+            if match_score >= min_match
+        ]
+    
+    def close(self) -> None:
+        """Detiene los workers y libera la memoria compartida"""
+        self._finalizer()
+    
+    def __enter__(self) -> "ShardedMatcher":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,152 @@
+"""
+Tabla precalculada de autos similares para Auto Personality App
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def catalog_fingerprint(ids: List[str], car_vectors: np.ndarray) -> str:
+    """
+    Calcula una huella del catálogo a partir de los IDs y vectores de los autos
+    
+    Cualquier cambio en el orden, los IDs o los vectores produce una huella
+    distinta, lo que invalida las tablas guardadas en disco.
+    
+    Args:
+        ids (List[str]): IDs de los autos en orden de catálogo
+        car_vectors (np.ndarray): Matriz (N, 5) de vectores
+    
+    Returns:
+        str: Huella hexadecimal SHA-256
+    """
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(str(car_id) for car_id in ids).encode("utf-8"))
+    digest.update(np.ascontiguousarray(car_vectors, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def similarity_cache_path(catalog_path: str) -> Path:
+    """
+    Ruta de la tabla de similitud junto al archivo de catálogo
+    
+    Args:
+        catalog_path (str): Ruta al catálogo (por ejemplo ``data/cars.json``)
+    
+    Returns:
+        Path: Ruta ``<catálogo>.similarity.npz`` en el mismo directorio
+    """
+    path = Path(catalog_path)
+    return path.with_name(f"{path.stem}.similarity.npz")
+
+
+class SimilarityTable:
+    """
+    Vecinos top-K precalculados para cada auto del catálogo
+    
+    La fila ``i`` contiene los índices (en orden de catálogo) de los K autos más
+    similares al auto ``i`` y sus porcentajes de similitud. Las posiciones
+    vacías, en catálogos con menos de K+1 autos, se marcan con -1.
+    """
+    
+    def __init__(self, ids: List[str], neighbors: np.ndarray, scores: np.ndarray, fingerprint: str):
+        """
+        Inicializa la tabla
+        
+        Args:
+            ids (List[str]): IDs de los autos en orden de catálogo
+            neighbors (np.ndarray): Índices de vecinos (N, K)
+            scores (np.ndarray): Porcentajes de similitud (N, K)
+            fingerprint (str): Huella del catálogo con el que se construyó
+        """
+        self.ids = list(ids)
+        self.neighbors = neighbors
+        self.scores = scores
+        self.fingerprint = fingerprint
+        
+        # La primera aparición de cada ID es la que usa get_car_by_id
+        self._rows: Dict[str, int] = {}
+        for row, car_id in enumerate(self.ids):
+            self._rows.setdefault(car_id, row)
+    
+    @property
+    def top_k(self) -> int:
+        """Número de vecinos guardados por auto"""
+        return self.neighbors.shape[1]
+    
+    def lookup(self, car_id: str, top_n: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Obtiene los vecinos de un auto en O(K)
+        
+        Args:
+            car_id (str): ID del auto de referencia
+            top_n (int): Número de vecinos (como máximo ``top_k``)
+        
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: Índices y porcentajes de los
+            vecinos, o None si el ID no está en la tabla
+        """
+        row = self._rows.get(car_id)
+        
+        if row is None:
+            return None
+        
+        neighbors = self.neighbors[row, :top_n]
+        valid = neighbors >= 0
+        return neighbors[valid], self.scores[row, :top_n][valid]
+    
+    def save(self, path: str) -> None:
+        """
+        Guarda la tabla en disco de forma atómica
+        
+        Los IDs se guardan como JSON para conservar su tipo (por ejemplo, IDs
+        enteros de ``cars.json``); un arreglo de texto los convertiría en ``str``.
+        
+        Args:
+            path (str): Ruta del archivo ``.npz``
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        
+        with open(tmp_path, "wb") as file:
+            np.savez(
+                file,
+                ids_json=np.array(json.dumps(self.ids, ensure_ascii=False)),
+                neighbors=self.neighbors,
+                scores=self.scores,
+                fingerprint=np.array(self.fingerprint),
+            )
+        
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional["SimilarityTable"]:
+        """
+        Carga una tabla guardada con ``save``
+        
+        Args:
+            path (str): Ruta del archivo ``.npz``
+        
+        Returns:
+            Optional[SimilarityTable]: La tabla, o None si no existe o está dañada
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                # Las tablas anteriores guardaban los IDs como texto
+                if "ids_json" in data.files:
+                    ids = json.loads(str(data["ids_json"]))
+                else:
+                    ids = data["ids"].tolist()
+                
+                return cls(
+                    ids=ids,
+                    neighbors=data["neighbors"],
+                    scores=data["scores"],
+                    fingerprint=str(data["fingerprint"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
@@ -0,0 +1,226 @@
+"""
+Índice espacial (KD-tree) para búsqueda exacta de vecinos cercanos en Auto Personality App
+"""
+
+import heapq
+import numpy as np
+from typing import List, Tuple
+
+
+def squared_distances(points: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Calcula la distancia euclidiana al cuadrado de una o varias consultas a un conjunto de puntos
+    
+    Las diferencias se calculan en float64 y se suman dimensión a dimensión en
+    orden, así todos los caminos de búsqueda producen exactamente los mismos valores.
+    
+    Args:
+        points (np.ndarray): Matriz (N, D) de puntos
+        query (np.ndarray): Vector (D,) o matriz (M, D) de consultas en float64
+    
+    Returns:
+        np.ndarray: Distancias al cuadrado (N,) o (M, N)
+    """
+    total = np.subtract(points[:, 0], query[..., None, 0], dtype=np.float64)
+    np.square(total, out=total)
+    
+    # Un único buffer temporario para las demás dimensiones (importa con matrices M x N)
+    buffer = np.empty_like(total)
+    for i in range(1, points.shape[1]):
+        np.subtract(points[:, i], query[..., None, i], out=buffer)
+        np.square(buffer, out=buffer)
+        total += buffer
+    return total
+
+
+class KDTree:
+    """
+    KD-tree para consultas exactas de los K vecinos más cercanos
+    
+    Los empates en distancia se resuelven por índice del punto, igual que un
+    recorrido lineal con ordenamiento estable.
+    """
+    
+    def __init__(self, points: np.ndarray, leaf_size: int = 32):
+        """
+        Construye el árbol sobre un conjunto de puntos
+        
+        Args:
+            points (np.ndarray): Matriz (N, D) de puntos
+            leaf_size (int): Número máximo de puntos por hoja
+        """
+        if points.ndim != 2 or len(points) == 0:
+            raise ValueError("Se requiere una matriz (N, D) no vacía para construir el índice")
+        
+        self.leaf_size = max(1, leaf_size)
+        self.num_points = len(points)
+        
+        # Nodos en arreglos paralelos: rango de puntos, caja envolvente e hijos
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._lower: List[Tuple[float, ...]] = []
+        self._upper: List[Tuple[float, ...]] = []
+        self._children: List[Tuple[int, int]] = []
+        
+        self._order = np.arange(self.num_points)
+        self._build(points, 0, self.num_points)
+        
+        # Puntos reordenados para que cada hoja sea un bloque contiguo
+        self._points = np.ascontiguousarray(points[self._order])
+    
+    def _build(self, points: np.ndarray, start: int, end: int) -> int:
+        """
+        Construye recursivamente el subárbol para ``self._order[start:end]``
+        
+        Args:
+            points (np.ndarray): Puntos originales
+            start (int): Inicio del rango
+            end (int): Fin del rango
+        
+        Returns:
+            int: Identificador del nodo creado
+        """
+        subset = points[self._order[start:end]]
+        lower = subset.min(axis=0)
+        upper = subset.max(axis=0)
+        
+        node = len(self._start)
+        self._start.append(start)
+        self._end.append(end)
+        self._lower.append(tuple(float(x) for x in lower))
+        self._upper.append(tuple(float(x) for x in upper))
+        self._children.append((-1, -1))
+        
+        spread = upper - lower
+        if end - start <= self.leaf_size or not spread.any():
+            return node
+        
+        # Dividir por la mediana de la dimensión con mayor dispersión
+        dim = int(np.argmax(spread))
+        middle = (end - start) // 2
+        partition = np.argpartition(subset[:, dim], middle, kind='introselect')
+        self._order[start:end] = self._order[start:end][partition]
+        
+        left = self._build(points, start, start + middle)
+        right = self._build(points, start + middle, end)
+        self._children[node] = (left, right)
+        
+        return node
+    
+    def _box_distance(self, node: int, query: Tuple[float, ...]) -> float:
+        """
+        Distancia al cuadrado mínima entre la consulta y la caja de un nodo
+        
+        Args:
+            node (int): Identificador del nodo
+            query (Tuple[float, ...]): Punto de consulta
+        
+        Returns:
+            float: Cota inferior de la distancia a cualquier punto del nodo
+        """
+        total = 0.0
+        for q, lo, hi in zip(query, self._lower[node], self._upper[node]):
+            if q < lo:
+                total += (lo - q) ** 2
+            elif q > hi:
+                total += (q - hi) ** 2
+        return total
+    
+    def query(self, point: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca los K puntos más cercanos a una consulta
+        
+        Args:
+            point (np.ndarray): Punto de consulta (D,)
+            k (int): Número de vecinos
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices originales y distancias al
+            cuadrado, ordenados por distancia ascendente
+        """
+        k = max(0, min(k, self.num_points))
+        point = np.asarray(point, dtype=np.float64)
+        query = tuple(float(x) for x in point)
+        
+        # Max-heap de los mejores (d2, índice) guardados negados
+        best: List[Tuple[float, int]] = []
+        pending = [(0.0, 0)]
+        
+        while pending and k:
+            box_distance, node = heapq.heappop(pending)
+            
+            if len(best) == k and box_distance > -best[0][0]:
+                break
+            
+            left, right = self._children[node]
+            if left >= 0:
+                for child in (left, right):
+                    child_distance = self._box_distance(child, query)
+                    if len(best) < k or child_distance <= -best[0][0]:
+                        heapq.heappush(pending, (child_distance, child))
+                continue
+            
+            start, end = self._start[node], self._end[node]
+            distances = squared_distances(self._points[start:end], point)
+            
+            if len(best) == k:
+                candidates = np.flatnonzero(distances <= -best[0][0])
+            else:
+                candidates = range(end - start)
+            
+            for offset in candidates:
+                entry = (-float(distances[offset]), -int(self._order[start + offset]))
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+        
+        best.sort(reverse=True)
+        indices = np.array([-index for _, index in best], dtype=np.intp)
+        distances = np.array([-distance for distance, _ in best], dtype=np.float64)
+        return indices, distances
+    
+    def query_radius(self, point: np.ndarray, max_distance: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca todos los puntos a distancia al cuadrado menor o igual a un límite
+        
+        Args:
+            point (np.ndarray): Punto de consulta (D,)
+            max_distance (float): Distancia al cuadrado máxima (inclusiva)
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices originales en orden ascendente
+            y sus distancias al cuadrado
+        """
+        point = np.asarray(point, dtype=np.float64)
+        query = tuple(float(x) for x in point)
+        
+        found_indices = []
+        found_distances = []
+        pending = [0]
+        
+        while pending:
+            node = pending.pop()
+            
+            if self._box_distance(node, query) > max_distance:
+                continue
+            
+            left, right = self._children[node]
+            if left >= 0:
+                pending.extend((left, right))
+                continue
+            
+            start, end = self._start[node], self._end[node]
+            distances = squared_distances(self._points[start:end], point)
+            inside = np.flatnonzero(distances <= max_distance)
+            
+            found_indices.append(self._order[start + inside])
+            found_distances.append(distances[inside])
+        
+        if not found_indices:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        
+        indices = np.concatenate(found_indices)
+        distances = np.concatenate(found_distances)
+        order = np.argsort(indices, kind='stable')
+        return indices[order], distances[order]
@@ -1,18 +1,25 @@
 """
 Utilidades y funciones auxiliares para Auto Personality App
+
+Componentes de Streamlit y adaptadores de la capa de datos (``loaders.py``)
+que muestran los errores en la interfaz.
 """
 
-import json
 import streamlit as st
-from pathlib import Path
-from typing import Dict, List, Any, Optional
-from PIL import Image
-import base64
+from typing import TYPE_CHECKING, Dict, List, Any, Mapping, Optional
 import io
 
+import loaders
+from fragments import CardFragments, render_card
+from images import VariantSpec
+from loaders import DataLoadError, DataNotFoundError, load_json_file
+
+if TYPE_CHECKING:
+    from PIL import Image
+
 def load_json_data(file_path: str) -> Optional[Dict[str, Any]]:
     """
-    Carga datos desde un archivo JSON
+    Carga datos desde un archivo JSON, mostrando el error en la interfaz si falla
     
     Args:
         file_path (str): Ruta al archivo JSON
@@ -21,50 +28,22 @@ def load_json_data(file_path: str) -> Optional[Dict[str, Any]]:
         Dict[str, Any]: Datos cargados del archivo JSON o None si hay error
     """
     try:
-        # Construir ruta absoluta
-        current_dir = Path(__file__).parent.parent
-        full_path = current_dir / file_path
-        
-        if not full_path.exists():
-            st.error(f"Archivo no encontrado: {full_path}")
-            return None
-            
-        with open(full_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-            
-    except FileNotFoundError:
-        st.error(f"No se pudo encontrar el archivo: {file_path}")
-        return None
-    except json.JSONDecodeError as e:
-        st.error(f"Error al parsear JSON en {file_path}: {str(e)}")
-        return None
-    except Exception as e:
-        st.error(f"Error inesperado al cargar {file_path}: {str(e)}")
+        return load_json_file(file_path)
+    except DataLoadError as e:
+        st.error(e.message)
         return None
 
-def display_car_result(car_data: Dict[str, Any], match_percentage: float) -> None:
+def display_car_result(car_data: Mapping[str, Any], match_percentage: float,
+                       fragments: Optional[CardFragments] = None) -> None:
     """
     Muestra los resultados de un auto recomendado
     
     Args:
-        car_data (Dict[str, Any]): Datos del auto
+        car_data (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
         match_percentage (float): Porcentaje de coincidencia
+        fragments (Optional[CardFragments]): Caché de tarjetas del catálogo vigente
     """
-    st.markdown(f"""
-    <div style="
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        text-align: center;
-        margin: 1rem 0;
-    ">
-        <h2>{car_data.get('emoji', '🚗')} {car_data.get('brand', 'Unknown')} {car_data.get('model', 'Unknown')}</h2>
-        <h3 style="color: #667eea;">Match: {match_percentage:.1f}%</h3>
-        <p><strong>{car_data.get('type', 'Vehículo')}</strong></p>
-        <p>{car_data.get('description', 'Sin descripción disponible.')}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_card_html("result", car_data, match_percentage, fragments), unsafe_allow_html=True)
 
 def format_features_list(features: List[str]) -> str:
     """
@@ -139,12 +118,12 @@ def safe_get_nested(data: Dict, keys: List[str], default: Any = None) -> Any:
     except (KeyError, TypeError):
         return default
 
-def generate_share_text(car_data: Dict[str, Any], match_percentage: float) -> str:
+def generate_share_text(car_data: Mapping[str, Any], match_percentage: float) -> str:
     """
     Genera texto para compartir en redes sociales
     
     Args:
-        car_data (Dict[str, Any]): Datos del auto
+        car_data (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
         match_percentage (float): Porcentaje de coincidencia
         
     Returns:
@@ -156,12 +135,12 @@ def generate_share_text(car_data: Dict[str, Any], match_percentage: float) -> st
     
     return f"""¡Mi auto ideal es el {emoji} {brand} {model}! 📊 Match: {match_percentage:.1f}% 🚗 ¿Cuál sería tu auto ideal? Descúbrelo en Auto Personality App #AutoPersonalityApp #MiAutoIdeal #CarLovers"""
 
-def create_share_buttons(car_data: Dict[str, Any], match_percentage: float) -> None:
+def create_share_buttons(car_data: Mapping[str, Any], match_percentage: float) -> None:
     """
     Crea botones para compartir en redes sociales
     
     Args:
-        car_data (Dict[str, Any]): Datos del auto
+        car_data (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
         match_percentage (float): Porcentaje de coincidencia
     """
     share_text = generate_share_text(car_data, match_percentage)
@@ -220,7 +199,27 @@ def create_share_buttons(car_data: Dict[str, Any], match_percentage: float) -> N
         </a>
         """, unsafe_allow_html=True)
 
-def load_car_image(image_filename: str, default_size: tuple = (400, 300)) -> Optional[Image.Image]:
+def load_car_image_bytes(image_filename: str, variant: VariantSpec = "card") -> Optional[bytes]:
+    """
+    Obtiene una variante redimensionada de la imagen de un auto, avisando en la interfaz si falla
+    
+    Args:
+        image_filename (str): Nombre del archivo de imagen
+        variant (VariantSpec): Nombre de variante ("card", "thumbnail", "share") o (ancho, alto)
+    
+    Returns:
+        Optional[bytes]: Imagen codificada o None si hay error
+    """
+    try:
+        return loaders.load_car_image_bytes(image_filename, variant)
+    except DataNotFoundError as e:
+        st.warning(e.message)
+        return None
+    except DataLoadError as e:
+        st.error(e.message)
+        return None
+
+def load_car_image(image_filename: str, default_size: tuple = (400, 300)) -> Optional["Image.Image"]:
     """
     Carga una imagen de auto desde la carpeta de imágenes
     
@@ -231,43 +230,27 @@ def load_car_image(image_filename: str, default_size: tuple = (400, 300)) -> Opt
     Returns:
         Optional[Image.Image]: Imagen cargada o None si hay error
     """
-    try:
-        # Construir ruta a la imagen
-        current_dir = Path(__file__).parent.parent
-        image_path = current_dir / "data" / "images" / image_filename
-        
-        if not image_path.exists():
-            st.warning(f"Imagen no encontrada: {image_filename}")
-            return None
-        
-        # Cargar y redimensionar imagen
-        image = Image.open(image_path)
-        
-        # Convertir a RGB si es necesario (para formatos como AVIF/WebP)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Redimensionar manteniendo aspecto
-        image.thumbnail(default_size, Image.Resampling.LANCZOS)
-        
-        return image
-        
-    except Exception as e:
-        st.error(f"Error al cargar imagen {image_filename}: {str(e)}")
+    data = load_car_image_bytes(image_filename, default_size)
+    
+    if data is None:
         return None
+    
+    from PIL import Image
+    
+    return Image.open(io.BytesIO(data))
 
-def display_car_image(car_data: Dict[str, Any], width: int = 400) -> None:
+def display_car_image(car_data: Mapping[str, Any], width: int = 400) -> None:
     """
     Muestra la imagen de un auto con fallback
     
     Args:
-        car_data (Dict[str, Any]): Datos del auto
+        car_data (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
         width (int): Ancho de la imagen
     """
     image_filename = car_data.get('image', '')
     
     if image_filename:
-        image = load_car_image(image_filename, (width, int(width * 0.75)))
+        image = load_car_image_bytes(image_filename, (width, int(width * 0.75)))
         
         if image:
             st.image(image, width=width, use_container_width=False)
@@ -288,14 +271,23 @@ def display_car_image(car_data: Dict[str, Any], width: int = 400) -> None:
     </div>
     """, unsafe_allow_html=True)
 
-def create_car_card(car_data: Dict[str, Any], match_percentage: float, show_image: bool = True) -> None:
+def _card_html(kind: str, car_data: Mapping[str, Any], match_percentage: float,
+               fragments: Optional[CardFragments]) -> str:
+    """HTML de una tarjeta, desde la caché si se indica"""
+    if fragments is not None:
+        return fragments.render(kind, car_data, match_percentage)
+    return render_card(kind, car_data, match_percentage)
+
+def create_car_card(car_data: Mapping[str, Any], match_percentage: float, show_image: bool = True,
+                    fragments: Optional[CardFragments] = None) -> None:
     """
     Crea una tarjeta visual completa para mostrar un auto
     
     Args:
-        car_data (Dict[str, Any]): Datos del auto
+        car_data (Mapping[str, Any]): Datos del auto (diccionario o CarRecord)
         match_percentage (float): Porcentaje de coincidencia
         show_image (bool): Si mostrar la imagen o no
+        fragments (Optional[CardFragments]): Caché de tarjetas del catálogo vigente
     """
     # Container principal
     with st.container():
@@ -307,41 +299,11 @@ def create_car_card(car_data: Dict[str, Any], match_percentage: float, show_imag
                 display_car_image(car_data, width=350)
             
             with col2:
-                st.markdown(f"""
-                <div style="padding: 1rem;">
-                    <h2 style="color: #667eea; margin-bottom: 0.5rem;">
-                        {car_data.get('emoji', '🚗')} {car_data.get('brand', 'Unknown')} {car_data.get('model', 'Unknown')}
-                    </h2>
-                    <h3 style="color: #28a745; margin-bottom: 1rem;">
-                        ✨ Match: {match_percentage:.1f}%
-                    </h3>
-                    <p style="color: #6c757d; font-weight: 500; margin-bottom: 1rem;">
-                        {car_data.get('type', 'Vehículo')} • {car_data.get('year', 'N/A')}
-                    </p>
-                    <p style="margin-bottom: 1.5rem;">
-                        {car_data.get('description', 'Sin descripción disponible.')}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_card_html("details", car_data, match_percentage, fragments),
+                            unsafe_allow_html=True)
         else:
             # Layout sin imagen
-            st.markdown(f"""
-            <div style="
-                background: white;
-                padding: 2rem;
-                border-radius: 15px;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                text-align: center;
-                margin: 1rem 0;
-            ">
-                <h2 style="color: #667eea;">
-                    {car_data.get('emoji', '🚗')} {car_data.get('brand', 'Unknown')} {car_data.get('model', 'Unknown')}
-                </h2>
-                <h3 style="color: #28a745;">Match: {match_percentage:.1f}%</h3>
-                <p><strong>{car_data.get('type', 'Vehículo')}</strong></p>
-                <p>{car_data.get('description', 'Sin descripción disponible.')}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_card_html("plain", car_data, match_percentage, fragments), unsafe_allow_html=True)
         
         # Características
         features = car_data.get('features', [])
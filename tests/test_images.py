@@ -0,0 +1,115 @@
+"""
+Pruebas del manifiesto de variantes precompiladas (``src/images.py``)
+
+Verifican que un original reemplazado no siga sirviendo las variantes del
+manifiesto y que el manifiesto se vuelva a leer cuando ``build_assets.py`` lo
+reescribe.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from PIL import Image
+
+from build_assets import build_image
+from images import MANIFEST_NAME, VARIANTS, ImagePipeline, write_atomic
+
+IMAGE_NAME = "auto.png"
+
+
+class ManifestTest(unittest.TestCase):
+    """Variantes del manifiesto frente a cambios en los originales y en el manifiesto"""
+    
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        
+        self.images_dir = directory / "images"
+        self.cache_dir = directory / "cache"
+        self.images_dir.mkdir()
+        self.source_path = self.images_dir / IMAGE_NAME
+        self.save_source((200, 30, 30))
+    
+    def save_source(self, color):
+        Image.new("RGB", (400, 300), color).save(self.source_path)
+    
+    def write_manifest(self, images):
+        manifest = {"images": images}
+        write_atomic(self.cache_dir / MANIFEST_NAME, json.dumps(manifest).encode("utf-8"))
+    
+    def build_manifest(self):
+        """Compila las variantes del original actual, como ``build_assets.py``"""
+        entry = build_image(str(self.source_path), str(self.cache_dir), VARIANTS)
+        self.write_manifest({IMAGE_NAME: entry})
+        return entry
+    
+    def manifest_bytes(self, entry, variant="card"):
+        return (self.cache_dir / entry["variants"][variant]["file"]).read_bytes()
+    
+    def test_serves_manifest_variant(self):
+        entry = self.build_manifest()
+        pipeline = ImagePipeline(self.images_dir, self.cache_dir)
+        
+        self.assertEqual(pipeline.get_variant(IMAGE_NAME, "card"), self.manifest_bytes(entry))
+        self.assertEqual(pipeline.stats()["renders"], 0)
+    
+    def test_replaced_original_is_not_served_from_manifest(self):
+        entry = self.build_manifest()
+        pipeline = ImagePipeline(self.images_dir, self.cache_dir)
+        stale = pipeline.get_variant(IMAGE_NAME, "card")
+        
+        self.save_source((30, 30, 200))
+        os.utime(self.source_path, ns=(entry["source_mtime_ns"] + 10**9,) * 2)
+        
+        fresh = pipeline.get_variant(IMAGE_NAME, "card")
+        self.assertNotEqual(fresh, stale)
+        self.assertEqual(pipeline.stats()["renders"], 1)
+        
+        # El manifiesto recompilado apunta a la variante ya generada
+        rebuilt = self.build_manifest()
+        self.assertEqual(pipeline.get_variant(IMAGE_NAME, "card"), self.manifest_bytes(rebuilt))
+        self.assertEqual(pipeline.stats()["renders"], 1)
+    
+    def test_touched_original_is_verified_by_content(self):
+        entry = self.build_manifest()
+        os.utime(self.source_path, ns=(entry["source_mtime_ns"] + 10**9,) * 2)
+        
+        pipeline = ImagePipeline(self.images_dir, self.cache_dir)
+        self.assertEqual(pipeline.get_variant(IMAGE_NAME, "card"), self.manifest_bytes(entry))
+        self.assertEqual(pipeline.stats()["renders"], 0)
+    
+    def test_missing_original_serves_manifest_variant(self):
+        entry = self.build_manifest()
+        self.source_path.unlink()
+        
+        pipeline = ImagePipeline(self.images_dir, self.cache_dir)
+        self.assertEqual(pipeline.get_variant(IMAGE_NAME, "card"), self.manifest_bytes(entry))
+    
+    def test_manifest_is_reloaded_when_rewritten(self):
+        pipeline = ImagePipeline(self.images_dir, self.cache_dir)
+        pipeline.get_variant(IMAGE_NAME, "card")
+        self.assertEqual(pipeline.stats()["renders"], 1)
+        
+        # Manifiesto escrito después de crear el pipeline, con otra variante
+        entry = self.build_manifest()
+        precompiled = self.cache_dir / "precompilada.webp"
+        precompiled.write_bytes(b"variante precompilada")
+        entry["variants"]["card"]["file"] = precompiled.name
+        self.write_manifest({IMAGE_NAME: entry})
+        
+        self.assertEqual(pipeline.get_variant(IMAGE_NAME, "card"), b"variante precompilada")
+
+
+if __name__ == "__main__":
+    unittest.main()
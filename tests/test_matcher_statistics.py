@@ -0,0 +1,100 @@
+"""
+Pruebas de ``AutoMatcher.get_statistics``
+
+Las distribuciones deben ser las mismas que las del recorrido original auto
+por auto con ``car.get(field, 'Unknown')``: valores con mayúsculas distintas
+por separado, y ausentes, None y '' en grupos distintos.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from catalog import compile_catalog
+from matcher import AutoMatcher
+
+FIELDS = {
+    "types_distribution": "type",
+    "brands_distribution": "brand",
+    "price_ranges_distribution": "price_range",
+}
+
+# Variantes por campo: mayúsculas mezcladas, vacío, None, ausente y 'Unknown' literal
+VARIANTS = {
+    "type": ["SUV", "suv", "", None, ..., "Sedán", "Unknown", "SUV"],
+    "brand": ["Tesla", "tesla", None, "", "TESLA", ..., "Tesla", ...],
+    "price_range": [..., "$$", None, "$$", "", "$", ..., None],
+}
+
+
+def make_cars() -> list:
+    """Autos con cada combinación de variantes (``...`` significa campo ausente)"""
+    cars = []
+    for i in range(24):
+        car = {"id": f"car_{i}", "model": f"Modelo {i}", "vector": [1 + i % 5, 2, 3, 4, 5]}
+        for field, values in VARIANTS.items():
+            value = values[(i * (len(field) + 1)) % len(values)]
+            if value is not ...:
+                car[field] = value
+        cars.append(car)
+    return cars
+
+
+def baseline_distributions(cars: list) -> dict:
+    """Recorrido original de ``get_statistics`` sobre los diccionarios"""
+    distributions = {}
+    for key, field in FIELDS.items():
+        counts = {}
+        for car in cars:
+            value = car.get(field, 'Unknown')
+            counts[value] = counts.get(value, 0) + 1
+        distributions[key] = counts
+    return distributions
+
+
+class StatisticsTest(unittest.TestCase):
+    """Distribuciones del matcher frente al recorrido por diccionarios"""
+    
+    def setUp(self):
+        self.cars = make_cars()
+    
+    def assertSameDistributions(self, matcher: AutoMatcher, cars: list):
+        stats = matcher.get_statistics()
+        for key, expected in baseline_distributions(cars).items():
+            # Mismos conteos y mismo orden de aparición
+            self.assertEqual(list(stats[key].items()), list(expected.items()), key)
+        self.assertEqual(stats["total_cars"], len(cars))
+    
+    def test_dict_catalog(self):
+        self.assertSameDistributions(AutoMatcher({"cars": self.cars}), self.cars)
+    
+    def test_compiled_catalog(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = Path(directory) / "cars.catalog"
+        compile_catalog(self.cars, path)
+        
+        self.assertSameDistributions(AutoMatcher.from_compiled_catalog(str(path)), self.cars)
+    
+    def test_after_updates(self):
+        matcher = AutoMatcher({"cars": self.cars})
+        matcher.update_car("car_3", {"type": "SUV", "brand": None})
+        matcher.remove_cars(["car_0"])
+        matcher.add_cars([{"id": "new", "brand": "TESLA", "model": "Nuevo", "vector": [1, 1, 1, 1, 1], "type": "suv"}])
+        
+        cars = [dict(car) for car in self.cars[1:]]
+        cars[2].update({"type": "SUV", "brand": None})
+        cars.append({"id": "new", "brand": "TESLA", "model": "Nuevo", "vector": [1, 1, 1, 1, 1], "type": "suv"})
+        self.assertSameDistributions(matcher, cars)
+
+
+if __name__ == "__main__":
+    unittest.main()
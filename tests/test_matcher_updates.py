@@ -0,0 +1,237 @@
+"""
+Pruebas de las actualizaciones incrementales del catálogo (``AutoMatcher``)
+
+Después de cada ``add_cars``, ``remove_cars`` y ``update_car`` el estado que el
+matcher mantiene de forma incremental (registros, índices invertidos, KD-tree
+y tabla de similitud) debe ser idéntico al de un ``AutoMatcher`` nuevo
+construido con el catálogo resultante.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+import numpy as np
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from catalog import compile_catalog
+from matcher import AutoMatcher
+
+TOP_K = 6
+CAR_TYPES = ["Sedán", "SUV", "suv", "Pickup", "Hatchback"]
+BRANDS = ["Toyota", "Ford", "Mazda", "honda", "Honda"]
+PRICE_RANGES = ["$", "$$", "$$$"]
+
+
+def make_car(rng: random.Random, car_id: str) -> dict:
+    """Auto aleatorio con vector fraccionario y atributos con mayúsculas mezcladas"""
+    car = {
+        "id": car_id,
+        "brand": rng.choice(BRANDS),
+        "model": f"Modelo {car_id}",
+        "type": rng.choice(CAR_TYPES),
+        "vector": [round(rng.uniform(1, 5), 1) for _ in range(5)],
+        "price_range": rng.choice(PRICE_RANGES),
+    }
+    if rng.random() < 0.8:
+        car["year"] = rng.randint(2015, 2025)
+    return car
+
+
+def make_cars(count: int, seed: int, duplicates: int = 0) -> list:
+    """Catálogo aleatorio; los últimos ``duplicates`` autos repiten IDs anteriores"""
+    rng = random.Random(seed)
+    cars = [make_car(rng, f"car_{i}") for i in range(count)]
+    for i in range(duplicates):
+        cars.append(make_car(rng, f"car_{i * 3}"))
+    return cars
+
+
+class IncrementalUpdatesTest(unittest.TestCase):
+    """Compara el matcher actualizado con uno construido desde cero"""
+    
+    def setUp(self):
+        self.cars = make_cars(60, seed=1, duplicates=5)
+        self.matcher = self.make_matcher(self.cars)
+        self.matcher.build_spatial_index(leaf_size=4)
+        self.matcher.enable_similarity_table(TOP_K)
+    
+    def make_matcher(self, cars: list) -> AutoMatcher:
+        return AutoMatcher({"cars": cars})
+    
+    def assertMatchesFresh(self, expected_cars: list):
+        """Verifica el snapshot vigente contra un matcher nuevo sobre ``expected_cars``"""
+        snapshot = self.matcher.snapshot
+        fresh = AutoMatcher({"cars": expected_cars}, use_spatial_index=True)
+        expected = fresh.snapshot
+        
+        self.assertEqual([dict(car) for car in snapshot.cars], expected_cars)
+        self.assertEqual(snapshot.car_ids, expected.car_ids)
+        self.assertEqual(snapshot.id_index, expected.id_index)
+        np.testing.assert_array_equal(snapshot.reference_vectors, expected.reference_vectors)
+        np.testing.assert_array_equal(snapshot.car_vectors, expected.car_vectors)
+        np.testing.assert_array_equal(snapshot.car_years, expected.car_years)
+        
+        self.assertEqual(snapshot.attribute_indexes.keys(), expected.attribute_indexes.keys())
+        for field, groups in expected.attribute_indexes.items():
+            actual = snapshot.attribute_indexes[field]
+            self.assertEqual(actual.keys(), groups.keys(), field)
+            for key, indices in groups.items():
+                np.testing.assert_array_equal(actual[key], indices, f"{field}={key!r}")
+        
+        # La tabla de similitud mantenida debe ser la misma que una recién construida
+        table = snapshot.similarity_table
+        self.assertIsNotNone(table)
+        rebuilt = fresh.build_similarity_table(TOP_K)
+        self.assertEqual(table.fingerprint, rebuilt.fingerprint)
+        np.testing.assert_array_equal(table.neighbors, rebuilt.neighbors)
+        np.testing.assert_array_equal(table.scores, rebuilt.scores)
+        
+        # Consultas con el KD-tree (reconstruido o conservado) contra el cálculo completo
+        rng = random.Random(len(expected_cars))
+        for _ in range(20):
+            user_vector = [rng.uniform(1, 5) for _ in range(5)]
+            actual = self.matcher.find_best_matches(user_vector, top_n=5)
+            linear = AutoMatcher({"cars": expected_cars}).find_best_matches(user_vector, top_n=5)
+            self.assertEqual([(rec.car["id"], rec.match_percentage) for rec in actual],
+                             [(rec.car["id"], rec.match_percentage) for rec in linear])
+            
+            tree = self.matcher.spatial_index
+            self.assertIsNotNone(tree)
+            for got, want in zip(tree.query(np.array(user_vector), 5), expected.spatial_index.query(np.array(user_vector), 5)):
+                np.testing.assert_array_equal(got, want)
+        
+        for car_id in sorted(set(expected.car_ids))[::7]:
+            self.assertEqual(
+                [(car.car["id"], car.similarity_percentage) for car in self.matcher.recommend_similar_cars(car_id, 4)],
+                [(car.car["id"], car.similarity_percentage) for car in fresh.recommend_similar_cars(car_id, 4)],
+            )
+    
+    def test_add_cars(self):
+        added = make_cars(8, seed=2)
+        for i, car in enumerate(added):
+            car["id"] = f"new_{i}"
+        
+        self.assertEqual(self.matcher.add_cars(added), len(added))
+        self.assertMatchesFresh(self.cars + added)
+    
+    def test_add_cars_with_existing_ids(self):
+        added = [make_car(random.Random(3), "car_4"), make_car(random.Random(4), "car_4")]
+        
+        self.matcher.add_cars(added)
+        self.assertMatchesFresh(self.cars + added)
+        
+        # get_car_by_id sigue devolviendo la primera aparición
+        self.assertEqual(self.matcher.get_car_by_id("car_4")["model"], self.cars[4]["model"])
+    
+    def test_add_invalid_car_changes_nothing(self):
+        version = self.matcher.catalog_version
+        
+        with self.assertRaises(ValueError):
+            self.matcher.add_cars([make_car(random.Random(5), "ok"), {"id": "bad"}])
+        
+        self.assertEqual(self.matcher.catalog_version, version)
+        self.assertMatchesFresh(self.cars)
+    
+    def test_remove_cars(self):
+        removed = {"car_1", "car_10", "car_25"}
+        
+        self.assertEqual(self.matcher.remove_cars(removed), len(removed))
+        self.assertMatchesFresh([car for car in self.cars if car["id"] not in removed])
+    
+    def test_remove_duplicated_id_removes_every_occurrence(self):
+        occurrences = sum(car["id"] == "car_3" for car in self.cars)
+        self.assertGreater(occurrences, 1)
+        
+        self.assertEqual(self.matcher.remove_cars(["car_3"]), occurrences)
+        self.assertMatchesFresh([car for car in self.cars if car["id"] != "car_3"])
+    
+    def test_remove_unknown_ids(self):
+        version = self.matcher.catalog_version
+        
+        self.assertEqual(self.matcher.remove_cars(["missing", "also_missing"]), 0)
+        self.assertEqual(self.matcher.catalog_version, version)
+        self.assertMatchesFresh(self.cars)
+        
+        # Mezclados con IDs existentes, los desconocidos se ignoran
+        self.assertEqual(self.matcher.remove_cars(["missing", "car_2"]), 1)
+        self.assertMatchesFresh([car for car in self.cars if car["id"] != "car_2"])
+    
+    def test_remove_all_cars_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.matcher.remove_cars({car["id"] for car in self.cars})
+        self.assertMatchesFresh(self.cars)
+    
+    def test_update_vector(self):
+        expected = [dict(car) for car in self.cars]
+        expected[7]["vector"] = [4.9, 1.1, 2.3, 3.7, 4.2]
+        
+        record = self.matcher.update_car("car_7", {"vector": expected[7]["vector"]})
+        self.assertEqual(record["vector"], expected[7]["vector"])
+        self.assertMatchesFresh(expected)
+    
+    def test_update_attributes_keeps_position(self):
+        expected = [dict(car) for car in self.cars]
+        expected[12].update({"type": "SUV", "brand": "HONDA", "price_range": "$$$$", "year": 2030})
+        
+        self.matcher.update_car("car_12", {"type": "SUV", "brand": "HONDA", "price_range": "$$$$", "year": 2030})
+        self.assertMatchesFresh(expected)
+    
+    def test_update_duplicated_id_changes_first_occurrence(self):
+        expected = [dict(car) for car in self.cars]
+        expected[0]["vector"] = [1.0, 1.0, 1.0, 1.0, 1.0]
+        
+        self.matcher.update_car("car_0", {"vector": [1.0, 1.0, 1.0, 1.0, 1.0]})
+        self.assertMatchesFresh(expected)
+    
+    def test_update_errors(self):
+        with self.assertRaises(KeyError):
+            self.matcher.update_car("missing", {"model": "X"})
+        with self.assertRaises(ValueError):
+            self.matcher.update_car("car_5", {"id": "car_99"})
+        with self.assertRaises(ValueError):
+            self.matcher.update_car("car_5", {"vector": [1, 2, 3]})
+        self.assertMatchesFresh(self.cars)
+    
+    def test_sequence_of_updates(self):
+        expected = [dict(car) for car in self.cars]
+        rng = random.Random(9)
+        
+        for step in range(6):
+            added = [make_car(rng, f"step_{step}_{i}") for i in range(3)]
+            self.matcher.add_cars(added)
+            expected += added
+            
+            victim = expected[rng.randrange(len(expected))]["id"]
+            self.matcher.remove_cars([victim])
+            expected = [car for car in expected if car["id"] != victim]
+            
+            target = expected[rng.randrange(len(expected))]
+            changes = {"vector": [round(rng.uniform(1, 5), 1) for _ in range(5)], "type": rng.choice(CAR_TYPES)}
+            self.matcher.update_car(target["id"], changes)
+            first = next(i for i, car in enumerate(expected) if car["id"] == target["id"])
+            expected[first] = {**expected[first], **changes}
+        
+        self.assertMatchesFresh(expected)
+
+
+class CompiledCatalogUpdatesTest(IncrementalUpdatesTest):
+    """Las mismas actualizaciones partiendo de un catálogo compilado"""
+    
+    def make_matcher(self, cars: list) -> AutoMatcher:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = Path(directory) / "cars.catalog"
+        compile_catalog(cars, path)
+        return AutoMatcher.from_compiled_catalog(str(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
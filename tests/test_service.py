@@ -0,0 +1,172 @@
+"""
+Pruebas de los endpoints del servicio HTTP (``src/service.py``)
+
+Llaman a ``handle_request`` directamente con el catálogo de ``data/``, sin
+abrir sockets; el límite de tamaño también se prueba sobre una conexión real.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import metrics
+import service
+from resources import get_app_resources
+
+
+class HandleRequestTest(unittest.IsolatedAsyncioTestCase):
+    """Códigos de respuesta y contenido de cada endpoint"""
+    
+    def setUp(self):
+        # Cada prueba corre en su propio event loop: no reutilizar el agrupador
+        service._batcher = None
+        self.resources = get_app_resources()
+        self.assertIsNotNone(self.resources, "No se pudieron cargar los datos de data/")
+    
+    async def post(self, payload, path="/recommend"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        return await service.handle_request("POST", path, body)
+    
+    async def test_health(self):
+        status, response = await service.handle_request("GET", "/health", b"")
+        self.assertEqual(status, 200)
+        self.assertEqual(response["cars"], len(self.resources.matcher.cars))
+    
+    async def test_unknown_path_is_404(self):
+        status, response = await service.handle_request("GET", "/nope", b"")
+        self.assertEqual(status, 404)
+        self.assertIn("error", response)
+    
+    async def test_metrics_disabled_is_404(self):
+        enabled = metrics.is_enabled()
+        metrics.enable(False)
+        try:
+            status, _ = await service.handle_request("GET", "/metrics", b"")
+        finally:
+            metrics.enable(enabled)
+        self.assertEqual(status, 404)
+    
+    async def test_wrong_method_is_405(self):
+        for method, path in (("GET", "/recommend"), ("POST", "/health"), ("POST", "/metrics")):
+            with self.subTest(method=method, path=path):
+                status, _ = await service.handle_request(method, path, b"")
+                self.assertEqual(status, 405)
+    
+    async def test_oversized_body_is_413(self):
+        body = b" " * (service.MAX_BODY_BYTES + 1)
+        status, _ = await self.post(body)
+        self.assertEqual(status, 413)
+    
+    async def test_invalid_payloads_are_400(self):
+        payloads = [
+            b"{no es json",
+            b"[1, 2, 3]",
+            {},
+            {"answers": "0,1,2"},
+            {"answers": [True, False]},
+            {"vector": [1, 2, 3]},
+            {"vector": [1, 2, 3, 4, "5"]},
+            {"vector": [1, 2, 3, 4, 5], "top_n": 0},
+            {"vector": [1, 2, 3, 4, 5], "top_n": service.MAX_TOP_N + 1},
+            {"vector": [1, 2, 3, 4, 5], "top_n": True},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                status, response = await self.post(payload)
+                self.assertEqual(status, 400)
+                self.assertIn("error", response)
+    
+    async def test_non_finite_vector_is_400(self):
+        for literal in ("NaN", "Infinity", "-Infinity"):
+            with self.subTest(value=literal):
+                body = f'{{"vector": [{literal}, 1, 1, 1, 1]}}'.encode("utf-8")
+                status, response = await self.post(body)
+                self.assertEqual(status, 400)
+                self.assertIn("finitos", response["error"])
+    
+    async def test_answers_out_of_range_is_400(self):
+        num_questions = len(self.resources.questions_data["questions"])
+        status, _ = await self.post({"answers": [99] * num_questions})
+        self.assertEqual(status, 400)
+    
+    async def test_recommend_with_vector(self):
+        status, response = await self.post({"vector": [3, 3, 3, 3, 3], "top_n": 4})
+        self.assertEqual(status, 200)
+        self.assertEqual(response["vector"], [3.0] * 5)
+        
+        recommendations = response["recommendations"]
+        self.assertEqual(len(recommendations), 4)
+        percentages = [rec["match_percentage"] for rec in recommendations]
+        self.assertEqual(percentages, sorted(percentages, reverse=True))
+        json.dumps(response, allow_nan=False)
+    
+    async def test_answers_and_vector_give_same_result(self):
+        processor = self.resources.processor
+        option_counts = [len(question["options"]) for question in self.resources.questions_data["questions"]]
+        
+        for seed in range(5):
+            answers = [(seed * 7 + position * 3) % count for position, count in enumerate(option_counts)]
+            vector = processor.calculate_personality_vector_from_indices(answers)
+            
+            with self.subTest(answers=answers):
+                by_answers = await self.post({"answers": answers, "top_n": 5})
+                by_vector = await self.post({"vector": [float(x) for x in vector], "top_n": 5})
+                
+                self.assertEqual(by_answers[0], 200)
+                self.assertEqual(by_vector[0], 200)
+                self.assertEqual(by_answers[1], by_vector[1])
+
+
+class ConnectionTest(unittest.IsolatedAsyncioTestCase):
+    """Respuestas escritas por ``handle_connection`` sobre un socket local"""
+    
+    async def asyncSetUp(self):
+        service._batcher = None
+        self.server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+    
+    async def request(self, head: bytes, body: bytes = b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(head + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        
+        status_line, _, rest = response.partition(b"\r\n")
+        _, _, payload = rest.partition(b"\r\n\r\n")
+        return int(status_line.split()[1]), payload
+    
+    async def test_oversized_content_length_is_413(self):
+        head = (f"POST /recommend HTTP/1.1\r\nContent-Length: {service.MAX_BODY_BYTES + 1}\r\n\r\n"
+                .encode("latin-1"))
+        status, payload = await self.request(head)
+        self.assertEqual(status, 413)
+        self.assertIn("error", json.loads(payload))
+    
+    async def test_response_is_strict_json(self):
+        body = b'{"vector": [NaN, 1, 1, 1, 1]}'
+        head = (f"POST /recommend HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n").encode("latin-1")
+        status, payload = await self.request(head, body)
+        self.assertEqual(status, 400)
+        
+        # Rechaza NaN/Infinity al parsear, igual que un cliente estricto
+        def reject(constant):
+            raise ValueError(constant)
+        json.loads(payload, parse_constant=reject)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Pruebas de la tabla de similitud guardada en disco (``src/similarity.py``)
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+import numpy as np
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from matcher import AutoMatcher
+from similarity import SimilarityTable
+
+
+def make_cars() -> list:
+    """Catálogo con IDs enteros y de texto, como los que llegan de ``cars.json``"""
+    ids = [1, 2, "3", 4, "auto_5", 6, 7, "8"]
+    return [
+        {"id": car_id, "brand": "Marca", "model": f"Modelo {i}",
+         "vector": [1 + i % 5, 5 - i % 4, 2 + i % 3, 3, 1 + i % 2]}
+        for i, car_id in enumerate(ids)
+    ]
+
+
+class SimilarityCacheTest(unittest.TestCase):
+    """IDs con su tipo original al guardar y cargar la tabla"""
+    
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.cache_path = str(directory / "cars.similarity.npz")
+        self.cars = make_cars()
+    
+    def similar_ids(self, matcher: AutoMatcher, car_id) -> list:
+        return [(car.car["id"], car.similarity_percentage) for car in matcher.recommend_similar_cars(car_id, 3)]
+    
+    def test_save_and_load_keep_id_types(self):
+        table = AutoMatcher({"cars": self.cars}).build_similarity_table(4)
+        table.save(self.cache_path)
+        
+        loaded = SimilarityTable.load(self.cache_path)
+        self.assertEqual(loaded.ids, [car["id"] for car in self.cars])
+        self.assertEqual(loaded.fingerprint, table.fingerprint)
+        self.assertIsNotNone(loaded.lookup(1, 3))
+        self.assertIsNone(loaded.lookup("1", 3))
+    
+    def test_cached_table_answers_integer_ids(self):
+        expected = AutoMatcher({"cars": self.cars})
+        
+        AutoMatcher({"cars": self.cars}).enable_similarity_table(4, self.cache_path)
+        matcher = AutoMatcher({"cars": self.cars})
+        matcher.enable_similarity_table(4, self.cache_path)
+        
+        for car_id in (1, "3", 7):
+            self.assertEqual(self.similar_ids(matcher, car_id), self.similar_ids(expected, car_id))
+            self.assertTrue(self.similar_ids(matcher, car_id))
+    
+    def test_table_with_text_ids_is_rebuilt(self):
+        # Formato anterior: IDs guardados como texto, misma huella
+        table = AutoMatcher({"cars": self.cars}).build_similarity_table(4)
+        np.savez(self.cache_path, ids=np.array(table.ids, dtype=str), neighbors=table.neighbors,
+                 scores=table.scores, fingerprint=np.array(table.fingerprint))
+        
+        matcher = AutoMatcher({"cars": self.cars})
+        matcher.enable_similarity_table(4, self.cache_path)
+        
+        self.assertEqual(matcher.snapshot.similarity_table.ids, [car["id"] for car in self.cars])
+        self.assertTrue(self.similar_ids(matcher, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
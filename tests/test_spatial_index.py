@@ -0,0 +1,81 @@
+"""
+Pruebas del índice espacial (KD-tree) de ``AutoMatcher``
+
+Las consultas con el índice deben devolver lo mismo que el cálculo completo,
+también con vectores fuera de [1, 5], donde el redondeo a float32 del árbol
+es mayor.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+# Agregar src al path para imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from matcher import AutoMatcher
+
+
+def make_cars(count: int, scale: float, seed: int) -> list:
+    """Autos con vectores fraccionarios de magnitud ``scale``, muchos casi empatados"""
+    rng = random.Random(seed)
+    cars = []
+    for i in range(count):
+        base = [rng.choice([1, 2]) * scale for _ in range(5)]
+        vector = [x + rng.randint(0, 50) * scale * 1e-7 for x in base]
+        cars.append({"id": f"car_{i}", "brand": "Marca", "model": f"Modelo {i}", "vector": vector})
+    return cars
+
+
+def ranking(matcher: AutoMatcher, user_vector: list) -> list:
+    return [(rec.car["id"], rec.match_percentage) for rec in matcher.find_best_matches(user_vector, top_n=5)]
+
+
+class SpatialIndexTest(unittest.TestCase):
+    """KD-tree frente al recorrido completo del catálogo"""
+    
+    def assertSameRankings(self, cars: list, seed: int):
+        linear = AutoMatcher({"cars": cars})
+        spatial = AutoMatcher({"cars": cars})
+        spatial.build_spatial_index(leaf_size=4)
+        
+        rng = random.Random(seed)
+        for _ in range(50):
+            car_vector = rng.choice(cars)["vector"]
+            user_vector = [x + rng.uniform(-1e-6, 1e-6) * x for x in car_vector]
+            self.assertEqual(ranking(spatial, user_vector), ranking(linear, user_vector))
+    
+    def test_vectors_in_range(self):
+        self.assertSameRankings(make_cars(300, 1.0, seed=1), seed=2)
+    
+    def test_large_vectors(self):
+        for scale in (1e3, 1e6):
+            with self.subTest(scale=scale):
+                self.assertSameRankings(make_cars(300, scale, seed=3), seed=4)
+    
+    def test_margin_after_updates(self):
+        cars = make_cars(100, 1.0, seed=5)
+        matcher = AutoMatcher({"cars": cars})
+        matcher.build_spatial_index(leaf_size=4)
+        
+        large = make_cars(20, 1e6, seed=6)
+        for i, car in enumerate(large):
+            car["id"] = f"large_{i}"
+        matcher.add_cars(large)
+        matcher.update_car("car_0", {"vector": [x * 1e6 for x in large[0]["vector"]]})
+        
+        expected = AutoMatcher({"cars": [dict(car) for car in matcher.cars_data["cars"]]})
+        self.assertGreaterEqual(matcher.snapshot.distance_margin, expected.snapshot.distance_margin)
+        
+        rng = random.Random(7)
+        for _ in range(30):
+            user_vector = [x * (1 + rng.uniform(-1e-6, 1e-6)) for x in rng.choice(large)["vector"]]
+            self.assertEqual(ranking(matcher, user_vector), ranking(expected, user_vector))
+
+
+if __name__ == "__main__":
+    unittest.main()